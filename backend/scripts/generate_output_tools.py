@@ -0,0 +1,84 @@
+"""Generate the node output tool definitions from the sidecar's FHIR schemas.
+
+Usage:
+    python -m scripts.generate_output_tools
+
+Reads sidecar/schemas/<node>_output.json and rewrites
+src/graph/output_tools.py, so the schema the model is constrained to and the
+schema the sidecar's FHIRValidator checks against stay identical. Re-run
+after editing any output schema.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCHEMA_DIR = REPO_ROOT / "sidecar" / "schemas"
+OUTPUT_PATH = REPO_ROOT / "backend" / "src" / "graph" / "output_tools.py"
+
+NODES = ("extractor", "reasoner", "sentinel")
+
+HEADER = '''"""Tool definitions that constrain each LLM node's output to its FHIR schema.
+
+Generated by scripts/generate_output_tools.py from sidecar/schemas — do not edit.
+"""
+
+from typing import Any
+
+'''
+
+
+def build_tool(node_name: str, schema: dict[str, Any]) -> dict[str, Any]:
+    input_schema = {k: v for k, v in schema.items() if k not in ("$schema", "title", "description")}
+    return {
+        "name": f"record_{node_name}_output",
+        "description": schema.get("description", f"Record the {node_name} output."),
+        "input_schema": input_schema,
+    }
+
+
+def build_tools(schema_dir: Path = SCHEMA_DIR) -> dict[str, dict[str, Any]]:
+    tools = {}
+    for node_name in NODES:
+        with open(schema_dir / f"{node_name}_output.json") as f:
+            tools[node_name] = build_tool(node_name, json.load(f))
+    return tools
+
+
+def _literal(value: Any, indent: int = 0) -> str:
+    """Python source for a JSON value, one key/item per line (scalar lists inline)."""
+    pad = " " * (indent + 4)
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        items = [f"{pad}{_scalar(k)}: {_literal(v, indent + 4)}," for k, v in value.items()]
+        return "{\n" + "\n".join(items) + "\n" + " " * indent + "}"
+    if isinstance(value, list):
+        if all(not isinstance(v, (dict, list)) for v in value):
+            return "[" + ", ".join(_scalar(v) for v in value) + "]"
+        items = [f"{pad}{_literal(v, indent + 4)}," for v in value]
+        return "[\n" + "\n".join(items) + "\n" + " " * indent + "]"
+    return _scalar(value)
+
+
+def _scalar(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, str) else repr(value)
+
+
+def render(tools: dict[str, dict[str, Any]]) -> str:
+    return f"{HEADER}OUTPUT_TOOLS: dict[str, dict[str, Any]] = {_literal(tools)}\n"
+
+
+def main() -> None:
+    tools = build_tools()
+    OUTPUT_PATH.write_text(render(tools))
+    logger.info("Wrote %d output tools to %s", len(tools), OUTPUT_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Train the in-process encounter classifier (src.routing.local_classifier).
+
+Usage:
+    python -m scripts.train_local_classifier \
+        --feedback feedback.jsonl --approved approved.jsonl --output local_classifier.npz
+
+Inputs are JSONL exports with the encounter text joined in:
+    --feedback  classifier_feedback rows: {"encounter_id", "encounter_text", "corrected_category"}
+    --approved  approved encounters:      {"encounter_id", "encounter_text", "category"}
+
+A clinician correction overrides the approved category for the same
+encounter. A held-out split is used to fit the probability temperature
+and the per-category confidence bars; categories that cannot reach
+--target-precision on it are always deferred to the LLM. Point
+LOCAL_CLASSIFIER_PATH at the output to enable the fast path.
+
+The exports contain encounter text — keep them (and the run directory)
+inside the PHI boundary.
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+
+from src.routing.classifier import CLINICAL_CATEGORIES
+from src.routing.local_classifier import (
+    LocalClassifier,
+    batch_logits,
+    category_thresholds,
+    fit_temperature,
+    softmax,
+    train,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_examples(feedback_path: Path | None, approved_path: Path | None) -> dict[str, tuple[str, str]]:
+    """encounter_id -> (text, label); feedback rows are read last so corrections win."""
+    examples: dict[str, tuple[str, str]] = {}
+    for path, label_field in ((approved_path, "category"), (feedback_path, "corrected_category")):
+        if path is None:
+            continue
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if row.get(label_field) in CLINICAL_CATEGORIES and row.get("encounter_text"):
+                    examples[row["encounter_id"]] = (row["encounter_text"], row[label_field])
+    return examples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--feedback", type=Path)
+    parser.add_argument("--approved", type=Path)
+    parser.add_argument("--output", type=Path, default=Path("local_classifier.npz"))
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--target-precision", type=float, default=0.95)
+    parser.add_argument("--min-support", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    examples = list(load_examples(args.feedback, args.approved).values())
+    if not examples:
+        logger.error("No labelled examples — pass --feedback and/or --approved exports")
+        return
+
+    order = np.random.default_rng(args.seed).permutation(len(examples))
+    split = int(len(examples) * (1 - args.holdout))
+    train_set = [examples[i] for i in order[:split]]
+    holdout = [examples[i] for i in order[split:]]
+    logger.info("Training on %d encounters, calibrating on %d", len(train_set), len(holdout))
+
+    weights, bias = train(
+        [text for text, _ in train_set], [label for _, label in train_set], CLINICAL_CATEGORIES, seed=args.seed
+    )
+
+    holdout_labels = np.array([CLINICAL_CATEGORIES.index(label) for _, label in holdout])
+    holdout_logits = batch_logits([text for text, _ in holdout], weights, bias)
+    temperature = fit_temperature(holdout_logits, holdout_labels)
+    probs = softmax(holdout_logits / temperature)
+    thresholds = category_thresholds(probs, holdout_labels, args.target_precision, args.min_support)
+
+    confidence = probs.max(axis=1)
+    predicted = probs.argmax(axis=1)
+    local = confidence >= thresholds[predicted]
+    for i, category in enumerate(CLINICAL_CATEGORIES):
+        answered = local & (predicted == i)
+        precision = (holdout_labels[answered] == i).mean() if answered.any() else float("nan")
+        logger.info(
+            "%-26s bar=%-6s answered locally=%4d precision=%.3f",
+            category,
+            f"{thresholds[i]:.3f}" if np.isfinite(thresholds[i]) else "defer",
+            answered.sum(),
+            precision,
+        )
+    logger.info(
+        "Temperature %.2f; %.1f%% of held-out encounters would skip the LLM",
+        temperature,
+        100 * local.mean() if len(local) else 0.0,
+    )
+
+    LocalClassifier(CLINICAL_CATEGORIES, weights, bias, temperature, thresholds).save(args.output)
+    logger.info("Wrote %s", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,14 @@ import json
 import logging
 from typing import Any
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sse_starlette.sse import EventSourceResponse
 
+from src.api.triage import build_initial_state, finalize_triage
+from src.graph.checkpoint import prepare_run, release_run
 from src.middleware.auth import verify_firebase_token
 from src.middleware.rate_limit import limiter, STREAM_RATE_LIMIT
+from src.models import TriageRequest
 from src.services.firestore import FirestoreService
 
 logger = logging.getLogger(__name__)
@@ -15,11 +18,110 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api")
 
 _firestore: FirestoreService | None = None
+_pipeline = None
+
+# Pipeline node -> progress event name emitted to the client
+NODE_EVENTS: dict[str, str] = {
+    "classify_and_route": "classified",
+    "input_scan": "scanned",
+    "extractor": "extracted",
+    "rag_retriever": "retrieved",
+    "reasoner": "reasoned",
+    "sentinel": "validated",
+    "manual_review": "manual_review",
+}
+
+
+def set_dependencies(firestore: FirestoreService | None, pipeline=None) -> None:
+    global _firestore, _pipeline
+    _firestore = firestore
+    _pipeline = pipeline
+
+
+def _progress_payload(node: str, update: dict[str, Any]) -> dict[str, Any]:
+    """Summarize a node update for the client — no clinical content (PHI)."""
+    payload: dict[str, Any] = {
+        "node": node,
+        "duration_ms": update.get("node_durations_ms", {}).get(node),
+    }
+    if "routing_metadata" in update:
+        routing = update["routing_metadata"]
+        payload["category"] = routing.get("category")
+        payload["selected_model"] = routing.get("selected_model")
+        payload["classifier_path"] = routing.get("classifier_path")
+    if "rag_context" in update:
+        payload["protocols"] = len(update["rag_context"])
+    if "triage_decision" in update:
+        payload["level"] = update["triage_decision"].get("level")
+        payload["confidence"] = update["triage_decision"].get("confidence")
+    if "sentinel_check" in update:
+        payload["passed"] = update["sentinel_check"].get("passed")
+    if "circuit_breaker_tripped" in update:
+        payload["circuit_breaker_tripped"] = update["circuit_breaker_tripped"]
+    return payload
+
+
+@router.post("/stream/triage")
+@limiter.limit(STREAM_RATE_LIMIT)
+async def stream_triage_progress(
+    request: Request, body: TriageRequest, user: dict = Depends(verify_firebase_token)
+) -> EventSourceResponse:
+    """Run triage for one encounter, streaming an SSE event as each node completes.
+
+    Emits classified / extracted / retrieved / reasoned / validated (plus
+    scanned and manual_review where applicable) with node durations, then a
+    final ``completed`` event carrying the TriageResultResponse.
+
+    Events are node-level only. AnthropicClient streams the extractor,
+    reasoner and sentinel tool calls internally, but their partial output
+    is unvalidated and may hold PHI, so it is never forwarded.
+    """
+    if _pipeline is None:
+        raise HTTPException(status_code=503, detail="Pipeline not initialized")
 
+    async def event_generator():
+        event_id = 0
+        final_state: dict[str, Any] = {}
 
-def set_dependencies(firestore: FirestoreService | None) -> None:
-    global _firestore
-    _firestore = firestore
+        try:
+            run_input, config = await prepare_run(_pipeline, build_initial_state(body))
+            async for mode, chunk in _pipeline.astream(
+                run_input, config, stream_mode=["updates", "values"]
+            ):
+                if mode == "values":
+                    final_state = chunk
+                    continue
+                for node, update in chunk.items():
+                    event = NODE_EVENTS.get(node)
+                    if event is None or not update:
+                        continue
+                    event_id += 1
+                    yield {
+                        "event": event,
+                        "data": json.dumps(_progress_payload(node, update), default=str),
+                        "id": str(event_id),
+                    }
+
+            response = await finalize_triage(body, final_state)
+            await release_run(_pipeline, body.encounter_id)
+        except Exception:
+            logger.exception("Streaming triage failed for %s", body.encounter_id)
+            event_id += 1
+            yield {
+                "event": "error",
+                "data": json.dumps({"encounter_id": body.encounter_id, "detail": "Triage failed"}),
+                "id": str(event_id),
+            }
+            return
+
+        event_id += 1
+        yield {
+            "event": "completed",
+            "data": response.model_dump_json(),
+            "id": str(event_id),
+        }
+
+    return EventSourceResponse(event_generator())
 
 
 @router.get("/stream/triage-results")
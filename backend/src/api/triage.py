@@ -1,11 +1,18 @@
+import math
 from datetime import datetime, timezone
+from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 
+from src.config import get_settings
+from src.graph.checkpoint import prepare_run, release_run
+from src.graph.deadline import deadline_from_now
 from src.graph.state import AgentState
 from src.middleware.auth import verify_firebase_token
 from src.middleware.rate_limit import limiter, TRIAGE_RATE_LIMIT
-from src.models import TriageRequest, TriageResultResponse
+from src.models import TriageJobAccepted, TriageJobStatus, TriageRequest, TriageResultResponse
+from src.services.llm_quota import LLMQuotaExceeded
+from src.services.triage_jobs import TriageJob, TriageJobQueue, TriageJobQueueFull
 
 router = APIRouter(prefix="/api")
 
@@ -13,13 +20,15 @@ router = APIRouter(prefix="/api")
 _pipeline = None
 _audit_writer = None
 _firestore = None
+_job_queue: TriageJobQueue | None = None
 
 
-def set_dependencies(pipeline, audit_writer, firestore) -> None:
-    global _pipeline, _audit_writer, _firestore
+def set_dependencies(pipeline, audit_writer, firestore, job_queue=None) -> None:
+    global _pipeline, _audit_writer, _firestore, _job_queue
     _pipeline = pipeline
     _audit_writer = audit_writer
     _firestore = firestore
+    _job_queue = job_queue
 
 
 @router.post("/triage", response_model=TriageResultResponse)
@@ -29,7 +38,105 @@ async def run_triage(request: Request, body: TriageRequest, user: dict = Depends
     if _pipeline is None:
         raise HTTPException(status_code=503, detail="Pipeline not initialized")
 
-    initial_state: AgentState = {
+    try:
+        return await execute_triage(body)
+    except LLMQuotaExceeded as exc:
+        # Completed nodes are checkpointed, so the retry resumes where this stopped
+        raise HTTPException(
+            status_code=503,
+            detail=f"LLM capacity exhausted for {exc.model} — retry later",
+            headers={"Retry-After": str(max(1, math.ceil(exc.wait_s)))},
+        )
+
+
+@router.post("/triage/jobs", response_model=TriageJobAccepted, status_code=202)
+@limiter.limit(TRIAGE_RATE_LIMIT)
+async def submit_triage_job(request: Request, body: TriageRequest, user: dict = Depends(verify_firebase_token)) -> TriageJobAccepted:
+    """Queue an encounter for background triage and return immediately.
+
+    Progress is pollable at the returned status URL and pushed over the
+    triage-results SSE stream via the session's ``job_status`` field.
+    """
+    if _pipeline is None or _job_queue is None:
+        raise HTTPException(status_code=503, detail="Pipeline not initialized")
+
+    try:
+        job = await _job_queue.submit(body.encounter_id, body, owner_uid=user.get("uid"))
+    except TriageJobQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Triage queue is full — retry later",
+            headers={"Retry-After": "5"},
+        )
+
+    return TriageJobAccepted(
+        job_id=job.job_id,
+        encounter_id=job.encounter_id,
+        status=job.status,
+        status_url=f"/api/triage/jobs/{job.job_id}",
+    )
+
+
+@router.get("/triage/jobs/{job_id}", response_model=TriageJobStatus)
+@limiter.limit(TRIAGE_RATE_LIMIT)
+async def get_triage_job(request: Request, job_id: str, user: dict = Depends(verify_firebase_token)) -> TriageJobStatus:
+    """Poll the status of a background triage job.
+
+    Jobs live in the memory of the instance that accepted them; a poll that
+    lands on another instance is answered from the Firestore job record.
+    Jobs belonging to another user are reported as not found.
+    """
+    job = _job_queue.get(job_id) if _job_queue is not None else None
+    if job is not None:
+        if job.owner_uid != user.get("uid"):
+            raise HTTPException(status_code=404, detail="Triage job not found")
+        return TriageJobStatus(
+            job_id=job.job_id,
+            encounter_id=job.encounter_id,
+            status=job.status,
+            result=job.result,
+            error=job.error,
+        )
+
+    record = await _firestore.get_triage_job(job_id) if _firestore is not None else None
+    if record is None or record.get("owner_uid") != user.get("uid"):
+        raise HTTPException(status_code=404, detail="Triage job not found")
+    return TriageJobStatus(
+        job_id=job_id,
+        encounter_id=record["encounter_id"],
+        status=record["job_status"],
+        result=record.get("result"),
+        error=record.get("job_error"),
+    )
+
+
+async def publish_job_status(job: TriageJob) -> None:
+    """Mirror job progress onto the Firestore session so the SSE watch pushes it.
+
+    Written to ``job_status`` rather than ``status``, which belongs to the
+    approval workflow and is set by execute_triage on completion. The job
+    record (status, owner and result, never the encounter text) is also
+    written under its job id so any instance can answer get_triage_job.
+    """
+    if _firestore is None:
+        return
+    data = {
+        "job_id": job.job_id,
+        "job_status": job.status,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if job.error:
+        data["job_error"] = job.error
+    await _firestore.write_session(job.encounter_id, data)
+
+    record = {**data, "encounter_id": job.encounter_id, "owner_uid": job.owner_uid}
+    if isinstance(job.result, TriageResultResponse):
+        record["result"] = job.result.model_dump()
+    await _firestore.write_triage_job(job.job_id, record)
+
+
+def build_initial_state(body: TriageRequest) -> AgentState:
+    return {
         "raw_input": body.encounter_text,
         "encounter_id": body.encounter_id,
         "patient_id": body.patient_id,
@@ -37,10 +144,21 @@ async def run_triage(request: Request, body: TriageRequest, user: dict = Depends
         "compliance_flags": [],
         "circuit_breaker_tripped": False,
         "error": None,
+        "deadline_at": deadline_from_now(get_settings().latency_budget_ms),
     }
 
-    result = await _pipeline.ainvoke(initial_state)
 
+async def execute_triage(body: TriageRequest) -> TriageResultResponse:
+    """Run the pipeline, publish TriageCompleted and record the session."""
+    run_input, config = await prepare_run(_pipeline, build_initial_state(body))
+    result = await _pipeline.ainvoke(run_input, config)
+    response = await finalize_triage(body, result)
+    await release_run(_pipeline, body.encounter_id)
+    return response
+
+
+async def finalize_triage(body: TriageRequest, result: dict[str, Any]) -> TriageResultResponse:
+    """Publish TriageCompleted and record the session for a finished pipeline run."""
     triage = result.get("triage_decision", {})
     sentinel = result.get("sentinel_check", {})
     audit_trail = result.get("audit_trail", [])
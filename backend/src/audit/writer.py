@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 
+from src.graph.state import merge_flags
 from src.services.firestore import FirestoreService
 from src.services.metrics import record_llm_usage
 from src.services.pubsub import PubSubService
@@ -38,28 +39,27 @@ class AuditWriter:
         compliance_flags: list[str],
         sentinel_check: dict[str, Any] | None,
         duration_ms: int,
+        deadline_adaptations: list[dict[str, Any]] | None = None,
     ) -> str:
         timestamp = datetime.now(timezone.utc).isoformat()
 
-        # PHI strip input_summary and output_summary before persistence
+        # PHI strip input_summary and output_summary before persistence (one round trip)
         if self._sidecar:
-            input_strip = await self._sidecar.validate(
-                content=input_summary,
-                node_name=node_name,
-                encounter_id=encounter_id,
-                validation_type="audit",
+            input_strip, output_strip = await self._sidecar.validate_batch(
+                [
+                    {
+                        "content": summary,
+                        "node_name": node_name,
+                        "encounter_id": encounter_id,
+                        "validation_type": "audit",
+                    }
+                    for summary in (input_summary, output_summary)
+                ]
             )
             input_summary = input_strip.content
-            compliance_flags = list(compliance_flags) + input_strip.compliance_flags
-
-            output_strip = await self._sidecar.validate(
-                content=output_summary,
-                node_name=node_name,
-                encounter_id=encounter_id,
-                validation_type="audit",
-            )
             output_summary = output_strip.content
-            compliance_flags = compliance_flags + output_strip.compliance_flags
+            compliance_flags = merge_flags(compliance_flags, input_strip.compliance_flags)
+            compliance_flags = merge_flags(compliance_flags, output_strip.compliance_flags)
 
         audit_doc = {
             "encounter_id": encounter_id,
@@ -73,6 +73,7 @@ class AuditWriter:
             "compliance_flags": compliance_flags,
             "sentinel_check": sentinel_check,
             "duration_ms": duration_ms,
+            "deadline_adaptations": deadline_adaptations or [],
             "timestamp": timestamp,
         }
 
@@ -89,6 +90,8 @@ class AuditWriter:
                 "model": model,
                 "input_tokens": tokens.get("in", 0),
                 "output_tokens": tokens.get("out", 0),
+                "cache_read_tokens": tokens.get("cache_read", 0),
+                "cache_write_tokens": tokens.get("cache_write", 0),
                 "cost_usd": cost_usd,
                 "duration_ms": duration_ms,
             },
@@ -100,6 +103,8 @@ class AuditWriter:
             input_tokens=tokens.get("in", 0),
             output_tokens=tokens.get("out", 0),
             cost_usd=cost_usd,
+            cache_read_tokens=tokens.get("cache_read", 0),
+            cache_write_tokens=tokens.get("cache_write", 0),
         )
 
         # Await Pub/Sub publish — surface failures for HIPAA audit integrity
@@ -0,0 +1,210 @@
+"""Pipeline checkpointing so a retried encounter resumes from the last completed node."""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.base.id import UUID
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.errors import InvalidUpdateError
+
+from src.config import Settings
+from src.graph.state import AgentState
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the time between two sweeps for abandoned threads
+_SWEEP_INTERVAL_S = 300.0
+
+# Checkpoint ids are UUIDv6: 100ns ticks since the Gregorian epoch (1582-10-15)
+_UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+# Threads whose newest checkpoint (the Checkpoint "ts", always UTC ISO-8601) is
+# older than the TTL. Reads only the checkpoints table — no channel blobs.
+_STALE_THREADS_SQL = """
+SELECT thread_id
+FROM checkpoints
+GROUP BY thread_id
+HAVING max((checkpoint ->> 'ts')::timestamptz) < now() - make_interval(secs => %s)
+"""
+
+
+@asynccontextmanager
+async def open_checkpointer(settings: Settings) -> AsyncIterator[BaseCheckpointSaver | None]:
+    """Yield the configured checkpoint saver ("none", "memory" or "postgres").
+
+    The in-memory saver only resumes on the instance that ran the first
+    attempt, so it is for local development. The Postgres saver reuses the
+    Cloud SQL instance (``cloudsql_dsn``) and needs the ``postgres`` extra
+    (``langgraph-checkpoint-postgres``).
+    """
+    backend = settings.pipeline_checkpointer
+
+    if backend == "none":
+        yield None
+    elif backend == "memory":
+        logger.info("Pipeline checkpointing: in-memory")
+        yield InMemorySaver()
+    elif backend == "postgres":
+        try:
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+        except ImportError as exc:
+            raise RuntimeError(
+                "PIPELINE_CHECKPOINTER=postgres needs langgraph-checkpoint-postgres; "
+                "install sentinel-health-backend[postgres]"
+            ) from exc
+
+        async with AsyncPostgresSaver.from_conn_string(settings.cloudsql_dsn) as saver:
+            await saver.setup()
+            logger.info("Pipeline checkpointing: Postgres")
+            yield saver
+    else:
+        raise ValueError(f"Unknown pipeline_checkpointer backend: {backend!r}")
+
+
+def _checkpointer(pipeline: Any) -> BaseCheckpointSaver | None:
+    saver = getattr(pipeline, "checkpointer", None)
+    return saver if isinstance(saver, BaseCheckpointSaver) else None
+
+
+def thread_config(encounter_id: str) -> dict[str, Any]:
+    return {"configurable": {"thread_id": encounter_id}}
+
+
+async def prepare_run(
+    pipeline: Any, initial_state: AgentState
+) -> tuple[AgentState | None, dict[str, Any] | None]:
+    """Return the (input, config) pair to run the pipeline with.
+
+    When a checkpoint exists for the same encounter and input text, the
+    input is None so LangGraph resumes after the last completed node — or,
+    if the run already finished (e.g. only the Pub/Sub publish failed),
+    returns the stored final state without re-running any node.
+    """
+    saver = _checkpointer(pipeline)
+    if saver is None:
+        return initial_state, None
+
+    config = thread_config(initial_state["encounter_id"])
+    snapshot = await pipeline.aget_state(config)
+
+    if snapshot.values and snapshot.values.get("raw_input") == initial_state["raw_input"]:
+        logger.info(
+            "Resuming encounter %s from checkpoint (next: %s)",
+            initial_state["encounter_id"],
+            ", ".join(snapshot.next) or "finished",
+        )
+        if snapshot.next and "deadline_at" in initial_state:
+            await _refresh_deadline(pipeline, config, initial_state["deadline_at"])
+        return None, config
+
+    if snapshot.values:
+        # Different input for the same encounter: start over. Reducer-backed
+        # channels (audit_trail, compliance_flags) would otherwise accumulate
+        # onto the stale run.
+        await release_run(pipeline, initial_state["encounter_id"])
+
+    return initial_state, config
+
+
+async def _refresh_deadline(pipeline: Any, config: dict[str, Any], deadline_at: float) -> None:
+    """Give the remaining nodes a fresh latency budget instead of the expired original.
+
+    LangGraph cannot attribute a state update when the last completed step
+    ran parallel branches; the original deadline is kept in that case.
+    """
+    try:
+        await pipeline.aupdate_state(config, {"deadline_at": deadline_at})
+    except InvalidUpdateError:
+        logger.info("Keeping original deadline for resumed run %s", config["configurable"]["thread_id"])
+
+
+async def release_run(pipeline: Any, encounter_id: str) -> None:
+    """Drop an encounter's checkpoints once its result has been fully delivered."""
+    saver = _checkpointer(pipeline)
+    if saver is None:
+        return
+    try:
+        await saver.adelete_thread(encounter_id)
+    except Exception:
+        logger.warning("Failed to delete checkpoints for %s", encounter_id, exc_info=True)
+
+
+@asynccontextmanager
+async def checkpoint_sweeper(
+    saver: BaseCheckpointSaver | None, ttl_s: float, interval_s: float = _SWEEP_INTERVAL_S
+) -> AsyncIterator[None]:
+    """Run sweep_stale_runs in the background for the lifetime of the context.
+
+    A no-op without a saver or with ``ttl_s <= 0``. The sweeper is
+    cancelled on exit, before the saver itself is closed.
+    """
+    if saver is None or ttl_s <= 0:
+        yield
+        return
+
+    task = asyncio.create_task(
+        _sweep_periodically(saver, ttl_s, min(ttl_s, interval_s)), name="checkpoint-sweeper"
+    )
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def _sweep_periodically(saver: BaseCheckpointSaver, ttl_s: float, interval_s: float) -> None:
+    while True:
+        try:
+            await sweep_stale_runs(saver, ttl_s)
+        except Exception:
+            logger.warning("Checkpoint sweep failed", exc_info=True)
+        await asyncio.sleep(interval_s)
+
+
+async def sweep_stale_runs(saver: BaseCheckpointSaver, ttl_s: float) -> list[str]:
+    """Delete threads whose newest checkpoint is older than ``ttl_s`` seconds.
+
+    release_run only fires for runs whose result was delivered; a run that
+    failed and was never retried would otherwise keep its checkpoints (and
+    the encounter text in them) forever. Checkpoint ages are read from the
+    checkpoint ids (in memory) or the checkpoints table (Postgres); no
+    checkpoint is deserialized. Returns the deleted thread ids.
+    """
+    if isinstance(saver, InMemorySaver):
+        stale = _stale_in_memory_threads(saver, time.time() - ttl_s)
+    else:
+        stale = await _stale_postgres_threads(saver, ttl_s)
+
+    for thread_id in stale:
+        await saver.adelete_thread(thread_id)
+    if stale:
+        logger.info("Deleted checkpoints of %d abandoned pipeline runs", len(stale))
+    return stale
+
+
+def _stale_in_memory_threads(saver: InMemorySaver, cutoff: float) -> list[str]:
+    stale = []
+    for thread_id, namespaces in list(saver.storage.items()):
+        checkpoint_ids = [checkpoint_id for ns in namespaces.values() for checkpoint_id in ns]
+        if checkpoint_ids and max(map(_written_at, checkpoint_ids)) < cutoff:
+            stale.append(thread_id)
+    return stale
+
+
+def _written_at(checkpoint_id: str) -> float:
+    return (UUID(checkpoint_id).time - _UUID_EPOCH_OFFSET) / 1e7
+
+
+async def _stale_postgres_threads(saver: Any, ttl_s: float) -> list[str]:
+    # AsyncPostgresSaver serializes use of its connection with ``lock``
+    async with saver.lock, saver.conn.cursor() as cur:
+        await cur.execute(_STALE_THREADS_SQL, (ttl_s,))
+        rows = await cur.fetchall()
+    return [row["thread_id"] for row in rows]
@@ -0,0 +1,81 @@
+"""Per-encounter latency budget (ADR-3) and the adaptations made to stay within it."""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from src.config import Settings
+from src.graph.state import AgentState
+
+logger = logging.getLogger(__name__)
+
+
+def deadline_from_now(budget_ms: int) -> float:
+    """Absolute deadline (epoch seconds) for an encounter starting now."""
+    return time.time() + budget_ms / 1000
+
+
+def remaining_ms(state: AgentState) -> int | None:
+    """Milliseconds left before the encounter's deadline, or None if untracked."""
+    deadline_at = state.get("deadline_at")
+    if deadline_at is None:
+        return None
+    return int((deadline_at - time.time()) * 1000)
+
+
+@dataclass(frozen=True)
+class DeadlinePolicy:
+    """How the pipeline degrades as the latency budget runs low.
+
+    Adaptations only ever shed optional work (RAG context, classifier
+    wait) — model selection, the ModelRouter safety floors and the nodes'
+    output limits are never touched: a forced tool call cut short by a
+    lower max_tokens fails to parse and would send the encounter to manual
+    review. A classifier that times out falls back to confidence 0.0,
+    which the router escalates.
+    """
+
+    classifier_share: float = 0.3
+    min_classifier_timeout_s: float = 0.5
+    skip_rag_below_ms: int = 2000
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "DeadlinePolicy":
+        return cls(
+            classifier_share=settings.deadline_classifier_share,
+            min_classifier_timeout_s=settings.deadline_min_classifier_timeout_s,
+            skip_rag_below_ms=settings.deadline_skip_rag_below_ms,
+        )
+
+    def classifier_timeout(
+        self, state: AgentState, default: float
+    ) -> tuple[float, dict[str, Any] | None]:
+        remaining = remaining_ms(state)
+        if remaining is None:
+            return default, None
+        allowance = max(self.min_classifier_timeout_s, remaining / 1000 * self.classifier_share)
+        if allowance >= default:
+            return default, None
+        return allowance, _adaptation(
+            state, "classify_and_route", "classifier_timeout_capped", remaining, timeout_s=round(allowance, 2)
+        )
+
+    def skip_rag(self, state: AgentState) -> dict[str, Any] | None:
+        remaining = remaining_ms(state)
+        if remaining is None or remaining >= self.skip_rag_below_ms:
+            return None
+        return _adaptation(state, "rag_retriever", "rag_skipped", remaining)
+
+
+def _adaptation(
+    state: AgentState, stage: str, action: str, remaining: int, **detail: Any
+) -> dict[str, Any]:
+    logger.info(
+        "Latency budget adaptation for %s: %s at %s (%dms remaining)",
+        state.get("encounter_id", "unknown"),
+        action,
+        stage,
+        remaining,
+    )
+    return {"stage": stage, "action": action, "remaining_ms": remaining, **detail}
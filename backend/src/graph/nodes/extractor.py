@@ -3,9 +3,11 @@ import logging
 from typing import Any
 
 from src.audit.writer import AuditWriter
-from src.graph.state import AgentState
+from src.graph.output_tools import OUTPUT_TOOLS
+from src.graph.state import AgentState, merge_flags
 from src.services.anthropic_client import AnthropicClient
 from src.services.sidecar_client import SidecarClient
+from src.services.token_estimator import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,7 @@ Extract the following fields as JSON:
 Be precise. If information is not present, use null. Do not infer or hallucinate data."""
 
 MAX_RETRIES = 2
+DEFAULT_MAX_TOKENS = 4096
 
 
 async def extractor_node(
@@ -40,21 +43,26 @@ async def extractor_node(
     raw_input = state["raw_input"]
 
     # --- Sidecar: validate input (PII scan) ---
-    compliance_flags: list[str] = list(state.get("compliance_flags", []))
-    validated_input = raw_input
+    # Normally already done by the parallel input_scan branch of the pipeline.
+    # Flags raised by this node only — merged into state by the merge_flags reducer
+    compliance_flags: list[str] = []
+    validated_input = state.get("validated_input", raw_input)
 
-    if sidecar_client:
+    if sidecar_client and "validated_input" not in state:
         input_result = await sidecar_client.validate(
             content=raw_input,
             node_name="extractor",
             encounter_id=encounter_id,
             validation_type="input",
+            tokens={"in": estimate_tokens(EXTRACTOR_SYSTEM_PROMPT) + estimate_tokens(raw_input), "out": 0},
         )
         validated_input = input_result.content
         compliance_flags.extend(input_result.compliance_flags)
 
-    # LLM call with retry on FHIR validation failure
+    # LLM call constrained to the node's output schema; a FHIR validation
+    # failure is repaired with a follow-up turn rather than a fresh generation
     response = None
+    repair: dict[str, Any] | None = None
     extracted = None
 
     for attempt in range(1 + MAX_RETRIES):
@@ -62,6 +70,11 @@ async def extractor_node(
             model=model,
             system_prompt=EXTRACTOR_SYSTEM_PROMPT,
             user_message=validated_input,
+            max_tokens=DEFAULT_MAX_TOKENS,
+            output_tool=OUTPUT_TOOLS["extractor"],
+            repair=repair,
+            deadline_at=state.get("deadline_at"),
+            priority=state["routing_metadata"].get("priority"),
         )
 
         # --- Sidecar: validate output (PII + FHIR + token guard) ---
@@ -76,6 +89,11 @@ async def extractor_node(
             compliance_flags.extend(output_result.compliance_flags)
 
             if output_result.should_retry and attempt < MAX_RETRIES:
+                repair = {
+                    "tool_use_id": response.get("tool_use_id"),
+                    "content": response["content"],
+                    "errors": output_result.errors,
+                }
                 logger.warning(
                     "FHIR validation failed for extractor (attempt %d/%d): %s",
                     attempt + 1,
@@ -105,6 +123,9 @@ async def extractor_node(
         compliance_flags.append("JSON_PARSE_FAILED")
         extracted = {}
 
+    # A hedged call also paid for the cancelled duplicate
+    cost_usd = response["cost_usd"] + response.get("hedge_cost_usd", 0.0)
+
     audit_ref = await audit_writer.write_node_audit(
         encounter_id=encounter_id,
         node_name="extractor",
@@ -113,28 +134,30 @@ async def extractor_node(
             "category": state["routing_metadata"]["category"],
             "confidence": state["routing_metadata"]["classifier_confidence"],
             "reason": state["routing_metadata"].get("escalation_reason", "default"),
+            "classifier_path": state["routing_metadata"].get("classifier_path"),
+            "safety_matches": state["routing_metadata"].get("safety_matches", []),
         },
         input_summary=raw_input[:500],
         output_summary=json.dumps(extracted)[:500],
         tokens=response["tokens"],
-        cost_usd=response["cost_usd"],
-        compliance_flags=compliance_flags,
+        cost_usd=cost_usd,
+        compliance_flags=merge_flags(state.get("compliance_flags"), compliance_flags),
         sentinel_check=None,
         duration_ms=response["duration_ms"],
+        deadline_adaptations=state.get("deadline_adaptations", []),
     )
 
     result: dict[str, Any] = {
         "fhir_data": extracted,
         "clinical_context": extracted,
-        "compliance_flags": compliance_flags,
-        "audit_trail": state.get("audit_trail", [])
-        + [
+        "compliance_flags": merge_flags([], compliance_flags),
+        "audit_trail": [
             {
                 "encounter_id": encounter_id,
                 "node": "extractor",
                 "model": response["model"],
                 "tokens": response["tokens"],
-                "cost_usd": response["cost_usd"],
+                "cost_usd": cost_usd,
                 "duration_ms": response["duration_ms"],
                 "audit_ref": audit_ref,
             }
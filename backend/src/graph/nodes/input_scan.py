@@ -0,0 +1,38 @@
+import logging
+from typing import Any
+
+from src.graph.nodes.extractor import EXTRACTOR_SYSTEM_PROMPT
+from src.graph.state import AgentState
+from src.services.sidecar_client import SidecarClient
+from src.services.token_estimator import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+async def input_scan_node(
+    state: AgentState,
+    *,
+    sidecar_client: SidecarClient | None = None,
+) -> dict[str, Any]:
+    """PII-scan the raw encounter text ahead of extraction.
+
+    Runs as a parallel branch alongside classify_and_route — the scan does
+    not depend on routing — and is joined before the extractor, which then
+    reuses ``validated_input`` instead of making its own sidecar round trip.
+    """
+    if sidecar_client is None:
+        return {"validated_input": state["raw_input"]}
+
+    input_result = await sidecar_client.validate(
+        content=state["raw_input"],
+        node_name="extractor",
+        encounter_id=state["encounter_id"],
+        validation_type="input",
+        # Local estimate so the sidecar's TokenGuard sees a real input size
+        tokens={"in": estimate_tokens(EXTRACTOR_SYSTEM_PROMPT) + estimate_tokens(state["raw_input"]), "out": 0},
+    )
+
+    return {
+        "validated_input": input_result.content,
+        "compliance_flags": input_result.compliance_flags,
+    }
@@ -0,0 +1,109 @@
+import json
+import logging
+from typing import Any
+
+from src.audit.writer import AuditWriter
+from src.graph.state import AgentState, SentinelCheck, TriageDecision, merge_flags
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_STAGES = ["extractor", "rag_retriever", "reasoner", "sentinel"]
+
+
+async def manual_review_node(
+    state: AgentState,
+    *,
+    audit_writer: AuditWriter,
+) -> dict[str, Any]:
+    """Terminal node for encounters whose circuit breaker tripped mid-pipeline.
+
+    Skips the remaining LLM stages, forces a Manual_Review_Required decision
+    and writes one consolidated audit record summarizing the short-circuit.
+    """
+    encounter_id = state["encounter_id"]
+    routing = state.get("routing_metadata", {})
+    audit_trail = state.get("audit_trail", [])
+    error = state.get("error") or "Circuit breaker tripped"
+
+    completed = [entry["node"] for entry in audit_trail]
+    # Named by the node (or guard) that tripped the breaker — a guard that
+    # rejects a call before it is made leaves no audit entry to infer it from
+    tripped_at = state.get("tripped_at") or "unknown"
+    if tripped_at in PIPELINE_STAGES:
+        skipped = PIPELINE_STAGES[PIPELINE_STAGES.index(tripped_at) + 1 :]
+    else:
+        skipped = list(PIPELINE_STAGES)
+
+    logger.warning(
+        "Circuit breaker tripped at %s for %s — short-circuiting to manual review (skipped: %s)",
+        tripped_at,
+        encounter_id,
+        ", ".join(skipped) or "none",
+    )
+
+    triage_decision: TriageDecision = {
+        "level": "Manual_Review_Required",
+        "confidence": 0.0,
+        "reasoning_summary": f"Pipeline short-circuited at {tripped_at}: {error}",
+        "recommended_actions": ["Manual clinical review required"],
+        "model_used": routing.get("selected_model", ""),
+        "routing_reason": "circuit_breaker_short_circuit",
+    }
+
+    sentinel_check: SentinelCheck = {
+        "passed": False,
+        "hallucination_score": 1.0,
+        "confidence_score": 0.0,
+        "vitals_cross_ref_passed": False,
+        "medication_safety_passed": False,
+        "circuit_breaker_tripped": True,
+        "failure_reasons": [error],
+    }
+
+    compliance_flags = ["CIRCUIT_BREAKER_SHORT_CIRCUIT"]
+
+    # Totals spent before the trip — reported in the summary only, so LLM
+    # usage metrics are not double-counted under this node.
+    spent = {
+        "tokens_in": sum(e["tokens"].get("in", 0) for e in audit_trail),
+        "tokens_out": sum(e["tokens"].get("out", 0) for e in audit_trail),
+        "cost_usd": round(sum(e["cost_usd"] for e in audit_trail), 8),
+        "duration_ms": sum(e["duration_ms"] for e in audit_trail),
+    }
+
+    audit_ref = await audit_writer.write_node_audit(
+        encounter_id=encounter_id,
+        node_name="manual_review",
+        model="none",
+        routing_decision={
+            "category": routing.get("category"),
+            "confidence": routing.get("classifier_confidence"),
+            "reason": "circuit_breaker_short_circuit",
+        },
+        input_summary=json.dumps({"tripped_at": tripped_at, "completed": completed})[:500],
+        output_summary=json.dumps({"skipped": skipped, "error": error, "spent": spent})[:500],
+        tokens={"in": 0, "out": 0},
+        cost_usd=0.0,
+        compliance_flags=merge_flags(state.get("compliance_flags"), compliance_flags),
+        sentinel_check=dict(sentinel_check),
+        duration_ms=0,
+        deadline_adaptations=state.get("deadline_adaptations", []),
+    )
+
+    return {
+        "triage_decision": triage_decision,
+        "sentinel_check": sentinel_check,
+        "circuit_breaker_tripped": True,
+        "compliance_flags": compliance_flags,
+        "audit_trail": [
+            {
+                "encounter_id": encounter_id,
+                "node": "manual_review",
+                "model": "none",
+                "tokens": {"in": 0, "out": 0},
+                "cost_usd": 0.0,
+                "duration_ms": 0,
+                "audit_ref": audit_ref,
+            }
+        ],
+    }
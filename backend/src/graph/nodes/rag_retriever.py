@@ -1,12 +1,29 @@
 import logging
 from typing import Any
 
+from src.graph.deadline import DeadlinePolicy
 from src.graph.state import AgentState
 from src.services.embedding_service import EmbeddingService
 from src.services.protocol_store import ProtocolStore
 
 logger = logging.getLogger(__name__)
 
+RAW_QUERY_MAX_CHARS = 2000
+
+
+def _query_from_extraction(state: AgentState) -> str:
+    clinical_context = state.get("clinical_context", {})
+    chief_complaint = clinical_context.get("chief_complaint") or ""
+    symptoms = clinical_context.get("symptoms", [])
+    symptom_text = ", ".join(s.get("description", "") for s in symptoms if isinstance(s, dict))
+
+    return f"{chief_complaint}. Symptoms: {symptom_text}" if symptom_text else chief_complaint
+
+
+def _query_from_raw_input(state: AgentState) -> str:
+    # Never embed unscanned text — validated_input is set by the input_scan branch.
+    return state.get("validated_input", "")[:RAW_QUERY_MAX_CHARS]
+
 
 async def rag_retriever_node(
     state: AgentState,
@@ -14,23 +31,31 @@ async def rag_retriever_node(
     protocol_store: ProtocolStore | None = None,
     embedding_service: EmbeddingService | None = None,
     top_k: int = 5,
+    from_raw_input: bool = False,
+    deadline_policy: DeadlinePolicy | None = None,
 ) -> dict[str, Any]:
     """Retrieve similar clinical protocols to augment the reasoner's context.
 
     If protocol_store is None (Cloud SQL not configured), returns empty
     rag_context and the pipeline proceeds without RAG augmentation.
+
+    With from_raw_input=True the query is built from the PII-scanned encounter
+    text instead of the extraction, so retrieval can run concurrently with the
+    extractor LLM call.
     """
     if protocol_store is None or embedding_service is None:
         logger.debug("RAG retrieval skipped — protocol_store or embedding_service not available")
         return {"rag_context": []}
 
-    # Build query from extracted clinical data
-    clinical_context = state.get("clinical_context", {})
-    chief_complaint = clinical_context.get("chief_complaint", "")
-    symptoms = clinical_context.get("symptoms", [])
-    symptom_text = ", ".join(s.get("description", "") for s in symptoms if isinstance(s, dict))
+    if deadline_policy is not None:
+        adaptation = deadline_policy.skip_rag(state)
+        if adaptation is not None:
+            return {"rag_context": [], "deadline_adaptations": [adaptation]}
 
-    query_text = f"{chief_complaint}. Symptoms: {symptom_text}" if symptom_text else chief_complaint
+    if from_raw_input:
+        query_text = _query_from_raw_input(state)
+    else:
+        query_text = _query_from_extraction(state)
 
     if not query_text.strip():
         return {"rag_context": []}
@@ -3,9 +3,11 @@ import logging
 from typing import Any
 
 from src.audit.writer import AuditWriter
-from src.graph.state import AgentState, TriageDecision
+from src.graph.output_tools import OUTPUT_TOOLS
+from src.graph.state import AgentState, TriageDecision, merge_flags
 from src.services.anthropic_client import AnthropicClient
 from src.services.sidecar_client import SidecarClient
+from src.services.token_estimator import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,18 @@ Respond with JSON:
 Be conservative: when in doubt, escalate to a higher triage level."""
 
 MAX_RETRIES = 2
+DEFAULT_MAX_TOKENS = 4096
+
+RAG_PROTOCOL_FIELDS = ("title", "content", "source_type", "specialty")
+
+
+def _rag_prefix(rag_context: list[dict[str, Any]]) -> str | None:
+    """Protocol text for the prompt cache — per-query fields such as
+    ``similarity`` are dropped so the same protocols give identical bytes."""
+    if not rag_context:
+        return None
+    protocols = [{k: p[k] for k in RAG_PROTOCOL_FIELDS if k in p} for p in rag_context]
+    return "Similar cases for reference:\n" + json.dumps(protocols)
 
 
 async def reasoner_node(
@@ -43,19 +57,14 @@ async def reasoner_node(
     model = state["routing_metadata"]["selected_model"]
     encounter_id = state["encounter_id"]
 
-    # RAG context placeholder
-    rag_context = state.get("rag_context", [])
-    rag_section = ""
-    if rag_context:
-        rag_section = "\n\nSimilar cases for reference:\n" + json.dumps(rag_context)
+    # RAG protocol text goes ahead of the encounter as a cacheable prefix
+    rag_prefix = _rag_prefix(state.get("rag_context", []))
 
-    user_message = (
-        f"Clinical data:\n{json.dumps(state['clinical_context'], indent=2)}"
-        f"{rag_section}"
-    )
+    user_message = f"Clinical data:\n{json.dumps(state['clinical_context'], indent=2)}"
 
     # --- Sidecar: validate input (PII scan) ---
-    compliance_flags: list[str] = list(state.get("compliance_flags", []))
+    # Flags raised by this node only — merged into state by the merge_flags reducer
+    compliance_flags: list[str] = []
     validated_input = user_message
 
     if sidecar_client:
@@ -64,12 +73,18 @@ async def reasoner_node(
             node_name="reasoner",
             encounter_id=encounter_id,
             validation_type="input",
+            tokens={
+                "in": sum(estimate_tokens(t) for t in (REASONER_SYSTEM_PROMPT, rag_prefix or "", user_message)),
+                "out": 0,
+            },
         )
         validated_input = input_result.content
         compliance_flags.extend(input_result.compliance_flags)
 
-    # LLM call with retry on FHIR validation failure
+    # LLM call constrained to the node's output schema; a FHIR validation
+    # failure is repaired with a follow-up turn rather than a fresh generation
     response = None
+    repair: dict[str, Any] | None = None
     decision = None
 
     for attempt in range(1 + MAX_RETRIES):
@@ -77,6 +92,12 @@ async def reasoner_node(
             model=model,
             system_prompt=REASONER_SYSTEM_PROMPT,
             user_message=validated_input,
+            max_tokens=DEFAULT_MAX_TOKENS,
+            cached_prefix=rag_prefix,
+            output_tool=OUTPUT_TOOLS["reasoner"],
+            repair=repair,
+            deadline_at=state.get("deadline_at"),
+            priority=state["routing_metadata"].get("priority"),
         )
 
         # --- Sidecar: validate output (PII + FHIR + token guard) ---
@@ -91,6 +112,11 @@ async def reasoner_node(
             compliance_flags.extend(output_result.compliance_flags)
 
             if output_result.should_retry and attempt < MAX_RETRIES:
+                repair = {
+                    "tool_use_id": response.get("tool_use_id"),
+                    "content": response["content"],
+                    "errors": output_result.errors,
+                }
                 logger.warning(
                     "FHIR validation failed for reasoner (attempt %d/%d): %s",
                     attempt + 1,
@@ -138,6 +164,9 @@ async def reasoner_node(
             routing_reason="parse_failure_fallback",
         )
 
+    # A hedged call also paid for the cancelled duplicate
+    cost_usd = response["cost_usd"] + response.get("hedge_cost_usd", 0.0)
+
     audit_ref = await audit_writer.write_node_audit(
         encounter_id=encounter_id,
         node_name="reasoner",
@@ -150,23 +179,23 @@ async def reasoner_node(
         input_summary=user_message[:500],
         output_summary=json.dumps(decision)[:500],
         tokens=response["tokens"],
-        cost_usd=response["cost_usd"],
-        compliance_flags=compliance_flags,
+        cost_usd=cost_usd,
+        compliance_flags=merge_flags(state.get("compliance_flags"), compliance_flags),
         sentinel_check=None,
         duration_ms=response["duration_ms"],
+        deadline_adaptations=state.get("deadline_adaptations", []),
     )
 
     result: dict[str, Any] = {
         "triage_decision": triage_decision,
-        "compliance_flags": compliance_flags,
-        "audit_trail": state.get("audit_trail", [])
-        + [
+        "compliance_flags": merge_flags([], compliance_flags),
+        "audit_trail": [
             {
                 "encounter_id": encounter_id,
                 "node": "reasoner",
                 "model": response["model"],
                 "tokens": response["tokens"],
-                "cost_usd": response["cost_usd"],
+                "cost_usd": cost_usd,
                 "duration_ms": response["duration_ms"],
                 "audit_ref": audit_ref,
             }
@@ -4,9 +4,11 @@ from typing import Any
 
 from src.audit.writer import AuditWriter
 from src.config import Settings
-from src.graph.state import AgentState, SentinelCheck
+from src.graph.output_tools import OUTPUT_TOOLS
+from src.graph.state import AgentState, SentinelCheck, merge_flags
 from src.services.anthropic_client import AnthropicClient
 from src.services.sidecar_client import SidecarClient
+from src.services.token_estimator import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +52,8 @@ async def sentinel_node(
     )
 
     # --- Sidecar: validate input (PII scan) ---
-    compliance_flags: list[str] = list(state.get("compliance_flags", []))
+    # Flags raised by this node only — merged into state by the merge_flags reducer
+    compliance_flags: list[str] = []
     validated_input = user_message
 
     if sidecar_client:
@@ -59,12 +62,15 @@ async def sentinel_node(
             node_name="sentinel",
             encounter_id=encounter_id,
             validation_type="input",
+            tokens={"in": estimate_tokens(HALLUCINATION_CHECK_PROMPT) + estimate_tokens(user_message), "out": 0},
         )
         validated_input = input_result.content
         compliance_flags.extend(input_result.compliance_flags)
 
-    # LLM call with retry on FHIR validation failure
+    # LLM call constrained to the node's output schema; a FHIR validation
+    # failure is repaired with a follow-up turn rather than a fresh generation
     response = None
+    repair: dict[str, Any] | None = None
     validation = None
 
     for attempt in range(1 + MAX_RETRIES):
@@ -73,6 +79,10 @@ async def sentinel_node(
             system_prompt=HALLUCINATION_CHECK_PROMPT,
             user_message=validated_input,
             max_tokens=1024,
+            output_tool=OUTPUT_TOOLS["sentinel"],
+            repair=repair,
+            deadline_at=state.get("deadline_at"),
+            priority=state["routing_metadata"].get("priority"),
         )
 
         # --- Sidecar: validate output (PII + FHIR + token guard) ---
@@ -87,6 +97,11 @@ async def sentinel_node(
             compliance_flags.extend(output_result.compliance_flags)
 
             if output_result.should_retry and attempt < MAX_RETRIES:
+                repair = {
+                    "tool_use_id": response.get("tool_use_id"),
+                    "content": response["content"],
+                    "errors": output_result.errors,
+                }
                 logger.warning(
                     "FHIR validation failed for sentinel (attempt %d/%d): %s",
                     attempt + 1,
@@ -158,6 +173,9 @@ async def sentinel_node(
         "failure_reasons": failure_reasons,
     }
 
+    # A hedged call also paid for the cancelled duplicate
+    cost_usd = response["cost_usd"] + response.get("hedge_cost_usd", 0.0)
+
     audit_ref = await audit_writer.write_node_audit(
         encounter_id=encounter_id,
         node_name="sentinel",
@@ -170,24 +188,24 @@ async def sentinel_node(
         input_summary=user_message[:500],
         output_summary=json.dumps(validation)[:500],
         tokens=response["tokens"],
-        cost_usd=response["cost_usd"],
-        compliance_flags=compliance_flags,
+        cost_usd=cost_usd,
+        compliance_flags=merge_flags(state.get("compliance_flags"), compliance_flags),
         sentinel_check=sentinel_check,
         duration_ms=response["duration_ms"],
+        deadline_adaptations=state.get("deadline_adaptations", []),
     )
 
     return {
         "sentinel_check": sentinel_check,
         "circuit_breaker_tripped": circuit_breaker_tripped,
-        "compliance_flags": compliance_flags,
-        "audit_trail": state.get("audit_trail", [])
-        + [
+        "compliance_flags": merge_flags([], compliance_flags),
+        "audit_trail": [
             {
                 "encounter_id": encounter_id,
                 "node": "sentinel",
                 "model": response["model"],
                 "tokens": response["tokens"],
-                "cost_usd": response["cost_usd"],
+                "cost_usd": cost_usd,
                 "duration_ms": response["duration_ms"],
                 "audit_ref": audit_ref,
             }
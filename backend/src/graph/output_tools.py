@@ -0,0 +1,173 @@
+"""Tool definitions that constrain each LLM node's output to its FHIR schema.
+
+Generated by scripts/generate_output_tools.py from sidecar/schemas — do not edit.
+"""
+
+from typing import Any
+
+OUTPUT_TOOLS: dict[str, dict[str, Any]] = {
+    "extractor": {
+        "name": "record_extractor_output",
+        "description": "Clinical data extraction output — FHIR-aligned structure",
+        "input_schema": {
+            "type": "object",
+            "required": ["vitals", "symptoms", "medications", "history", "chief_complaint"],
+            "properties": {
+                "vitals": {
+                    "type": "object",
+                    "properties": {
+                        "heart_rate": {
+                            "type": ["number", "null"],
+                        },
+                        "blood_pressure": {
+                            "type": ["string", "null"],
+                        },
+                        "temperature": {
+                            "type": ["number", "null"],
+                        },
+                        "respiratory_rate": {
+                            "type": ["number", "null"],
+                        },
+                        "spo2": {
+                            "type": ["number", "null"],
+                        },
+                    },
+                    "required": ["heart_rate", "blood_pressure", "temperature", "respiratory_rate", "spo2"],
+                },
+                "symptoms": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["description"],
+                        "properties": {
+                            "description": {
+                                "type": "string",
+                            },
+                            "onset": {
+                                "type": ["string", "null"],
+                            },
+                            "severity": {
+                                "type": ["string", "null"],
+                            },
+                        },
+                    },
+                },
+                "medications": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["name"],
+                        "properties": {
+                            "name": {
+                                "type": "string",
+                            },
+                            "dose": {
+                                "type": ["string", "null"],
+                            },
+                            "frequency": {
+                                "type": ["string", "null"],
+                            },
+                        },
+                    },
+                },
+                "history": {
+                    "type": "object",
+                    "properties": {
+                        "conditions": {
+                            "type": "array",
+                            "items": {
+                                "type": "string",
+                            },
+                        },
+                        "allergies": {
+                            "type": "array",
+                            "items": {
+                                "type": "string",
+                            },
+                        },
+                        "surgeries": {
+                            "type": "array",
+                            "items": {
+                                "type": "string",
+                            },
+                        },
+                    },
+                    "required": ["conditions", "allergies", "surgeries"],
+                },
+                "chief_complaint": {
+                    "type": ["string", "null"],
+                },
+                "assessment_notes": {
+                    "type": ["string", "null"],
+                },
+            },
+        },
+    },
+    "reasoner": {
+        "name": "record_reasoner_output",
+        "description": "Triage reasoning decision output",
+        "input_schema": {
+            "type": "object",
+            "required": ["level", "confidence", "reasoning_summary"],
+            "properties": {
+                "level": {
+                    "type": "string",
+                    "enum": ["Emergency", "Urgent", "Semi-Urgent", "Non-Urgent"],
+                },
+                "confidence": {
+                    "type": "number",
+                    "minimum": 0.0,
+                    "maximum": 1.0,
+                },
+                "reasoning_summary": {
+                    "type": "string",
+                    "minLength": 1,
+                },
+                "recommended_actions": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                    },
+                },
+                "key_findings": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                    },
+                },
+            },
+        },
+    },
+    "sentinel": {
+        "name": "record_sentinel_output",
+        "description": "Hallucination check and safety validation output",
+        "input_schema": {
+            "type": "object",
+            "required": ["hallucination_score", "confidence_assessment", "vitals_consistent", "medication_safe"],
+            "properties": {
+                "hallucination_score": {
+                    "type": "number",
+                    "minimum": 0.0,
+                    "maximum": 1.0,
+                },
+                "confidence_assessment": {
+                    "type": "number",
+                    "minimum": 0.0,
+                    "maximum": 1.0,
+                },
+                "vitals_consistent": {
+                    "type": "boolean",
+                },
+                "medication_safe": {
+                    "type": "boolean",
+                },
+                "issues_found": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                    },
+                },
+            },
+        },
+    },
+}
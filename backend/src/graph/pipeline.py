@@ -1,21 +1,151 @@
+import asyncio
 import functools
+import json
+import logging
+import time
 
-from langgraph.graph import END, StateGraph
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph import END, START, StateGraph
 
 from src.audit.writer import AuditWriter
 from src.config import Settings
+from src.graph.deadline import DeadlinePolicy
 from src.graph.nodes.extractor import extractor_node
+from src.graph.nodes.input_scan import input_scan_node
+from src.graph.nodes.manual_review import manual_review_node
 from src.graph.nodes.rag_retriever import rag_retriever_node
 from src.graph.nodes.reasoner import reasoner_node
 from src.graph.nodes.sentinel import sentinel_node
 from src.graph.state import AgentState
 from src.routing.classifier import ClinicalClassifier
-from src.routing.router import ModelRouter
-from src.services.anthropic_client import AnthropicClient
+from src.routing.router import PRIORITY_HIGH, PRIORITY_ROUTINE, ModelRouter
+from src.services.anthropic_client import AnthropicClient, PromptTooLarge
 from src.services.embedding_service import EmbeddingService
 from src.services.protocol_store import ProtocolStore
 from src.services.sidecar_client import SidecarClient
 
+logger = logging.getLogger(__name__)
+
+CLASSIFIER_TIMEOUT_S = 5.0
+
+# Nodes whose prompt is size-checked by AnthropicClient before sending; an
+# oversized prompt trips the breaker
+LLM_NODES = ("extractor", "reasoner", "sentinel")
+
+# Classifier calls labelling safety-override encounters off the critical path
+_background_labels: set[asyncio.Task] = set()
+
+
+async def drain_background_labels(timeout: float = CLASSIFIER_TIMEOUT_S) -> None:
+    """Wait (bounded) for in-flight background classifications, e.g. at shutdown."""
+    if _background_labels:
+        await asyncio.wait(set(_background_labels), timeout=timeout)
+
+
+async def _label_overridden_encounter(
+    state: AgentState,
+    routing: dict,
+    classifier: ClinicalClassifier,
+    audit_writer: AuditWriter,
+) -> None:
+    """Classify a safety-override encounter for audit/analytics; its model is already chosen."""
+    start = time.monotonic()
+    try:
+        classification = await classifier.classify(
+            state["raw_input"], timeout=CLASSIFIER_TIMEOUT_S, priority=PRIORITY_ROUTINE
+        )
+        await audit_writer.write_node_audit(
+            encounter_id=state["encounter_id"],
+            node_name="classifier",
+            model=classifier.model,
+            routing_decision={
+                "category": classification["category"],
+                "confidence": classification["confidence"],
+                "reason": classification["reason"],
+                "classifier_path": classification["classifier_path"],
+                "selected_model": routing["selected_model"],
+                "safety_override": True,
+            },
+            input_summary="",
+            output_summary=json.dumps(
+                {k: classification[k] for k in ("category", "confidence", "reason")}
+            ),
+            tokens=classification["classifier_tokens"],
+            cost_usd=classification["classifier_cost"],
+            compliance_flags=[],
+            sentinel_check=None,
+            duration_ms=int((time.monotonic() - start) * 1000),
+        )
+    except Exception:
+        logger.warning(
+            "Background classification failed for %s", state.get("encounter_id"), exc_info=True
+        )
+
+
+def _continue_or_manual_review(next_node: str):
+    """Conditional edge: fail fast to manual review once the breaker trips."""
+
+    def _route(state: AgentState) -> str:
+        if state.get("circuit_breaker_tripped"):
+            return "manual_review"
+        return next_node
+
+    return _route
+
+
+def _end_or_manual_review(state: AgentState) -> str:
+    """Conditional edge after the sentinel: its own verdict ends the run, a refused call does not."""
+    if state.get("circuit_breaker_tripped") and not state.get("sentinel_check"):
+        return "manual_review"
+    return END
+
+
+def _timed(node_name: str, node_fn):
+    """Wrap a node so its update carries its wall-clock duration."""
+
+    async def _run(state: AgentState) -> dict:
+        start = time.monotonic()
+        update = await node_fn(state)
+        duration_ms = int((time.monotonic() - start) * 1000)
+        return {**update, "node_durations_ms": {node_name: duration_ms}}
+
+    return _run
+
+
+def _name_trip(node_name: str, node_fn):
+    """Wrap a node so an update that trips the breaker records which node tripped it."""
+
+    async def _run(state: AgentState) -> dict:
+        update = await node_fn(state)
+        if update.get("circuit_breaker_tripped") and "tripped_at" not in update:
+            return {**update, "tripped_at": node_name}
+        return update
+
+    return _run
+
+
+def _reject_oversized_prompt(node_name: str, node_fn):
+    """Wrap an LLM node so an over-budget prompt trips the breaker instead of failing the run."""
+
+    async def _run(state: AgentState) -> dict:
+        try:
+            return await node_fn(state)
+        except PromptTooLarge as exc:
+            logger.error("%s prompt rejected for %s: %s", node_name, state.get("encounter_id"), exc)
+            return {
+                "circuit_breaker_tripped": True,
+                "tripped_at": node_name,
+                "error": f"{node_name}: {exc}",
+                "compliance_flags": ["INPUT_TOKEN_BUDGET_EXCEEDED"],
+            }
+
+    return _run
+
+
+async def _gather_context(state: AgentState) -> dict:
+    """Join point for the parallel extraction and RAG branches."""
+    return {}
+
 
 def build_pipeline(
     anthropic_client: AnthropicClient,
@@ -26,9 +156,19 @@ def build_pipeline(
     sidecar_client: SidecarClient | None = None,
     protocol_store: ProtocolStore | None = None,
     embedding_service: EmbeddingService | None = None,
+    checkpointer: BaseCheckpointSaver | None = None,
 ):
-    """Build and compile the LangGraph triage pipeline."""
+    """Build and compile the LangGraph triage pipeline.
 
+    With a checkpointer, state is saved after every node under the
+    encounter_id thread so a retried encounter resumes where it failed.
+    """
+    deadline_policy = DeadlinePolicy.from_settings(settings)
+
+    bound_input_scan = functools.partial(
+        input_scan_node,
+        sidecar_client=sidecar_client,
+    )
     bound_extractor = functools.partial(
         extractor_node,
         anthropic_client=anthropic_client,
@@ -39,6 +179,8 @@ def build_pipeline(
         rag_retriever_node,
         protocol_store=protocol_store,
         embedding_service=embedding_service,
+        from_raw_input=settings.rag_parallel_retrieval,
+        deadline_policy=deadline_policy,
     )
     bound_reasoner = functools.partial(
         reasoner_node,
@@ -53,25 +195,83 @@ def build_pipeline(
         settings=settings,
         sidecar_client=sidecar_client,
     )
+    bound_manual_review = functools.partial(
+        manual_review_node,
+        audit_writer=audit_writer,
+    )
 
     async def classify_and_route(state: AgentState) -> dict:
-        classification = await classifier.classify(state["raw_input"])
-        routing = router.route(state["raw_input"], classification)
-        return {"routing_metadata": routing}
+        # A safety override fixes the model from the text alone — proceed with
+        # Opus now and let the classifier label the category in the background.
+        keyword_matches = router.keyword_matches(state["raw_input"])
+        override = router.safety_override(state["raw_input"], keyword_matches)
+        if override is not None:
+            task = asyncio.create_task(
+                _label_overridden_encounter(state, override, classifier, audit_writer)
+            )
+            _background_labels.add(task)
+            task.add_done_callback(_background_labels.discard)
+            return {"routing_metadata": override}
+
+        timeout, adaptation = deadline_policy.classifier_timeout(state, CLASSIFIER_TIMEOUT_S)
+        classification = await classifier.classify(
+            state["raw_input"], timeout=timeout, priority=PRIORITY_HIGH
+        )
+        routing = router.route(state["raw_input"], classification, keyword_matches)
+        update: dict = {"routing_metadata": routing}
+        if adaptation is not None:
+            update["deadline_adaptations"] = [adaptation]
+        return update
 
     graph = StateGraph(AgentState)
 
-    graph.add_node("classify_and_route", classify_and_route)
-    graph.add_node("extractor", bound_extractor)
-    graph.add_node("rag_retriever", bound_rag_retriever)
-    graph.add_node("reasoner", bound_reasoner)
-    graph.add_node("sentinel", bound_sentinel)
+    nodes = {
+        "classify_and_route": classify_and_route,
+        "input_scan": bound_input_scan,
+        "extractor": bound_extractor,
+        "rag_retriever": bound_rag_retriever,
+        "reasoner": bound_reasoner,
+        "sentinel": bound_sentinel,
+        "manual_review": bound_manual_review,
+    }
+    for name, node_fn in nodes.items():
+        if name in LLM_NODES:
+            node_fn = _reject_oversized_prompt(name, node_fn)
+        if name != "manual_review":
+            node_fn = _name_trip(name, node_fn)
+        graph.add_node(name, _timed(name, node_fn))
+
+    # Routing and the raw-input PII scan are independent — run them in
+    # parallel and join before extraction.
+    graph.add_edge(START, "classify_and_route")
+    graph.add_edge(START, "input_scan")
+    graph.add_edge(["classify_and_route", "input_scan"], "extractor")
 
-    graph.set_entry_point("classify_and_route")
-    graph.add_edge("classify_and_route", "extractor")
-    graph.add_edge("extractor", "rag_retriever")
-    graph.add_edge("rag_retriever", "reasoner")
-    graph.add_edge("reasoner", "sentinel")
-    graph.add_edge("sentinel", END)
+    if settings.rag_parallel_retrieval:
+        # Retrieval queries the scanned raw text, so it can run alongside the
+        # extractor LLM call; both branches are joined before the reasoner.
+        graph.add_node("gather_context", _gather_context)
+        graph.add_edge("input_scan", "rag_retriever")
+        graph.add_edge(["extractor", "rag_retriever"], "gather_context")
+        graph.add_conditional_edges(
+            "gather_context",
+            _continue_or_manual_review("reasoner"),
+            ["reasoner", "manual_review"],
+        )
+    else:
+        graph.add_conditional_edges(
+            "extractor",
+            _continue_or_manual_review("rag_retriever"),
+            ["rag_retriever", "manual_review"],
+        )
+        graph.add_edge("rag_retriever", "reasoner")
+
+    graph.add_conditional_edges(
+        "reasoner",
+        _continue_or_manual_review("sentinel"),
+        ["sentinel", "manual_review"],
+    )
+    graph.add_conditional_edges("sentinel", _end_or_manual_review, ["manual_review", END])
+    graph.add_edge("manual_review", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
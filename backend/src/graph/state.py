@@ -1,4 +1,19 @@
-from typing import Any, TypedDict
+import operator
+from typing import Annotated, Any, TypedDict
+
+
+def merge_flags(left: list[str] | None, right: list[str] | None) -> list[str]:
+    """Reducer: ordered-set union of compliance flags.
+
+    Retries re-emit the same FHIR_VALID_*/PII_CLEAN/TOKEN_* flags; each is
+    kept once, in first-seen order, instead of growing the list per call.
+    """
+    return list(dict.fromkeys([*(left or []), *(right or [])]))
+
+
+def merge_dicts(left: dict[str, Any] | None, right: dict[str, Any] | None) -> dict[str, Any]:
+    """Reducer: merge per-node dict updates (parallel branches write disjoint keys)."""
+    return {**(left or {}), **(right or {})}
 
 
 class RoutingMetadata(TypedDict, total=False):
@@ -7,6 +22,9 @@ class RoutingMetadata(TypedDict, total=False):
     selected_model: str
     escalation_reason: str | None
     safety_override: bool
+    priority: int  # LLM slot priority, 0 = most urgent
+    classifier_path: str  # "local", "llm", "fallback" or "deferred" (safety override, labelled in background)
+    safety_matches: list[dict]  # critical-keyword spans {"term", "start", "end", "negated"}
 
 
 class AuditEntry(TypedDict):
@@ -43,6 +61,7 @@ class AgentState(TypedDict, total=False):
     raw_input: str
     encounter_id: str
     patient_id: str
+    validated_input: str
 
     # Extracted data
     fhir_data: dict[str, Any]
@@ -61,11 +80,19 @@ class AgentState(TypedDict, total=False):
     routing_metadata: RoutingMetadata
 
     # Audit
-    audit_trail: list[AuditEntry]
+    audit_trail: Annotated[list[AuditEntry], operator.add]
 
     # Compliance
-    compliance_flags: list[str]
+    compliance_flags: Annotated[list[str], merge_flags]
 
     # Pipeline control
     circuit_breaker_tripped: bool
+    tripped_at: str  # node that tripped the breaker, set with circuit_breaker_tripped
     error: str | None
+
+    # Latency budget: absolute deadline (epoch seconds) and adaptations made to meet it
+    deadline_at: float
+    deadline_adaptations: Annotated[list[dict[str, Any]], operator.add]
+
+    # Observability: wall-clock duration of each completed node
+    node_durations_ms: Annotated[dict[str, int], merge_dicts]
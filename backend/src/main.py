@@ -1,5 +1,5 @@
 import logging
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,9 +11,12 @@ from src.middleware.error_handler import generic_exception_handler
 from src.audit.writer import AuditWriter
 from src.config import get_settings
 from src.logging_config import configure_logging
-from src.graph.pipeline import build_pipeline
+from src.graph.checkpoint import checkpoint_sweeper, open_checkpointer
+from src.graph.pipeline import build_pipeline, drain_background_labels
 from src.middleware.rate_limit import limiter
 from src.routing.classifier import ClinicalClassifier
+from src.routing.lexicon import KeywordLexicon
+from src.routing.local_classifier import LOAD_ERRORS, LocalClassifier
 from src.routing.router import ModelRouter
 from src.services.anthropic_client import AnthropicClient
 from src.services.embedding_service import EmbeddingService
@@ -22,6 +25,7 @@ from src.services.pubsub import PubSubService
 from src.services.protocol_store import ProtocolStore
 from src.services.metrics import init_metrics
 from src.services.sidecar_client import SidecarClient
+from src.services.triage_jobs import TriageJobQueue
 
 logger = logging.getLogger(__name__)
 
@@ -61,10 +65,33 @@ async def lifespan(app: FastAPI):
         )
 
     # Initialize routing
+    local_classifier: LocalClassifier | None = None
+    if settings.local_classifier_path:
+        try:
+            local_classifier = LocalClassifier.load(settings.local_classifier_path)
+            logger.info("Local classifier loaded from %s", settings.local_classifier_path)
+        except LOAD_ERRORS:
+            logger.warning(
+                "Local classifier at %s could not be loaded — every encounter uses the LLM",
+                settings.local_classifier_path,
+                exc_info=True,
+            )
     classifier = ClinicalClassifier(
-        anthropic_client, settings.default_classifier_model
+        anthropic_client, settings.default_classifier_model, local=local_classifier
+    )
+    lexicon = KeywordLexicon.load(settings.critical_lexicon_path) if settings.critical_lexicon_path else None
+    router = ModelRouter(
+        min_confidence=settings.min_routing_confidence,
+        lexicon=lexicon,
+        health=anthropic_client.health if settings.llm_health_routing_enabled else None,
+    )
+
+    # Pipeline checkpointing (resume retried encounters from the failed node)
+    exit_stack = AsyncExitStack()
+    checkpointer = await exit_stack.enter_async_context(open_checkpointer(settings))
+    await exit_stack.enter_async_context(
+        checkpoint_sweeper(checkpointer, settings.pipeline_checkpoint_ttl_s)
     )
-    router = ModelRouter(min_confidence=settings.min_routing_confidence)
 
     # Build pipeline
     pipeline = build_pipeline(
@@ -76,17 +103,30 @@ async def lifespan(app: FastAPI):
         sidecar_client=sidecar_client,
         protocol_store=protocol_store,
         embedding_service=embedding_service,
+        checkpointer=checkpointer,
+    )
+
+    # Background worker pool for async triage jobs
+    job_queue = TriageJobQueue(
+        runner=triage.execute_triage,
+        workers=settings.triage_job_workers,
+        queue_depth=settings.triage_job_queue_depth,
+        on_status=triage.publish_job_status,
     )
+    await job_queue.start()
 
     # Wire dependencies into API modules
-    triage.set_dependencies(pipeline, audit_writer, firestore)
-    stream.set_dependencies(firestore)
+    triage.set_dependencies(pipeline, audit_writer, firestore, job_queue)
+    stream.set_dependencies(firestore, pipeline)
     health.set_dependencies(firestore, sidecar_client, protocol_store)
 
     logger.info("Sentinel-Health orchestrator started (env=%s)", settings.env)
     yield
 
     # Cleanup
+    await job_queue.stop()
+    await drain_background_labels()
+    await exit_stack.aclose()
     if protocol_store:
         await protocol_store.close()
     await sidecar_client.close()
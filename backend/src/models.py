@@ -45,6 +45,21 @@ class TriageResultResponse(BaseModel):
     timestamp: str
 
 
+class TriageJobAccepted(BaseModel):
+    job_id: str
+    encounter_id: str
+    status: str
+    status_url: str
+
+
+class TriageJobStatus(BaseModel):
+    job_id: str
+    encounter_id: str
+    status: str
+    result: TriageResultResponse | None = None
+    error: str | None = None
+
+
 class HealthResponse(BaseModel):
     status: str = "healthy"
     version: str = "0.1.0"
@@ -1,7 +1,10 @@
 import json
 import logging
+import time
 
+from src.routing.local_classifier import LocalClassifier
 from src.services.anthropic_client import AnthropicClient
+from src.services.metrics import record_classifier_path
 
 logger = logging.getLogger(__name__)
 
@@ -26,12 +29,40 @@ Respond ONLY with valid JSON:
 {{"category": "<category>", "confidence": <0.0-1.0>, "reason": "<brief reason>"}}"""
 
 
+# classifier_path values recorded on each routing decision
+PATH_LOCAL = "local"  # answered by the in-process model, no LLM call
+PATH_LLM = "llm"
+PATH_FALLBACK = "fallback"  # LLM call failed or was unparseable
+
+
 class ClinicalClassifier:
-    def __init__(self, client: AnthropicClient, model: str) -> None:
+    def __init__(
+        self, client: AnthropicClient, model: str, local: LocalClassifier | None = None
+    ) -> None:
         self._client = client
         self._model = model
+        self._local = local
 
-    async def classify(self, encounter_text: str, timeout: float = 5.0) -> dict:
+    @property
+    def model(self) -> str:
+        return self._model
+
+    async def classify(
+        self, encounter_text: str, timeout: float = 5.0, priority: int | None = None
+    ) -> dict:
+        """Classify locally when the in-process model clears its per-category bar, else ask the LLM."""
+        if self._local is not None:
+            category, confidence, confident = self._local.predict(encounter_text)
+            if confident:
+                record_classifier_path(PATH_LOCAL, category)
+                return {
+                    "category": category,
+                    "confidence": confidence,
+                    "reason": "local_classifier",
+                    "classifier_path": PATH_LOCAL,
+                    "classifier_tokens": {"in": 0, "out": 0},
+                    "classifier_cost": 0.0,
+                }
         try:
             response = await self._client.complete(
                 model=self._model,
@@ -42,24 +73,31 @@ class ClinicalClassifier:
                 max_tokens=256,
                 temperature=0.0,
                 timeout=timeout,
+                json_output=True,
+                # Waiting for rate-limit quota counts against the classifier timeout
+                deadline_at=time.time() + timeout,
+                priority=priority,
             )
         except Exception as exc:
             logger.warning(
                 "Classifier call failed — falling back to default routing: %s", exc
             )
+            record_classifier_path(PATH_FALLBACK, "symptom_assessment")
             return {
                 "category": "symptom_assessment",
                 "confidence": 0.0,
                 "reason": f"classifier_timeout: {type(exc).__name__}",
+                "classifier_path": PATH_FALLBACK,
                 "classifier_tokens": {"in": 0, "out": 0},
                 "classifier_cost": 0.0,
             }
         try:
             parsed = json.loads(response["content"])
-            return {
+            result = {
                 "category": parsed["category"],
                 "confidence": parsed["confidence"],
                 "reason": parsed["reason"],
+                "classifier_path": PATH_LLM,
                 "classifier_tokens": response["tokens"],
                 "classifier_cost": response["cost_usd"],
             }
@@ -68,10 +106,14 @@ class ClinicalClassifier:
                 "Classifier JSON parse failed — falling back to default routing: %s",
                 exc,
             )
+            record_classifier_path(PATH_FALLBACK, "symptom_assessment")
             return {
                 "category": "symptom_assessment",
                 "confidence": 0.0,
                 "reason": f"classifier_parse_error: {type(exc).__name__}",
+                "classifier_path": PATH_FALLBACK,
                 "classifier_tokens": response["tokens"],
                 "classifier_cost": response["cost_usd"],
             }
+        record_classifier_path(PATH_LLM, result["category"])
+        return result
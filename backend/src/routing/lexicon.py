@@ -0,0 +1,159 @@
+"""Critical-keyword lexicon for ModelRouter's safety override.
+
+All terms are compiled into one trie-shaped regular expression, so an
+encounter is scanned once, left to right, whatever the lexicon size.
+Matching is case-insensitive on word boundaries, tolerates any whitespace
+between words and a plural "s"/"es", and skips mentions a negation cue
+directly governs ("denies chest pain", "no history of stroke").
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_LEXICON_PATH = Path(__file__).with_name("critical_lexicon.json")
+
+# A negation never carries across a clause, list item or coordinated phrase
+_CLAUSE_BREAK = re.compile(r"[.,;:!?\n]")
+_CONJUNCTIONS = frozenset({"and", "or", "but", "nor", "yet", "so"})
+_WORD = re.compile(r"[a-z'/]+")  # keeps "c/o", "h/o" as one word
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    term: str
+    start: int
+    end: int
+    negated: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"term": self.term, "start": self.start, "end": self.end, "negated": self.negated}
+
+
+def _trie_pattern(terms: list[str]) -> str:
+    trie: dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: dict[str, dict]) -> str:
+    branches = [
+        (r"\s+" if ch == " " else re.escape(ch)) + _node_pattern(child)
+        for ch, child in sorted(node.items())
+        if ch
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if "" in node else body
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class KeywordLexicon:
+    """Compiled lexicon of critical terms with NegEx-style negation windows.
+
+    A mention is negated only when a negation cue directly governs it:
+    the cue is followed by the term with nothing in between but up to
+    ``negation_window`` modifier words ("denies any recent chest pain",
+    "no history of stroke"). Any other word — a terminator ("reports",
+    "c/o", "but", ...), a conjunction, or the cue's own object ("without
+    insurance had cardiac arrest") — or a comma or clause break ends the
+    cue's scope. Terms listed with ``"negatable": false`` always count.
+    Missing a negation only over-escalates; honouring a wrong one would
+    skip the safety override, so the rule errs toward the former.
+    """
+
+    def __init__(
+        self,
+        terms: list[str],
+        negation_cues: list[str] | None = None,
+        negation_terminators: list[str] | None = None,
+        negation_window: int = 5,
+        non_negatable: set[str] | None = None,
+        negation_modifiers: list[str] | None = None,
+    ) -> None:
+        self.terms = [_normalize(t) for t in terms]
+        self._term_set = set(self.terms)
+        self._non_negatable = {_normalize(t) for t in non_negatable or ()}
+        self._cues = [tuple(_normalize(c).split()) for c in negation_cues or ()]
+        self._terminators = {_normalize(t) for t in negation_terminators or ()} | _CONJUNCTIONS
+        self._modifiers = {_normalize(m) for m in negation_modifiers or ()} - self._terminators
+        self._window = negation_window
+        trie = _trie_pattern(self.terms)
+        # Matched against lowercased text; the left word boundary is checked in
+        # scan(), which lets the regex engine skip ahead on the first character
+        self._pattern = re.compile(rf"(?:{trie})(?:e?s)?\b") if terms else None
+        self._pattern_ignorecase = re.compile(rf"(?:{trie})(?:e?s)?\b", re.IGNORECASE) if terms else None
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_LEXICON_PATH) -> "KeywordLexicon":
+        with open(path) as f:
+            data = json.load(f)
+        entries = [{"term": e} if isinstance(e, str) else e for e in data["terms"]]
+        return cls(
+            terms=[e["term"] for e in entries],
+            negation_cues=data.get("negation_cues", []),
+            negation_terminators=data.get("negation_terminators", []),
+            negation_window=data.get("negation_window", 5),
+            negation_modifiers=data.get("negation_modifiers", []),
+            non_negatable={e["term"] for e in entries if not e.get("negatable", True)},
+        )
+
+    def scan(self, text: str) -> list[KeywordMatch]:
+        """Every lexicon mention in ``text``, negated ones flagged."""
+        if self._pattern is None:
+            return []
+        lowered = text.lower()
+        pattern = self._pattern
+        if len(lowered) != len(text):  # rare case-mappings that change length; keep offsets exact
+            lowered, pattern = text, self._pattern_ignorecase
+
+        matches = []
+        pos = 0
+        while (m := pattern.search(lowered, pos)) is not None:
+            start = m.start()
+            if start > 0 and (lowered[start - 1].isalnum() or lowered[start - 1] == "_"):
+                pos = start + 1  # inside a longer word; a term may still start later in it
+                continue
+            term = self._term(m.group())
+            negated = term not in self._non_negatable and self._is_negated(text, start)
+            matches.append(KeywordMatch(term, start, m.end(), negated))
+            pos = m.end()
+        return matches
+
+    def critical_matches(self, text: str) -> list[KeywordMatch]:
+        """Non-negated mentions only — the ones that trigger the safety override."""
+        return [m for m in self.scan(text) if not m.negated]
+
+    def _term(self, matched: str) -> str:
+        normalized = _normalize(matched)
+        for candidate in (normalized, normalized[:-1], normalized[:-2]):
+            if candidate in self._term_set:
+                return candidate
+        return normalized
+
+    def _is_negated(self, text: str, start: int) -> bool:
+        if not self._cues:
+            return False
+        # Only the current clause can negate
+        preceding = text[max(0, start - 30 * self._window) : start]
+        clause = _CLAUSE_BREAK.split(preceding)[-1]
+        words = _WORD.findall(clause.lower())
+        # Walk back from the term over modifiers; the next word must end a cue
+        end = len(words)
+        for _ in range(self._window + 1):
+            if any(end >= len(cue) and tuple(words[end - len(cue) : end]) == cue for cue in self._cues):
+                return True
+            if end == 0 or words[end - 1] not in self._modifiers:
+                return False
+            end -= 1
+        return False
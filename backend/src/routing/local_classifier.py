@@ -0,0 +1,194 @@
+"""In-process encounter classifier: hashed n-gram features + softmax regression.
+
+Trained offline by scripts/train_local_classifier.py. ClinicalClassifier
+asks it first and only spends an LLM call when its calibrated confidence
+is below the predicted category's bar.
+"""
+
+import pickle
+import re
+import zipfile
+import zlib
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+FEATURE_DIM = 2**16
+
+# What LocalClassifier.load raises for a missing, truncated, corrupt or incomplete model file
+LOAD_ERRORS = (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile, pickle.UnpicklingError)
+
+_TOKENS = re.compile(r"[a-z0-9]+")
+
+
+def _sparse_features(text: str, dim: int) -> tuple[np.ndarray, np.ndarray]:
+    """(indices, values): L2-normalized log counts of word unigrams and bigrams hashed into ``dim`` buckets.
+
+    crc32 rather than ``hash()`` so indices are stable across processes.
+    """
+    words = _TOKENS.findall(text.lower())
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not grams:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    hashed = np.fromiter((zlib.crc32(g.encode()) % dim for g in grams), dtype=np.int64, count=len(grams))
+    indices, counts = np.unique(hashed, return_counts=True)
+    values = np.log1p(counts).astype(np.float32)
+    return indices, values / np.linalg.norm(values)
+
+
+def _dense_batch(rows: Sequence[tuple[np.ndarray, np.ndarray]], dim: int) -> np.ndarray:
+    batch = np.zeros((len(rows), dim), dtype=np.float32)
+    for i, (indices, values) in enumerate(rows):
+        batch[i, indices] = values
+    return batch
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+class LocalClassifier:
+    """Linear model over hashed features with temperature-scaled probabilities.
+
+    ``thresholds[i]`` is the minimum calibrated confidence at which
+    ``categories[i]`` is answered locally; ``inf`` means always defer.
+    """
+
+    def __init__(
+        self,
+        categories: Sequence[str],
+        weights: np.ndarray,
+        bias: np.ndarray,
+        temperature: float,
+        thresholds: np.ndarray,
+    ) -> None:
+        self.categories = list(categories)
+        self.weights = weights
+        self.bias = bias
+        self.temperature = temperature
+        self.thresholds = thresholds
+
+    @property
+    def dim(self) -> int:
+        return self.weights.shape[0]
+
+    def predict(self, text: str) -> tuple[str, float, bool]:
+        """(category, calibrated confidence, whether it clears that category's bar)."""
+        indices, values = _sparse_features(text, self.dim)
+        probs = softmax((values @ self.weights[indices] + self.bias) / self.temperature)
+        index = int(probs.argmax())
+        confidence = float(probs[index])
+        return self.categories[index], confidence, bool(confidence >= self.thresholds[index])
+
+    def save(self, path: str | Path) -> None:
+        np.savez_compressed(
+            path,
+            categories=np.array(self.categories),
+            weights=self.weights,
+            bias=self.bias,
+            temperature=np.array(self.temperature),
+            thresholds=self.thresholds,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LocalClassifier":
+        """Load a model written by save(); raises one of LOAD_ERRORS if the file is unusable."""
+        data = np.load(path)
+        if not isinstance(data, np.lib.npyio.NpzFile):
+            raise ValueError(f"{path} is not an .npz model archive")
+        with data:
+            return cls(
+                categories=[str(c) for c in data["categories"]],
+                weights=data["weights"],
+                bias=data["bias"],
+                temperature=float(data["temperature"]),
+                thresholds=data["thresholds"],
+            )
+
+
+def train(
+    texts: Sequence[str],
+    labels: Sequence[str],
+    categories: Sequence[str],
+    dim: int = FEATURE_DIM,
+    epochs: int = 30,
+    batch_size: int = 256,
+    learning_rate: float = 0.5,
+    l2: float = 1e-4,
+    seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Mini-batch gradient descent on softmax cross-entropy. Returns (weights, bias).
+
+    Features are kept sparse and densified one batch at a time, so memory
+    stays at ``batch_size * dim`` regardless of the training-set size.
+    """
+    rows = [_sparse_features(t, dim) for t in texts]
+    label_indices = np.array([list(categories).index(label) for label in labels])
+    rng = np.random.default_rng(seed)
+
+    weights = np.zeros((dim, len(categories)), dtype=np.float32)
+    bias = np.zeros(len(categories), dtype=np.float32)
+    for _ in range(epochs):
+        order = rng.permutation(len(rows))
+        for start in range(0, len(rows), batch_size):
+            batch = order[start : start + batch_size]
+            features = _dense_batch([rows[i] for i in batch], dim)
+            error = softmax(features @ weights + bias)
+            error[np.arange(len(batch)), label_indices[batch]] -= 1.0
+            error /= len(batch)
+            weights -= learning_rate * (features.T @ error + l2 * weights)
+            bias -= learning_rate * error.sum(axis=0)
+    return weights, bias
+
+
+def batch_logits(texts: Sequence[str], weights: np.ndarray, bias: np.ndarray, batch_size: int = 256) -> np.ndarray:
+    """Uncalibrated scores for ``texts``, computed batch by batch."""
+    dim = weights.shape[0]
+    out = [
+        _dense_batch([_sparse_features(t, dim) for t in texts[start : start + batch_size]], dim) @ weights + bias
+        for start in range(0, len(texts), batch_size)
+    ]
+    return np.concatenate(out) if out else np.empty((0, weights.shape[1]), dtype=np.float32)
+
+
+def fit_temperature(logits: np.ndarray, label_indices: np.ndarray) -> float:
+    """Temperature minimizing held-out negative log-likelihood (grid search)."""
+    best_temperature, best_nll = 1.0, np.inf
+    for temperature in np.linspace(0.05, 5.0, 100):
+        probs = softmax(logits / temperature)
+        nll = -np.log(probs[np.arange(len(label_indices)), label_indices] + 1e-12).mean()
+        if nll < best_nll:
+            best_temperature, best_nll = float(temperature), nll
+    return best_temperature
+
+
+def category_thresholds(
+    probs: np.ndarray,
+    label_indices: np.ndarray,
+    target_precision: float = 0.95,
+    min_support: int = 20,
+) -> np.ndarray:
+    """Per category, the lowest confidence bar whose held-out precision meets the target.
+
+    A category with fewer than ``min_support`` confident predictions at any
+    bar meeting the target gets ``inf`` (always deferred to the LLM).
+    """
+    predicted = probs.argmax(axis=1)
+    confidence = probs.max(axis=1)
+    thresholds = np.full(probs.shape[1], np.inf)
+    for category in range(probs.shape[1]):
+        mask = predicted == category
+        order = np.argsort(-confidence[mask], kind="stable")
+        ranked = confidence[mask][order]
+        correct = (label_indices[mask] == category)[order]
+        support = np.arange(1, len(correct) + 1)
+        # Precision of the top-k most confident predictions, for every k; a
+        # bar can only sit where the next prediction is strictly less confident
+        precision = np.cumsum(correct) / support
+        boundary = np.append(ranked[:-1] > ranked[1:], True) if len(ranked) else np.empty(0, dtype=bool)
+        eligible = np.nonzero((precision >= target_precision) & (support >= min_support) & boundary)[0]
+        if len(eligible):
+            thresholds[category] = ranked[eligible[-1]]
+    return thresholds
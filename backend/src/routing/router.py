@@ -1,12 +1,20 @@
+import logging
 from dataclasses import dataclass
 
 from src.graph.state import RoutingMetadata
+from src.routing.lexicon import KeywordLexicon, KeywordMatch
+from src.services.model_health import ModelHealthTracker
 
-CRITICAL_KEYWORDS = [
-    "chest pain", "difficulty breathing", "unconscious", "seizure",
-    "severe bleeding", "anaphylaxis", "stroke", "cardiac arrest",
-    "respiratory failure", "sepsis", "trauma", "suicidal",
-]
+logger = logging.getLogger(__name__)
+
+# Bundled critical-keyword lexicon (src/routing/critical_lexicon.json); a
+# site-specific file can replace it via CRITICAL_LEXICON_PATH.
+DEFAULT_LEXICON = KeywordLexicon.load()
+CRITICAL_KEYWORDS = DEFAULT_LEXICON.terms
+
+# Category of a safety-override routing made before classification; the
+# label is filled in by a background classifier call (see src.graph.pipeline)
+UNCLASSIFIED = "unclassified"
 
 MODEL_TIERS = [
     "claude-haiku-4-5-20241022",
@@ -38,33 +46,85 @@ CATEGORY_ROUTING: dict[str, CategoryConfig] = {
     "surgical_consult":          CategoryConfig("claude-opus-4-6-20250929",   0.0, True),
 }
 
+# LLM slot priority (lower is more urgent), see src.services.llm_slots
+PRIORITY_EMERGENCY = 0
+PRIORITY_HIGH = 1
+PRIORITY_STANDARD = 2
+PRIORITY_ROUTINE = 3
+
+CATEGORY_PRIORITY: dict[str, int] = {
+    "critical_emergency": PRIORITY_EMERGENCY,
+    "acute_presentation": PRIORITY_HIGH,
+    "mental_health": PRIORITY_HIGH,
+    "pediatric": PRIORITY_HIGH,
+    "surgical_consult": PRIORITY_HIGH,
+    "symptom_assessment": PRIORITY_STANDARD,
+    "medication_review": PRIORITY_STANDARD,
+    "diagnostic_interpretation": PRIORITY_STANDARD,
+    "routine_vitals": PRIORITY_ROUTINE,
+    "chronic_management": PRIORITY_ROUTINE,
+}
+
 
 class ModelRouter:
-    def __init__(self, min_confidence: float = 0.70) -> None:
+    def __init__(
+        self,
+        min_confidence: float = 0.70,
+        lexicon: KeywordLexicon | None = None,
+        health: ModelHealthTracker | None = None,
+    ) -> None:
         self._min_confidence = min_confidence
-
-    def route(self, encounter_text: str, classification: dict) -> RoutingMetadata:
+        self._lexicon = lexicon or DEFAULT_LEXICON
+        self._health = health
+
+    def keyword_matches(self, encounter_text: str) -> list[KeywordMatch]:
+        """Critical-keyword mentions (negated ones flagged); pass to route/safety_override to scan once."""
+        return self._lexicon.scan(encounter_text)
+
+    def safety_override(
+        self, encounter_text: str, keyword_matches: list[KeywordMatch] | None = None
+    ) -> RoutingMetadata | None:
+        """Opus routing if a non-negated critical keyword is present, else None.
+
+        Decided from the text alone, so the caller need not wait for the
+        classifier: ``category`` is UNCLASSIFIED until it is labelled.
+        """
+        if keyword_matches is None:
+            keyword_matches = self.keyword_matches(encounter_text)
+        if not any(not m.negated for m in keyword_matches):
+            return None
+        return self._override(UNCLASSIFIED, 0.0, "deferred", keyword_matches)
+
+    def route(
+        self,
+        encounter_text: str,
+        classification: dict,
+        keyword_matches: list[KeywordMatch] | None = None,
+    ) -> RoutingMetadata:
         category = classification["category"]
         confidence = classification["confidence"]
+        classifier_path = classification.get("classifier_path", "llm")
+        if keyword_matches is None:
+            keyword_matches = self.keyword_matches(encounter_text)
+        # Spans only (no text) — negated mentions are kept to show why no override fired
+        safety_matches = [m.to_dict() for m in keyword_matches]
 
-        # Safety override: critical keywords -> always Opus
-        if self._has_critical_keywords(encounter_text):
-            return RoutingMetadata(
-                category=category,
-                classifier_confidence=confidence,
-                selected_model="claude-opus-4-6-20250929",
-                escalation_reason="Critical keyword safety override",
-                safety_override=True,
-            )
+        # Safety override: non-negated critical keywords -> always Opus
+        if any(not m.negated for m in keyword_matches):
+            return self._override(category, confidence, classifier_path, keyword_matches)
 
         config = CATEGORY_ROUTING.get(category)
         if config is None:
+            selected_model, steer_reason = self._steer_to_healthy("claude-sonnet-4-5-20250929")
             return RoutingMetadata(
                 category=category,
                 classifier_confidence=confidence,
-                selected_model="claude-sonnet-4-5-20250929",
-                escalation_reason="Unknown category fallback",
+                selected_model=selected_model,
+                escalation_reason="; ".join(filter(None, ["Unknown category fallback", steer_reason])),
                 safety_override=False,
+                priority=PRIORITY_STANDARD,
+                classifier_path=classifier_path,
+                safety_matches=safety_matches,
             )
 
         selected_model = config.default_model
@@ -96,14 +156,48 @@ class ModelRouter:
                 f"{config.escalation_threshold}"
             )
 
+        # Live health: move up from a degraded tier — the floor above still holds
+        selected_model, steer_reason = self._steer_to_healthy(selected_model)
+        if steer_reason:
+            escalation_reason = "; ".join(filter(None, [escalation_reason, steer_reason]))
+
         return RoutingMetadata(
             category=category,
             classifier_confidence=confidence,
             selected_model=selected_model,
             escalation_reason=escalation_reason,
             safety_override=False,
+            priority=CATEGORY_PRIORITY.get(category, PRIORITY_STANDARD),
+            classifier_path=classifier_path,
+            safety_matches=safety_matches,
         )
 
-    def _has_critical_keywords(self, text: str) -> bool:
-        text_lower = text.lower()
-        return any(kw in text_lower for kw in CRITICAL_KEYWORDS)
+    def _steer_to_healthy(self, model: str) -> tuple[str, str | None]:
+        """The first healthy tier at or above ``model``, and why it deviates (None if it doesn't).
+
+        If every higher tier is degraded too, ``model`` is kept.
+        """
+        if self._health is None:
+            return model, None
+        problem = self._health.degradation(model)
+        if problem is None:
+            return model, None
+        for candidate in MODEL_TIERS[MODEL_TIERS.index(model) + 1 :]:
+            if self._health.degradation(candidate) is None:
+                logger.warning("Routing around degraded %s (%s) to %s", model, problem, candidate)
+                return candidate, f"{model} degraded ({problem}); steered to {candidate}"
+        return model, None
+
+    def _override(
+        self, category: str, confidence: float, classifier_path: str, keyword_matches: list[KeywordMatch]
+    ) -> RoutingMetadata:
+        return RoutingMetadata(
+            category=category,
+            classifier_confidence=confidence,
+            selected_model="claude-opus-4-6-20250929",
+            escalation_reason="Critical keyword safety override",
+            safety_override=True,
+            priority=PRIORITY_EMERGENCY,
+            classifier_path=classifier_path,
+            safety_matches=[m.to_dict() for m in keyword_matches],
+        )
@@ -1,10 +1,25 @@
+import asyncio
+import json
 import logging
+import math
 import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Any
 
 import httpx
 from anthropic import AsyncAnthropic
 
 from src.config import Settings
+from src.services.llm_cassette import LLMCassette, request_key
+from src.services.llm_json import IncrementalJSONParser, LLMJSONError, parse_llm_json
+from src.services.llm_quota import LLMQuotaScheduler, QuotaReservation
+from src.services.llm_slots import LLMSlotScheduler
+from src.services.metrics import record_llm_hedge
+from src.services.model_health import ModelHealthTracker
+from src.services.token_estimator import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -14,14 +29,187 @@ MODEL_PRICING: dict[str, tuple[float, float]] = {
     "claude-opus-4-6-20250929": (15.00, 75.00),
 }
 
+# Prompt-cache pricing relative to the base input price: writes (5-minute
+# TTL) cost 1.25x, reads 0.1x.
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.10
+
+EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+# Default per-request timeout; complete(timeout=...) may shorten it
+REQUEST_TIMEOUT_S = 60.0
+
+
+def token_cost_usd(model: str, tokens: dict[str, int]) -> float:
+    """Cost of one call from its ``tokens`` dict, including cache reads/writes."""
+    input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    cost = (
+        tokens.get("in", 0) * input_price
+        + tokens.get("cache_write", 0) * input_price * CACHE_WRITE_MULTIPLIER
+        + tokens.get("cache_read", 0) * input_price * CACHE_READ_MULTIPLIER
+        + tokens.get("out", 0) * output_price
+    )
+    return round(cost / 1_000_000, 8)
+
+
+@dataclass
+class _Completion:
+    text: str
+    input_tokens: int
+    output_tokens: int
+    cache_read: int
+    cache_write: int
+    stop_reason: str | None
+    tool_use_id: str | None = None
+
+    @classmethod
+    def from_message(cls, message: Any, **overrides: Any) -> "_Completion":
+        usage = message.usage
+        text, tool_use_id = "", None
+        for block in message.content:
+            if getattr(block, "type", "text") == "tool_use":
+                text, tool_use_id = json.dumps(block.input, ensure_ascii=False), block.id
+                break
+            text = text or block.text
+        fields = {
+            "text": text,
+            "tool_use_id": tool_use_id,
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "cache_read": getattr(usage, "cache_read_input_tokens", None) or 0,
+            "cache_write": getattr(usage, "cache_creation_input_tokens", None) or 0,
+            "stop_reason": message.stop_reason,
+        }
+        return cls(**{**fields, **overrides})
+
+
+def _repair_turn(tool_name: str, repair: dict[str, Any]) -> list[dict[str, Any]]:
+    """Replay the rejected tool call and report its validation errors."""
+    try:
+        previous_input = json.loads(repair["content"])
+    except (json.JSONDecodeError, TypeError):
+        previous_input = {}
+    errors = "\n".join(f"- {e}" for e in repair.get("errors") or ["Output failed validation"])
+    return [
+        {
+            "role": "assistant",
+            "content": [
+                {
+                    "type": "tool_use",
+                    "id": repair["tool_use_id"],
+                    "name": tool_name,
+                    "input": previous_input,
+                }
+            ],
+        },
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": repair["tool_use_id"],
+                    "is_error": True,
+                    "content": (
+                        f"Schema validation failed:\n{errors}\n"
+                        f"Call {tool_name} again, changing only what is needed to fix these errors."
+                    ),
+                }
+            ],
+        },
+    ]
+
+
+class PromptTooLarge(ValueError):
+    """Raised before sending a prompt whose estimated size exceeds the input budget."""
+
+    def __init__(self, model: str, estimated_tokens: int, max_tokens: int) -> None:
+        super().__init__(
+            f"Prompt for {model} is ~{estimated_tokens} input tokens, over the {max_tokens}-token budget"
+        )
+        self.model = model
+        self.estimated_tokens = estimated_tokens
+        self.max_tokens = max_tokens
+
+
+class TokenCalibration:
+    """Per-model ratio of reported input tokens to the local estimate (EWMA)."""
+
+    def __init__(self, alpha: float = 0.1, min_ratio: float = 0.5, max_ratio: float = 2.0) -> None:
+        self._alpha = alpha
+        self._min_ratio = min_ratio
+        self._max_ratio = max_ratio
+        self._ratios: dict[str, float] = {}
+
+    def record(self, model: str, estimated: int, actual: int) -> None:
+        if estimated <= 0 or actual <= 0:
+            return
+        observed = min(self._max_ratio, max(self._min_ratio, actual / estimated))
+        previous = self._ratios.get(model)
+        self._ratios[model] = observed if previous is None else previous + self._alpha * (observed - previous)
+
+    def ratio(self, model: str) -> float:
+        return self._ratios.get(model, 1.0)
+
+
+class ModelLatencyTracker:
+    """Rolling window of recent successful call latencies per model (in-process)."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._window = window
+        self._samples: dict[str, deque[int]] = {}
+
+    def record(self, model: str, duration_ms: int) -> None:
+        self._samples.setdefault(model, deque(maxlen=self._window)).append(duration_ms)
+
+    def sample_count(self, model: str) -> int:
+        return len(self._samples.get(model, ()))
+
+    def percentile(self, model: str, q: float) -> float | None:
+        samples = self._samples.get(model)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return float(ordered[idx])
+
 
 class AnthropicClient:
     def __init__(self, settings: Settings) -> None:
         self._client = AsyncAnthropic(
             api_key=settings.anthropic_api_key,
             max_retries=3,
-            timeout=httpx.Timeout(60.0, connect=5.0),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT_S, connect=5.0),
+        )
+        self.latency = ModelLatencyTracker()
+        self.health = ModelHealthTracker(
+            window_s=settings.llm_health_window_s,
+            min_samples=settings.llm_health_min_samples,
+            max_error_rate=settings.llm_health_max_error_rate,
+            max_p95_ms=settings.llm_health_max_p95_ms,
+            default_timeout_s=REQUEST_TIMEOUT_S,
         )
+        self.token_calibration = TokenCalibration()
+        self._max_input_tokens = settings.llm_max_input_tokens
+        self._prompt_caching = settings.llm_prompt_caching_enabled
+        self._streaming = settings.llm_streaming_enabled
+        self.quota = LLMQuotaScheduler(settings.llm_rate_limits, settings.llm_quota_max_wait_ms)
+        self.slots = LLMSlotScheduler(settings.llm_max_concurrency, settings.llm_priority_aging_s)
+        self.cassette: LLMCassette | None = None
+        if settings.llm_cassette_mode != "off":
+            self.cassette = LLMCassette(
+                settings.llm_cassette_path,
+                settings.llm_cassette_mode,
+                settings.llm_cassette_latency_scale,
+                settings.llm_cassette_seed,
+            )
+
+        # Request hedging (opt-in): fire a duplicate request once the primary
+        # is slower than the model's recent latency percentile.
+        self._hedging_enabled = settings.llm_hedging_enabled
+        self._hedge_percentile = settings.llm_hedge_percentile
+        self._hedge_min_samples = settings.llm_hedge_min_samples
+        self._hedge_max_rate = settings.llm_hedge_max_rate
+        self._recent_hedges: deque[bool] = deque(maxlen=100)
 
     async def complete(
         self,
@@ -31,29 +219,287 @@ class AnthropicClient:
         max_tokens: int = 4096,
         temperature: float = 0.0,
         timeout: float | None = None,
+        cached_prefix: str | None = None,
+        json_output: bool = False,
+        output_tool: dict[str, Any] | None = None,
+        repair: dict[str, Any] | None = None,
+        deadline_at: float | None = None,
+        priority: int | None = None,
     ) -> dict:
-        start = time.monotonic()
-        response = await self._client.messages.create(
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_message}],
-            timeout=timeout,
+        """Run one completion.
+
+        ``cached_prefix`` is stable context (e.g. RAG protocol text) sent
+        ahead of ``user_message``; with prompt caching enabled it gets its own
+        cache breakpoint after the system prompt's.
+
+        With ``json_output`` the response is expected to hold one JSON object:
+        it is streamed (if enabled) and returned as soon as the object closes,
+        and ``content`` is normalized to just that object — code fences,
+        surrounding prose and trailing commas removed. Output that cannot be
+        parsed is returned unchanged for the caller's error handling.
+
+        ``output_tool`` (see src.graph.output_tools) forces the model to answer
+        by calling that tool, so the arguments follow its JSON schema;
+        ``content`` is then the tool input as JSON and ``tool_use_id`` is set.
+        The tool input is streamed and cut off the same way as ``json_output``.
+        Passing the previous result as ``repair`` — {"tool_use_id", "content",
+        "errors"} — sends a follow-up turn asking the model to correct only
+        what failed validation instead of regenerating from scratch.
+
+        Calls are admitted through the per-model quota scheduler; if the
+        wait would pass ``deadline_at`` (epoch seconds) LLMQuotaExceeded is
+        raised instead. Once admitted, the call queues for a concurrency slot
+        by acuity ``priority`` (0 = most urgent, see src.routing.router), so
+        a call throttled on one model never holds a slot others could use.
+        ``duration_ms`` excludes both waits; their sum is returned as
+        ``queue_wait_ms``.
+
+        A prompt whose calibrated local token estimate exceeds
+        ``llm_max_input_tokens`` raises PromptTooLarge without being sent.
+
+        With an LLM cassette configured (see src.services.llm_cassette),
+        completions are recorded to it, or replayed from it instead of
+        calling the API; a request it has no recording for raises
+        CassetteMiss.
+        """
+        messages: list[dict[str, Any]] = [
+            {"role": "user", "content": self._user_content(user_message, cached_prefix)}
+        ]
+        request: dict[str, Any] = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": self._system_blocks(system_prompt),
+            "messages": messages,
+            "timeout": timeout,
+        }
+        if output_tool is not None:
+            request["tools"] = [output_tool]
+            request["tool_choice"] = {"type": "tool", "name": output_tool["name"]}
+            if repair and repair.get("tool_use_id"):
+                messages.extend(_repair_turn(output_tool["name"], repair))
+
+        cassette_key = request_key(model, system_prompt, request) if self.cassette else None
+        if self.cassette is not None and self.cassette.replaying:
+            call = partial(self._replay, cassette_key)
+        elif self._streaming and (json_output or output_tool is not None):
+            call = partial(self._stream_json, request)
+        else:
+            call = partial(self._send, request)
+
+        raw_estimate = sum(
+            estimate_tokens(part)
+            for part in (
+                system_prompt,
+                cached_prefix,
+                user_message,
+                repair and repair.get("content"),
+                output_tool and json.dumps(output_tool),
+            )
+            if part
         )
-        duration_ms = int((time.monotonic() - start) * 1000)
+        estimated_in = math.ceil(raw_estimate * self.token_calibration.ratio(model))
+        if self._max_input_tokens > 0 and estimated_in > self._max_input_tokens:
+            raise PromptTooLarge(model, estimated_in, self._max_input_tokens)
 
-        input_tokens = response.usage.input_tokens
-        output_tokens = response.usage.output_tokens
-        pricing = MODEL_PRICING.get(model, (0.0, 0.0))
-        cost_usd = (input_tokens * pricing[0] + output_tokens * pricing[1]) / 1_000_000
+        # Quota before the slot: a call throttled by its own model's bucket must
+        # not hold a concurrency slot, blocking urgent calls to other models.
+        reservation = await self.quota.acquire(model, estimated_in, max_tokens, deadline_at)
+        admitted = False
+        try:
+            async with self.slots.slot(priority) as slot_wait_ms:
+                admitted = True
+                hedge_reservations: list[QuotaReservation] = []
+
+                def admit_hedge() -> bool:
+                    # A hedge is optional work — only fired if a concurrency slot
+                    # and quota are both free right now
+                    if not self.slots.try_acquire():
+                        return False
+                    hedge_reservation = self.quota.try_acquire(model, estimated_in, max_tokens)
+                    if hedge_reservation is None:
+                        self.slots.release()
+                        return False
+                    hedge_reservations.append(hedge_reservation)
+                    return True
+
+                start = time.monotonic()
+                try:
+                    completion, winner = await self._create(model, call, admit_hedge)
+                except BaseException as exc:
+                    self.quota.settle(reservation, estimated_in, 0)
+                    self.health.record_failure(model, exc, timeout)
+                    raise
+                finally:
+                    for hedge_reservation in hedge_reservations:
+                        self.quota.settle(hedge_reservation, estimated_in, 0)
+                        self.slots.release()
+                duration_ms = int((time.monotonic() - start) * 1000)
+                self.latency.record(model, duration_ms)
+                self.health.record_success(model, duration_ms)
+                if self.cassette is not None and self.cassette.recording:
+                    self.cassette.record(cassette_key, asdict(completion), duration_ms)
+                self.token_calibration.record(
+                    model,
+                    raw_estimate,
+                    completion.input_tokens + completion.cache_read + completion.cache_write,
+                )
+                # Cache reads do not count toward the input-tokens-per-minute limit
+                self.quota.settle(
+                    reservation, completion.input_tokens + completion.cache_write, completion.output_tokens
+                )
+        finally:
+            if not admitted:
+                # Cancelled while queued for a slot; nothing was sent
+                self.quota.settle(reservation, 0, 0)
+
+        content = completion.text
+        if json_output and completion.tool_use_id is None:
+            try:
+                content = json.dumps(parse_llm_json(content), ensure_ascii=False)
+            except LLMJSONError as exc:
+                logger.warning("Unparseable JSON from %s: %s", model, exc.msg)
+
+        tokens = {
+            "in": completion.input_tokens,
+            "out": completion.output_tokens,
+            "cache_read": completion.cache_read,
+            "cache_write": completion.cache_write,
+        }
+        cost_usd = token_cost_usd(model, tokens)
+
+        # A cancelled duplicate is still billed for at least its prompt —
+        # estimated from the winner's prompt (cached portion priced as a
+        # read) and reported separately.
+        hedge_cost_usd = 0.0
+        if winner is not None:
+            hedge_cost_usd = token_cost_usd(
+                model,
+                {"in": tokens["in"], "cache_read": tokens["cache_read"] + tokens["cache_write"]},
+            )
+            record_llm_hedge(model=model, winner=winner, hedge_cost_usd=hedge_cost_usd)
 
         return {
-            "content": response.content[0].text,
+            "content": content,
             "model": model,
-            "tokens": {"in": input_tokens, "out": output_tokens},
-            "cost_usd": round(cost_usd, 8),
+            "tokens": tokens,
+            "cost_usd": cost_usd,
             "duration_ms": duration_ms,
-            "stop_reason": response.stop_reason,
+            "stop_reason": completion.stop_reason,
+            "tool_use_id": completion.tool_use_id,
+            "queue_wait_ms": slot_wait_ms + reservation.wait_ms,
+            "hedged": winner is not None,
+            "hedge_cost_usd": hedge_cost_usd,
         }
 
+    def _system_blocks(self, system_prompt: str) -> str | list[dict[str, Any]]:
+        if not self._prompt_caching:
+            return system_prompt
+        return [{"type": "text", "text": system_prompt, "cache_control": EPHEMERAL_CACHE}]
+
+    def _user_content(
+        self, user_message: str, cached_prefix: str | None
+    ) -> str | list[dict[str, Any]]:
+        if not cached_prefix:
+            return user_message
+        prefix_block: dict[str, Any] = {"type": "text", "text": cached_prefix}
+        if self._prompt_caching:
+            prefix_block["cache_control"] = EPHEMERAL_CACHE
+        return [prefix_block, {"type": "text", "text": user_message}]
+
+    async def _send(self, request: dict[str, Any]) -> _Completion:
+        return _Completion.from_message(await self._client.messages.create(**request))
+
+    async def _replay(self, key: tuple[str, str, str]) -> _Completion:
+        return _Completion(**await self.cassette.replay(key))
+
+    async def _stream_json(self, request: dict[str, Any]) -> _Completion:
+        """Stream the response, stopping as soon as the JSON object closes.
+
+        The object is read from text deltas, or from the tool-input deltas of
+        a forced tool call. Invalid structure aborts the stream early; the
+        partial text is returned with stop_reason "json_invalid". When the
+        stream is cut short the final usage event never arrives, so output
+        tokens are estimated from the characters received.
+        """
+        parser = IncrementalJSONParser()
+        stop_reason = None
+        async with self._client.messages.stream(**request) as stream:
+            try:
+                async for event in stream:
+                    if event.type == "text":
+                        chunk = event.text
+                    elif event.type == "input_json":
+                        chunk = event.partial_json
+                    else:
+                        continue
+                    if parser.feed(chunk):
+                        stop_reason = "json_complete"
+                        break
+            except LLMJSONError:
+                stop_reason = "json_invalid"
+            message = stream.current_message_snapshot
+
+        if stop_reason is None:
+            return _Completion.from_message(message, text=parser.text)
+        return _Completion.from_message(
+            message,
+            text=parser.text,
+            output_tokens=max(message.usage.output_tokens, estimate_tokens(parser.text)),
+            stop_reason=stop_reason,
+        )
+
+    async def _create(
+        self,
+        model: str,
+        call: Callable[[], Awaitable[_Completion]],
+        admit_hedge: Callable[[], bool] | None = None,
+    ) -> tuple[_Completion, str | None]:
+        """Issue the request, hedging if enabled. Returns (completion, winner).
+
+        ``winner`` is None when no hedge was fired, else "primary" or "hedge".
+        ``admit_hedge`` gets a final say before a duplicate is sent.
+        """
+        hedge_delay = self._hedge_delay(model)
+        if hedge_delay is None:
+            self._recent_hedges.append(False)
+            return await call(), None
+
+        primary = asyncio.create_task(call())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if done or not self._hedge_allowed() or (admit_hedge is not None and not admit_hedge()):
+                self._recent_hedges.append(False)
+                return await primary, None
+
+            self._recent_hedges.append(True)
+            logger.info("Hedging %s request after %.0fms", model, hedge_delay * 1000)
+            hedge = asyncio.create_task(call())
+            tasks.add(hedge)
+
+            pending = set(tasks)
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), "primary" if task is primary else "hedge"
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _hedge_delay(self, model: str) -> float | None:
+        if not self._hedging_enabled or self.latency.sample_count(model) < self._hedge_min_samples:
+            return None
+        threshold_ms = self.latency.percentile(model, self._hedge_percentile)
+        return threshold_ms / 1000 if threshold_ms is not None else None
+
+    def _hedge_allowed(self) -> bool:
+        if not self._recent_hedges:
+            return self._hedge_max_rate > 0
+        return sum(self._recent_hedges) / len(self._recent_hedges) < self._hedge_max_rate
@@ -10,6 +10,7 @@ class FirestoreService:
     def __init__(self, settings: Settings) -> None:
         self._client = AsyncClient(project=settings.gcp_project_id)
         self._collection = settings.firestore_collection
+        self._jobs_collection = settings.firestore_jobs_collection
 
     async def write_audit(
         self, encounter_id: str, node_name: str, data: dict[str, Any]
@@ -30,6 +31,15 @@ class FirestoreService:
         await doc_ref.set(data, merge=True)
         return doc_ref.path
 
+    async def write_triage_job(self, job_id: str, data: dict[str, Any]) -> str:
+        doc_ref = self._client.collection(self._jobs_collection).document(job_id)
+        await doc_ref.set(data, merge=True)
+        return doc_ref.path
+
+    async def get_triage_job(self, job_id: str) -> dict[str, Any] | None:
+        snapshot = await self._client.collection(self._jobs_collection).document(job_id).get()
+        return snapshot.to_dict() if snapshot.exists else None
+
     def watch_collection(self, queue: asyncio.Queue[dict[str, Any]]) -> Any:
         """Start Firestore on_snapshot watch, push changes to an asyncio Queue.
 
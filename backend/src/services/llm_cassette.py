@@ -0,0 +1,136 @@
+"""Record/replay of LLM responses for offline, deterministic pipeline runs.
+
+In "record" mode every completion AnthropicClient receives is appended to a
+JSONL cassette; in "replay" mode requests are answered from it without
+touching the network, so end-to-end timings measure only our own overhead
+(graph, sidecar hops, audit I/O) plus optional synthetic model latency.
+
+Prompts are stored only as hashes, but recorded completions can still
+contain patient details — record from synthetic encounters, and keep
+cassettes out of version control.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("off", "record", "replay")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when the cassette has no response for a request."""
+
+    def __init__(self, model: str, system_hash: str, message_hash: str) -> None:
+        super().__init__(
+            f"No recorded {model} response for system {system_hash[:12]} / messages {message_hash[:12]}"
+        )
+        self.model = model
+        self.system_hash = system_hash
+        self.message_hash = message_hash
+
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _strip_cache_control(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_cache_control(v) for k, v in value.items() if k != "cache_control"}
+    if isinstance(value, list):
+        return [_strip_cache_control(v) for v in value]
+    return value
+
+
+def request_key(model: str, system_prompt: str, request: dict[str, Any]) -> tuple[str, str, str]:
+    """(model, system prompt hash, message hash) for a messages.create request.
+
+    The message hash covers the messages and any forced tool. Cache
+    breakpoints are ignored, so a cassette recorded with prompt caching on
+    replays with it off (and vice versa).
+    """
+    messages = {
+        "messages": request["messages"],
+        "tools": request.get("tools"),
+        "tool_choice": request.get("tool_choice"),
+    }
+    return model, _digest(system_prompt), _digest(_strip_cache_control(messages))
+
+
+class LLMCassette:
+    """JSONL store of recorded completions keyed by ``request_key``.
+
+    A request recorded several times replays its recordings in turn. With
+    ``latency_scale`` > 0, each replay sleeps for a ``duration_ms`` drawn
+    (seeded, so runs are repeatable) from that model's recorded durations,
+    multiplied by the scale; 0 replays instantly.
+    """
+
+    def __init__(self, path: str | Path, mode: str, latency_scale: float = 0.0, seed: int = 0) -> None:
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {CASSETTE_MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self._latency_scale = latency_scale
+        self._rng = random.Random(seed)
+        self._entries: dict[tuple[str, str, str], list[dict[str, Any]]] = defaultdict(list)
+        self._durations: dict[str, list[int]] = defaultdict(list)
+        self._cursor: dict[tuple[str, str, str], int] = defaultdict(int)
+        if mode == "replay":
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"LLM cassette {self.path} does not exist; record one first")
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    self._add(json.loads(line))
+        logger.info("Loaded %d recorded LLM responses from %s", sum(map(len, self._entries.values())), self.path)
+
+    def _add(self, entry: dict[str, Any]) -> None:
+        key = (entry["model"], entry["system_hash"], entry["message_hash"])
+        self._entries[key].append(entry)
+        self._durations[entry["model"]].append(entry["duration_ms"])
+
+    def record(self, key: tuple[str, str, str], completion: dict[str, Any], duration_ms: int) -> None:
+        model, system_hash, message_hash = key
+        entry = {
+            "model": model,
+            "system_hash": system_hash,
+            "message_hash": message_hash,
+            "duration_ms": duration_ms,
+            "completion": completion,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._add(entry)
+
+    async def replay(self, key: tuple[str, str, str]) -> dict[str, Any]:
+        """The next recorded completion for ``key``, after any synthetic latency."""
+        entries = self._entries.get(key)
+        if not entries:
+            raise CassetteMiss(*key)
+        entry = entries[self._cursor[key] % len(entries)]
+        self._cursor[key] += 1
+
+        if self._latency_scale > 0:
+            duration_ms = self._rng.choice(self._durations[key[0]])
+            await asyncio.sleep(duration_ms * self._latency_scale / 1000)
+        return entry["completion"]
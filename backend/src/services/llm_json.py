@@ -0,0 +1,131 @@
+"""Tolerant, incremental parsing of JSON objects returned by the LLM nodes."""
+
+import json
+from typing import Any
+
+# Prose / code-fence text tolerated before the opening brace
+MAX_PREAMBLE_CHARS = 512
+
+_CLOSERS = {"}": "{", "]": "["}
+
+
+class LLMJSONError(json.JSONDecodeError):
+    """Raised when LLM output does not contain a usable JSON value.
+
+    Subclasses JSONDecodeError so existing ``except json.JSONDecodeError``
+    handlers (circuit breaker trips) keep working.
+    """
+
+
+class IncrementalJSONParser:
+    """Finds the first top-level JSON object/array in a stream of text chunks.
+
+    Leading prose and ```json fences are skipped, anything after the value
+    closes is ignored, and structurally impossible input (a mismatched
+    bracket, or no opening brace within MAX_PREAMBLE_CHARS) raises
+    LLMJSONError as soon as it is seen.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: list[str] = []
+        self._consumed = 0
+        self._start: int | None = None
+        self._end: int | None = None
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def done(self) -> bool:
+        return self._end is not None
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._buffer)
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk; returns True once the top-level value has closed."""
+        if self.done:
+            return True
+        offset = self._consumed
+        self._buffer.append(chunk)
+        self._consumed += len(chunk)
+
+        for i, ch in enumerate(chunk):
+            pos = offset + i
+            if self._start is None:
+                if ch in "{[":
+                    self._start = pos
+                    self._stack.append(ch)
+                elif pos >= MAX_PREAMBLE_CHARS:
+                    raise LLMJSONError("No JSON value in LLM output", self.text, pos)
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._stack.append(ch)
+            elif ch in _CLOSERS:
+                if self._stack.pop() != _CLOSERS[ch]:
+                    raise LLMJSONError(f"Mismatched {ch!r} in LLM output", self.text, pos)
+                if not self._stack:
+                    self._end = pos + 1
+                    return True
+        return False
+
+    def result(self) -> Any:
+        """Decode the completed value, repairing trailing commas if needed."""
+        if self._start is None or self._end is None:
+            raise LLMJSONError("Unterminated JSON in LLM output", self.text, self._consumed)
+        candidate = self.text[self._start : self._end]
+        try:
+            return json.loads(candidate, strict=False)
+        except json.JSONDecodeError:
+            pass
+        try:
+            return json.loads(_strip_trailing_commas(candidate), strict=False)
+        except json.JSONDecodeError as exc:
+            raise LLMJSONError(exc.msg, candidate, exc.pos) from None
+
+
+def parse_llm_json(text: str) -> Any:
+    """Parse the JSON value in a complete LLM response (fences/prose tolerated)."""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.result()
+
+
+def _strip_trailing_commas(text: str) -> str:
+    out: list[str] = []
+    in_string = escaped = False
+    pending_comma: int | None = None
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch in "}]" and pending_comma is not None:
+            del out[pending_comma]
+        if ch == ",":
+            pending_comma = len(out)
+        elif not ch.isspace():
+            pending_comma = None
+        if ch == '"':
+            in_string = True
+        out.append(ch)
+    return "".join(out)
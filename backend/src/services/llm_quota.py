@@ -0,0 +1,165 @@
+"""Client-side admission control against per-model Anthropic rate limits."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src.services.metrics import record_llm_queue_wait
+
+logger = logging.getLogger(__name__)
+
+# Limit keys accepted in Settings.llm_rate_limits[model]
+LIMIT_KEYS = ("rpm", "itpm", "otpm")
+
+
+class LLMQuotaExceeded(Exception):
+    """Raised when waiting for quota would overrun the caller's deadline."""
+
+    def __init__(self, model: str, wait_s: float, allowed_s: float) -> None:
+        super().__init__(
+            f"{model} quota wait {wait_s * 1000:.0f}ms exceeds the {max(allowed_s, 0) * 1000:.0f}ms allowed"
+        )
+        self.model = model
+        self.wait_s = wait_s
+        self.allowed_s = allowed_s
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding at most one minute of allowance.
+
+    The level may go negative: each admitted call debits immediately, so
+    later callers see the backlog and queue behind it in arrival order.
+    """
+
+    def __init__(self, per_minute: int, clock: Callable[[], float]) -> None:
+        self.capacity = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_s(self, amount: float) -> float:
+        self._refill()
+        # A single call larger than the bucket is admitted once it is full
+        deficit = min(amount, self.capacity) - self._level
+        return max(0.0, deficit / self._rate)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self._level -= amount
+
+    def give(self, amount: float) -> None:
+        self._refill()
+        self._level = min(self.capacity, self._level + amount)
+
+
+@dataclass
+class QuotaReservation:
+    model: str
+    input_tokens: int
+    output_tokens: int
+    wait_ms: int = 0
+
+
+class LLMQuotaScheduler:
+    """Token buckets per model for requests, input tokens and output tokens.
+
+    Output tokens are reserved at ``max_tokens`` (as the API does) and input
+    tokens at the caller's local estimate; ``settle`` corrects both with the
+    actual usage once the call returns. Models without configured limits
+    are admitted immediately.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, dict[str, int]],
+        max_wait_ms: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_wait_s = max_wait_ms / 1000
+        self._buckets: dict[str, dict[str, TokenBucket]] = {
+            model: {key: TokenBucket(limit[key], clock) for key in LIMIT_KEYS if limit.get(key)}
+            for model, limit in limits.items()
+        }
+
+    def _demand(self, input_tokens: int, output_tokens: int) -> dict[str, int]:
+        return {"rpm": 1, "itpm": input_tokens, "otpm": output_tokens}
+
+    def _wait_s(self, model: str, demand: dict[str, int]) -> float:
+        buckets = self._buckets.get(model, {})
+        return max((bucket.wait_s(demand[key]) for key, bucket in buckets.items()), default=0.0)
+
+    def _take(self, model: str, demand: dict[str, int]) -> None:
+        for key, bucket in self._buckets.get(model, {}).items():
+            bucket.take(demand[key])
+
+    async def acquire(
+        self,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        deadline_at: float | None = None,
+    ) -> QuotaReservation:
+        """Wait for quota, or raise LLMQuotaExceeded if the wait would overrun.
+
+        ``deadline_at`` (epoch seconds) is the encounter deadline; the wait
+        is also capped at ``max_wait_ms``.
+        """
+        reservation = QuotaReservation(model, input_tokens, output_tokens)
+        if model not in self._buckets:
+            return reservation
+
+        demand = self._demand(input_tokens, output_tokens)
+        wait_s = self._wait_s(model, demand)
+        allowed_s = self._max_wait_s
+        if deadline_at is not None:
+            allowed_s = min(allowed_s, deadline_at - time.time())
+
+        if wait_s > 0 and wait_s > allowed_s:
+            record_llm_queue_wait(model, wait_s * 1000, "rejected")
+            raise LLMQuotaExceeded(model, wait_s, allowed_s)
+
+        self._take(model, demand)
+        reservation.wait_ms = int(wait_s * 1000)
+        record_llm_queue_wait(model, wait_s * 1000, "admitted")
+        if wait_s > 0:
+            logger.info("Queued %s call %.0fms for rate-limit quota", model, wait_s * 1000)
+            try:
+                await asyncio.sleep(wait_s)
+            except asyncio.CancelledError:
+                self.settle(reservation, 0, 0)
+                raise
+        return reservation
+
+    def try_acquire(self, model: str, input_tokens: int, output_tokens: int) -> QuotaReservation | None:
+        """Reserve only if quota is available right now (used for optional work such as hedges)."""
+        demand = self._demand(input_tokens, output_tokens)
+        if self._wait_s(model, demand) > 0:
+            return None
+        self._take(model, demand)
+        return QuotaReservation(model, input_tokens, output_tokens)
+
+    def settle(self, reservation: QuotaReservation, input_tokens: int, output_tokens: int) -> None:
+        """Return over-reserved tokens (or debit the shortfall) once usage is known."""
+        buckets = self._buckets.get(reservation.model)
+        if not buckets:
+            return
+        refunds = {
+            "itpm": reservation.input_tokens - input_tokens,
+            "otpm": reservation.output_tokens - output_tokens,
+        }
+        for key, amount in refunds.items():
+            bucket = buckets.get(key)
+            if bucket is None or amount == 0:
+                continue
+            if amount > 0:
+                bucket.give(amount)
+            else:
+                bucket.take(-amount)
@@ -0,0 +1,114 @@
+"""Acuity-priority admission to a bounded number of concurrent LLM calls."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from src.services.metrics import record_llm_slot_wait
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the per-priority wait histogram buckets; the last is +inf
+WAIT_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LLMSlotScheduler:
+    """Grants LLM concurrency slots lowest-priority-number first.
+
+    Priorities are small ints (0 = most urgent, see src.routing.router). A
+    waiter's rank improves by one priority level for every ``aging_s`` it
+    has queued, so routine work cannot starve behind a stream of urgent
+    calls. Because every waiter ages at the same rate, the ordering key is
+    fixed at enqueue time: ``priority * aging_s + enqueued_at``.
+
+    Running calls are never interrupted — urgent work preempts only the
+    queue. ``max_concurrency`` <= 0 disables the limit.
+    """
+
+    def __init__(self, max_concurrency: int, aging_s: float = 10.0, default_priority: int = 3) -> None:
+        self._max = max_concurrency
+        self._aging_s = aging_s
+        self._default_priority = default_priority
+        self._in_flight = 0
+        self._waiters: list[tuple[float, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._histograms: dict[int, list[int]] = {}
+
+    @asynccontextmanager
+    async def slot(self, priority: int | None = None) -> AsyncIterator[int]:
+        """Hold a slot for the duration of the block; yields the wait in ms."""
+        wait_ms = await self._acquire(self._default_priority if priority is None else priority)
+        try:
+            yield wait_ms
+        finally:
+            self._release()
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free with nobody queued (for optional work such as hedges).
+
+        A True result must be paired with release().
+        """
+        if self._max <= 0:
+            return True
+        if self._in_flight < self._max and not self._waiters:
+            self._in_flight += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """Return a slot taken with try_acquire()."""
+        self._release()
+
+    async def _acquire(self, priority: int) -> int:
+        if self._max <= 0:
+            return 0
+
+        start = time.monotonic()
+        if self._in_flight < self._max and not self._waiters:
+            self._in_flight += 1
+        else:
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority * self._aging_s + start, next(self._seq), future))
+            try:
+                await future  # the releasing call hands its slot over
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release()  # slot was granted as we were cancelled
+                raise
+
+        wait_ms = int((time.monotonic() - start) * 1000)
+        self._observe(priority, wait_ms)
+        return wait_ms
+
+    def _release(self) -> None:
+        if self._max <= 0:
+            return
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def _observe(self, priority: int, wait_ms: int) -> None:
+        counts = self._histograms.setdefault(priority, [0] * (len(WAIT_BUCKETS_MS) + 1))
+        index = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if wait_ms <= bound), len(WAIT_BUCKETS_MS))
+        counts[index] += 1
+        record_llm_slot_wait(priority, wait_ms)
+        if wait_ms >= 1000:
+            logger.info("LLM call at priority %d waited %dms for a slot", priority, wait_ms)
+
+    def stats(self) -> dict:
+        labels = [f"le_{b}" for b in WAIT_BUCKETS_MS] + ["le_inf"]
+        return {
+            "max_concurrency": self._max,
+            "in_flight": self._in_flight,
+            "queued": sum(1 for *_, f in self._waiters if not f.done()),
+            "wait_histogram_ms": {
+                priority: dict(zip(labels, counts)) for priority, counts in sorted(self._histograms.items())
+            },
+        }
@@ -37,6 +37,8 @@ def record_llm_usage(
     input_tokens: int,
     output_tokens: int,
     cost_usd: float,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
 ) -> None:
     """Record LLM usage metrics to Cloud Monitoring.
 
@@ -64,8 +66,14 @@ def record_llm_usage(
 
         series: list[TimeSeries] = []
 
-        # Token counts (input + output as separate series)
-        for token_type, count in [("input", input_tokens), ("output", output_tokens)]:
+        # Token counts (input, output and prompt-cache reads/writes as separate series)
+        token_counts = [
+            ("input", input_tokens),
+            ("output", output_tokens),
+            ("cache_read", cache_read_tokens),
+            ("cache_write", cache_write_tokens),
+        ]
+        for token_type, count in token_counts:
             series.append(
                 TimeSeries(
                     metric=metric_pb2.Metric(
@@ -106,3 +114,113 @@ def record_llm_usage(
         )
     except Exception:
         logger.debug("Failed to write LLM metrics", exc_info=True)
+
+
+def record_llm_hedge(model: str, winner: str, hedge_cost_usd: float) -> None:
+    """Record a hedged LLM request (which copy won and the duplicate's estimated cost).
+
+    Fire-and-forget, like record_llm_usage.
+    """
+    _write_points(
+        "Failed to write LLM hedge metrics",
+        [
+            ("custom.googleapis.com/sentinel/llm/hedge_count", {"model": model, "winner": winner}, 1),
+            ("custom.googleapis.com/sentinel/llm/hedge_cost_usd", {"model": model}, float(hedge_cost_usd)),
+        ],
+    )
+
+
+def record_llm_queue_wait(model: str, wait_ms: float, outcome: str) -> None:
+    """Record how long an LLM call waited for quota (outcome: "admitted" or "rejected").
+
+    Fire-and-forget, like record_llm_usage.
+    """
+    _write_points(
+        "Failed to write LLM queue wait metric",
+        [
+            (
+                "custom.googleapis.com/sentinel/llm/queue_wait_ms",
+                {"model": model, "outcome": outcome},
+                float(wait_ms),
+            )
+        ],
+    )
+
+
+def record_llm_slot_wait(priority: int, wait_ms: int) -> None:
+    """Record how long an LLM call queued for a concurrency slot, by acuity priority.
+
+    Fire-and-forget, like record_llm_usage.
+    """
+    _write_points(
+        "Failed to write LLM slot wait metric",
+        [
+            (
+                "custom.googleapis.com/sentinel/llm/slot_wait_ms",
+                {"priority": str(priority)},
+                int(wait_ms),
+            )
+        ],
+    )
+
+
+def record_classifier_path(path: str, category: str) -> None:
+    """Count an encounter classification by the path that answered it (local / llm / fallback).
+
+    Fire-and-forget, like record_llm_usage.
+    """
+    _write_points(
+        "Failed to write classifier path metric",
+        [
+            (
+                "custom.googleapis.com/sentinel/routing/classifications",
+                {"path": path, "category": category},
+                1,
+            )
+        ],
+    )
+
+
+def _write_points(failure_message: str, points: list[tuple[str, dict[str, str], int | float]]) -> None:
+    """Write one point per (metric type, labels, value); ints as int64, floats as double."""
+    client = _get_client()
+    if client is None or not _project_path:
+        return
+
+    try:
+        from google.api import metric_pb2, monitored_resource_pb2
+        from google.cloud.monitoring_v3 import CreateTimeSeriesRequest, TimeSeries, TimeInterval, TypedValue, Point
+
+        now = time.time()
+        seconds = int(now)
+        nanos = int((now - seconds) * 1e9)
+        interval = TimeInterval(
+            end_time={"seconds": seconds, "nanos": nanos},
+        )
+
+        resource = monitored_resource_pb2.MonitoredResource(
+            type="global",
+            labels={"project_id": _project_path.split("/")[-1]},
+        )
+
+        series = [
+            TimeSeries(
+                metric=metric_pb2.Metric(type=metric_type, labels=labels),
+                resource=resource,
+                points=[
+                    Point(
+                        interval=interval,
+                        value=TypedValue(double_value=value)
+                        if isinstance(value, float)
+                        else TypedValue(int64_value=value),
+                    )
+                ],
+            )
+            for metric_type, labels, value in points
+        ]
+
+        client.create_time_series(
+            request=CreateTimeSeriesRequest(name=_project_path, time_series=series)
+        )
+    except Exception:
+        logger.debug(failure_message, exc_info=True)
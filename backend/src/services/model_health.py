@@ -0,0 +1,125 @@
+"""Live per-model health from recent AnthropicClient call outcomes."""
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import anthropic
+
+# HTTP statuses meaning the model is shedding load rather than failing.
+# 429 is not here: it is this deployment's own rate limit, not the model's.
+OVERLOAD_STATUSES = (503, 529)
+
+
+@dataclass(frozen=True)
+class ModelHealthSnapshot:
+    model: str
+    samples: int
+    p50_ms: float | None
+    p95_ms: float | None
+    error_rate: float
+    overload_rate: float
+
+
+def classify_failure(exc: BaseException, timeout_s: float | None = None, default_timeout_s: float | None = None) -> str | None:
+    """"overloaded", "error", or None for failures that say nothing about the model.
+
+    Only server-side failures count. A timeout counts only when the call ran
+    with the model's default limit (``timeout_s`` None or at least
+    ``default_timeout_s``); one the caller cut short, such as the
+    deadline-capped classifier timeout, does not. Neither do connection
+    errors, rate limits on our own key, or bad requests.
+    """
+    if isinstance(exc, anthropic.APIStatusError):
+        if exc.status_code in OVERLOAD_STATUSES:
+            return "overloaded"
+        return "error" if exc.status_code >= 500 else None
+    if isinstance(exc, (anthropic.APITimeoutError, TimeoutError)):
+        if timeout_s is None or (default_timeout_s is not None and timeout_s >= default_timeout_s):
+            return "error"
+    return None
+
+
+class ModelHealthTracker:
+    """Outcomes of calls in the last ``window_s`` seconds, per model.
+
+    The window is time-based, so once traffic has been steered away from a
+    model its failures age out and it is tried again. A model with fewer
+    than ``min_samples`` recent calls is assumed healthy.
+    """
+
+    def __init__(
+        self,
+        window_s: float = 120.0,
+        min_samples: int = 20,
+        max_error_rate: float = 0.2,
+        max_p95_ms: dict[str, int] | None = None,
+        default_timeout_s: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._window_s = window_s
+        self._min_samples = min_samples
+        self._max_error_rate = max_error_rate
+        self._max_p95_ms = max_p95_ms or {}
+        self._default_timeout_s = default_timeout_s
+        self._clock = clock
+        # (timestamp, duration_ms or None, outcome) — outcome "ok", "error" or "overloaded"
+        self._outcomes: dict[str, deque[tuple[float, int | None, str]]] = {}
+
+    def record_success(self, model: str, duration_ms: int) -> None:
+        self._append(model, duration_ms, "ok")
+
+    def record_failure(self, model: str, exc: BaseException, timeout_s: float | None = None) -> None:
+        """Record a failed call; ``timeout_s`` is the per-request timeout it ran with, if any."""
+        outcome = classify_failure(exc, timeout_s, self._default_timeout_s)
+        if outcome is not None:
+            self._append(model, None, outcome)
+
+    def _append(self, model: str, duration_ms: int | None, outcome: str) -> None:
+        self._outcomes.setdefault(model, deque()).append((self._clock(), duration_ms, outcome))
+
+    def _recent(self, model: str) -> deque[tuple[float, int | None, str]]:
+        outcomes = self._outcomes.get(model, deque())
+        cutoff = self._clock() - self._window_s
+        while outcomes and outcomes[0][0] < cutoff:
+            outcomes.popleft()
+        return outcomes
+
+    def snapshot(self, model: str) -> ModelHealthSnapshot:
+        outcomes = self._recent(model)
+        durations = sorted(d for _, d, _ in outcomes if d is not None)
+        total = len(outcomes)
+        errors = sum(1 for *_, o in outcomes if o == "error")
+        overloads = sum(1 for *_, o in outcomes if o == "overloaded")
+        return ModelHealthSnapshot(
+            model=model,
+            samples=total,
+            p50_ms=_percentile(durations, 0.50),
+            p95_ms=_percentile(durations, 0.95),
+            error_rate=errors / total if total else 0.0,
+            overload_rate=overloads / total if total else 0.0,
+        )
+
+    def degradation(self, model: str) -> str | None:
+        """Why ``model`` is currently unhealthy, or None if it is fine (or unmeasured)."""
+        health = self.snapshot(model)
+        if health.samples < self._min_samples:
+            return None
+        failure_rate = health.error_rate + health.overload_rate
+        if failure_rate > self._max_error_rate:
+            return (
+                f"{failure_rate:.0%} failed calls "
+                f"({health.overload_rate:.0%} overloaded) over {health.samples} recent calls"
+            )
+        max_p95 = self._max_p95_ms.get(model)
+        if max_p95 and health.p95_ms is not None and health.p95_ms > max_p95:
+            return f"p95 latency {health.p95_ms:.0f}ms over {max_p95}ms"
+        return None
+
+
+def _percentile(ordered: list[int], q: float) -> float | None:
+    if not ordered:
+        return None
+    return float(ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))])
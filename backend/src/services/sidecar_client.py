@@ -8,6 +8,9 @@ from src.config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Must not exceed the sidecar's MAX_BATCH_SIZE
+BATCH_CHUNK_SIZE = 64
+
 
 class SidecarValidationResult:
     """Typed wrapper around sidecar /validate response."""
@@ -50,13 +53,7 @@ class SidecarClient:
         tokens: dict[str, int] | None = None,
     ) -> SidecarValidationResult:
         """Call sidecar /validate. On failure, return a pass-through result."""
-        payload = {
-            "content": content,
-            "node_name": node_name,
-            "encounter_id": encounter_id,
-            "validation_type": validation_type,
-            "tokens": tokens or {"in": 0, "out": 0},
-        }
+        payload = _request_payload(content, node_name, encounter_id, validation_type, tokens)
         try:
             response = await self._client.post("/validate", json=payload)
             response.raise_for_status()
@@ -68,18 +65,39 @@ class SidecarClient:
                 node_name,
                 exc_info=True,
             )
-            # Fail-closed: reject unvalidated content to prevent PHI/PII leaks
-            return SidecarValidationResult(
-                {
-                    "validated": False,
-                    "content": "",
-                    "compliance_flags": ["SIDECAR_UNAVAILABLE"],
-                    "redactions": [],
-                    "errors": ["Sidecar validation unavailable — content blocked"],
-                    "should_retry": True,
-                    "latency_ms": 0.0,
-                }
+            return _unavailable_result()
+
+    async def validate_batch(self, requests: list[dict[str, Any]]) -> list[SidecarValidationResult]:
+        """Call sidecar /validate/batch; results are in request order.
+
+        Each item takes the same keyword arguments as ``validate``. A sidecar
+        without the batch endpoint (404, mid rolling deploy) is called once
+        per item instead; any other failure blocks every item, fail-closed.
+        """
+        results: list[SidecarValidationResult] = []
+        for i in range(0, len(requests), BATCH_CHUNK_SIZE):
+            results.extend(await self._validate_chunk(requests[i : i + BATCH_CHUNK_SIZE]))
+        return results
+
+    async def _validate_chunk(self, requests: list[dict[str, Any]]) -> list[SidecarValidationResult]:
+        payload = {"requests": [_request_payload(**r) for r in requests]}
+        try:
+            response = await self._client.post("/validate/batch", json=payload)
+            if response.status_code == 404:
+                return [await self.validate(**r) for r in requests]
+            response.raise_for_status()
+            results = [SidecarValidationResult(r) for r in response.json()["results"]]
+            if len(results) != len(requests):
+                raise ValueError(f"Sidecar returned {len(results)} results for {len(requests)} requests")
+            return results
+        except Exception:
+            logger.critical(
+                "HIPAA ALERT: Sidecar unavailable for batch of %d (%s) — blocking unvalidated content",
+                len(requests),
+                ", ".join(sorted({f"{r['encounter_id']}/{r['node_name']}" for r in requests})),
+                exc_info=True,
             )
+            return [_unavailable_result() for _ in requests]
 
     async def health_check(self) -> bool:
         """Check sidecar /health endpoint."""
@@ -91,3 +109,34 @@ class SidecarClient:
 
     async def close(self) -> None:
         await self._client.aclose()
+
+
+def _request_payload(
+    content: str,
+    node_name: str,
+    encounter_id: str,
+    validation_type: str,
+    tokens: dict[str, int] | None = None,
+) -> dict[str, Any]:
+    return {
+        "content": content,
+        "node_name": node_name,
+        "encounter_id": encounter_id,
+        "validation_type": validation_type,
+        "tokens": tokens or {"in": 0, "out": 0},
+    }
+
+
+def _unavailable_result() -> SidecarValidationResult:
+    # Fail-closed: reject unvalidated content to prevent PHI/PII leaks
+    return SidecarValidationResult(
+        {
+            "validated": False,
+            "content": "",
+            "compliance_flags": ["SIDECAR_UNAVAILABLE"],
+            "redactions": [],
+            "errors": ["Sidecar validation unavailable — content blocked"],
+            "should_retry": True,
+            "latency_ms": 0.0,
+        }
+    )
@@ -0,0 +1,32 @@
+"""Fast local estimate of Claude token counts — no tokenizer download or API call.
+
+Kept byte-identical in backend/src/services/ and sidecar/src/ so the
+orchestrator and the sidecar's TokenGuard count the same way.
+"""
+
+import math
+import re
+
+_WORDS = re.compile(r"[^\W\d_]+")
+_DIGITS = re.compile(r"\d+")
+_SYMBOLS = re.compile(r"[^\w\s]|_")
+# Whitespace runs other than a single space (which BPE folds into the next word)
+_BREAKS = re.compile(r"\s{2,}|[^\S ]")
+
+# Average characters per token for words and for digit runs
+WORD_CHARS_PER_TOKEN = 4.5
+DIGITS_PER_TOKEN = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``.
+
+    Deliberately simple; the orchestrator scales it per model by the ratio
+    to the ``usage.input_tokens`` it observes (see AnthropicClient).
+
+    Words cost one token per ~4.5 characters, digit runs one per 3 digits,
+    and each symbol or line/indent break one token.
+    """
+    words = sum(max(1, math.ceil(len(w) / WORD_CHARS_PER_TOKEN)) for w in _WORDS.findall(text))
+    digits = sum(math.ceil(len(d) / DIGITS_PER_TOKEN) for d in _DIGITS.findall(text))
+    return words + digits + len(_SYMBOLS.findall(text)) + len(_BREAKS.findall(text))
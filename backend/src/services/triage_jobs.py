@@ -0,0 +1,149 @@
+"""Bounded in-process worker pool for asynchronous triage jobs."""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class TriageJobQueueFull(Exception):
+    """Raised when the job queue is at capacity (backpressure)."""
+
+
+@dataclass
+class TriageJob:
+    encounter_id: str
+    payload: Any
+    owner_uid: str | None = None  # Firebase uid of the submitter; only they may poll it
+    job_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = JOB_QUEUED
+    result: Any = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+class TriageJobQueue:
+    """Runs triage jobs on a fixed number of worker tasks behind a bounded queue.
+
+    ``runner`` executes one job payload and returns its result. ``on_status``
+    (optional) is awaited on every status transition so callers can push
+    progress elsewhere — e.g. the Firestore session the SSE stream watches.
+    Finished jobs are retained in memory (most recent ``max_retained``) for polling;
+    jobs submitted to other instances are only visible through ``on_status``.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Any], Awaitable[Any]],
+        workers: int = 4,
+        queue_depth: int = 100,
+        on_status: Callable[[TriageJob], Awaitable[None]] | None = None,
+        max_retained: int = 1000,
+    ) -> None:
+        self._runner = runner
+        self._worker_count = workers
+        self._queue: asyncio.Queue[TriageJob] = asyncio.Queue(maxsize=queue_depth)
+        self._on_status = on_status
+        self._max_retained = max_retained
+        self._jobs: OrderedDict[str, TriageJob] = OrderedDict()
+        self._workers: list[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"triage-job-worker-{i}")
+            for i in range(self._worker_count)
+        ]
+        logger.info(
+            "Triage job pool started (workers=%d, queue_depth=%d)",
+            self._worker_count,
+            self._queue.maxsize,
+        )
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(
+        self, encounter_id: str, payload: Any, owner_uid: str | None = None
+    ) -> TriageJob:
+        """Enqueue a job without waiting. Raises TriageJobQueueFull at capacity."""
+        job = TriageJob(encounter_id=encounter_id, payload=payload, owner_uid=owner_uid)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise TriageJobQueueFull(
+                f"Triage job queue full ({self._queue.maxsize} pending)"
+            ) from None
+        self._remember(job)
+        await self._notify(job)
+        return job
+
+    def get(self, job_id: str) -> TriageJob | None:
+        return self._jobs.get(job_id)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize(),
+            "queue_depth": self._queue.maxsize,
+            "running": sum(1 for j in self._jobs.values() if j.status == JOB_RUNNING),
+        }
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+                await self._notify(job)
+                try:
+                    job.result = await self._runner(job.payload)
+                    job.status = JOB_COMPLETED
+                except Exception as exc:
+                    logger.exception(
+                        "Triage job %s failed for encounter %s", job.job_id, job.encounter_id
+                    )
+                    job.status = JOB_FAILED
+                    job.error = type(exc).__name__
+                job.finished_at = time.time()
+                await self._notify(job)
+            finally:
+                self._queue.task_done()
+
+    def _remember(self, job: TriageJob) -> None:
+        self._jobs[job.job_id] = job
+        while len(self._jobs) > self._max_retained:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.status in (JOB_QUEUED, JOB_RUNNING):
+                break
+            del self._jobs[oldest_id]
+
+    async def _notify(self, job: TriageJob) -> None:
+        if self._on_status is None:
+            return
+        try:
+            await self._on_status(job)
+        except Exception:
+            logger.warning(
+                "Failed to publish status %s for triage job %s",
+                job.status,
+                job.job_id,
+                exc_info=True,
+            )
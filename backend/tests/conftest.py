@@ -45,6 +45,7 @@ def mock_firestore():
     svc = AsyncMock()
     svc.write_audit.return_value = "test_sessions/enc-001/audit/extractor"
     svc.write_session.return_value = "test_sessions/enc-001"
+    svc.get_triage_job.return_value = None
     return svc
 
 
@@ -174,4 +175,7 @@ def mock_sidecar_client():
     client.validate = AsyncMock(
         side_effect=lambda content, **kwargs: _make_result(content)
     )
+    client.validate_batch = AsyncMock(
+        side_effect=lambda requests: [_make_result(r["content"]) for r in requests]
+    )
     return client
@@ -0,0 +1,93 @@
+"""Tests for the per-encounter SSE progress stream."""
+
+import json
+
+import pytest
+
+from src.api import stream, triage
+from src.graph.pipeline import build_pipeline
+from src.routing.classifier import ClinicalClassifier
+from src.routing.router import ModelRouter
+
+
+def _parse_sse(text: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in text.replace("\r\n", "\n").split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def real_pipeline(
+    mock_anthropic,
+    mock_audit_writer,
+    settings,
+    sample_extracted_data,
+    sample_triage_decision,
+    sample_sentinel_response,
+):
+    mock_anthropic.complete.side_effect = [
+        mock_anthropic._make_response(
+            {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+        ),
+        mock_anthropic._make_response(sample_extracted_data),
+        mock_anthropic._make_response(sample_triage_decision),
+        mock_anthropic._make_response(sample_sentinel_response),
+    ]
+    return build_pipeline(
+        anthropic_client=mock_anthropic,
+        audit_writer=mock_audit_writer,
+        classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+        router=ModelRouter(min_confidence=0.70),
+        settings=settings,
+    )
+
+
+class TestTriageProgressStream:
+    @pytest.mark.asyncio
+    async def test_emits_event_per_node_then_completed(
+        self, client, real_pipeline, mock_audit_writer, mock_firestore
+    ):
+        triage.set_dependencies(real_pipeline, mock_audit_writer, mock_firestore)
+        stream.set_dependencies(None, real_pipeline)
+
+        request = {
+            "encounter_text": "45-year-old male with persistent cough for 3 days",
+            "patient_id": "pat-001",
+            "encounter_id": "enc-stream-001",
+        }
+        response = await client.post("/api/stream/triage", json=request)
+        stream.set_dependencies(None)
+
+        assert response.status_code == 200
+        events = _parse_sse(response.text)
+        names = [name for name, _ in events]
+
+        assert names[-1] == "completed"
+        for expected in ("classified", "extracted", "retrieved", "reasoned", "validated"):
+            assert expected in names
+        assert names.index("classified") < names.index("extracted") < names.index("reasoned")
+
+        payloads = dict(events)
+        assert payloads["classified"]["selected_model"] == "claude-sonnet-4-5-20250929"
+        assert isinstance(payloads["extracted"]["duration_ms"], int)
+        assert payloads["reasoned"]["level"] == "Semi-Urgent"
+        assert payloads["validated"]["passed"] is True
+        assert payloads["completed"]["encounter_id"] == "enc-stream-001"
+        assert payloads["completed"]["triage_level"] == "Semi-Urgent"
+
+        mock_audit_writer.publish_triage_completed.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_pipeline_not_initialized(self, client):
+        stream.set_dependencies(None)
+        request = {
+            "encounter_text": "45-year-old male with persistent cough for 3 days",
+            "patient_id": "pat-001",
+        }
+        response = await client.post("/api/stream/triage", json=request)
+        assert response.status_code == 503
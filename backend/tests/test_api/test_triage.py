@@ -1,9 +1,17 @@
 """Tests for POST /api/triage endpoint."""
 
+import json
+
 import pytest
 from unittest.mock import AsyncMock
 
 from src.api import triage
+from src.main import app
+from src.middleware.auth import verify_firebase_token
+
+
+async def _other_user():
+    return {"uid": "test-user-002", "email": "other@example.com"}
 
 
 class TestTriageEndpoint:
@@ -62,6 +70,23 @@ class TestTriageEndpoint:
         assert data["circuit_breaker_tripped"] is True
         assert data["sentinel_passed"] is False
 
+    @pytest.mark.asyncio
+    async def test_llm_quota_exhausted_returns_503(self, client, mock_pipeline):
+        from src.services.llm_quota import LLMQuotaExceeded
+
+        mock_pipeline.ainvoke.side_effect = LLMQuotaExceeded("claude-opus-4-6-20250929", 7.2, 1.5)
+        request = {
+            "encounter_text": "45-year-old male with persistent cough for 3 days",
+            "patient_id": "pat-001",
+            "encounter_id": "enc-001",
+        }
+
+        response = await client.post("/api/triage", json=request)
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "8"
+        assert "claude-opus-4-6-20250929" in response.json()["detail"]
+
     @pytest.mark.asyncio
     async def test_missing_patient_id(self, client):
         request = {
@@ -111,3 +136,134 @@ class TestTriageEndpoint:
         assert call_kwargs["patient_id"] == "pat-001"
         assert call_kwargs["triage_result"]["level"] == "Semi-Urgent"
         assert call_kwargs["sentinel_check"]["passed"] is True
+
+
+class TestTriageJobs:
+    @pytest.fixture
+    async def job_queue(self, client, mock_pipeline, mock_audit_writer, mock_firestore):
+        from src.services.triage_jobs import TriageJobQueue
+
+        queue = TriageJobQueue(
+            runner=triage.execute_triage,
+            workers=1,
+            queue_depth=2,
+            on_status=triage.publish_job_status,
+        )
+        triage.set_dependencies(mock_pipeline, mock_audit_writer, mock_firestore, queue)
+        yield queue
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_submit_returns_202_and_completes(self, client, job_queue, mock_firestore):
+        request = {
+            "encounter_text": "45-year-old male with persistent cough for 3 days",
+            "patient_id": "pat-001",
+            "encounter_id": "enc-001",
+        }
+
+        response = await client.post("/api/triage/jobs", json=request)
+        assert response.status_code == 202
+        accepted = response.json()
+        assert accepted["status"] == "queued"
+        assert accepted["status_url"] == f"/api/triage/jobs/{accepted['job_id']}"
+
+        await job_queue.start()
+        await job_queue._queue.join()
+
+        status = (await client.get(accepted["status_url"])).json()
+        assert status["status"] == "completed"
+        assert status["result"]["triage_level"] == "Semi-Urgent"
+
+        job_statuses = [
+            c.args[1]["job_status"]
+            for c in mock_firestore.write_session.call_args_list
+            if "job_status" in c.args[1]
+        ]
+        assert job_statuses == ["queued", "running", "completed"]
+
+    @pytest.mark.asyncio
+    async def test_queue_full_returns_503(self, client, job_queue):
+        request = {
+            "encounter_text": "45-year-old male with persistent cough for 3 days",
+            "patient_id": "pat-001",
+        }
+
+        # Workers not started — the third submission exceeds queue_depth=2
+        for _ in range(2):
+            assert (await client.post("/api/triage/jobs", json=request)).status_code == 202
+        response = await client.post("/api/triage/jobs", json=request)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+
+    @pytest.mark.asyncio
+    async def test_failed_job_reports_error(self, client, job_queue, mock_pipeline):
+        mock_pipeline.ainvoke.side_effect = RuntimeError("boom")
+        request = {
+            "encounter_text": "45-year-old male with persistent cough for 3 days",
+            "patient_id": "pat-001",
+        }
+
+        accepted = (await client.post("/api/triage/jobs", json=request)).json()
+        await job_queue.start()
+        await job_queue._queue.join()
+
+        status = (await client.get(accepted["status_url"])).json()
+        assert status["status"] == "failed"
+        assert status["error"] == "RuntimeError"
+        assert status["result"] is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_returns_404(self, client, job_queue):
+        response = await client.get("/api/triage/jobs/does-not-exist")
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_job_record_mirrored_with_owner(self, client, job_queue, mock_firestore):
+        request = {
+            "encounter_text": "45-year-old male with persistent cough for 3 days",
+            "patient_id": "pat-001",
+            "encounter_id": "enc-001",
+        }
+
+        accepted = (await client.post("/api/triage/jobs", json=request)).json()
+        await job_queue.start()
+        await job_queue._queue.join()
+
+        job_id, record = mock_firestore.write_triage_job.call_args.args
+        assert job_id == accepted["job_id"]
+        assert record["owner_uid"] == "test-user-001"
+        assert record["job_status"] == "completed"
+        assert record["result"]["triage_level"] == "Semi-Urgent"
+        assert request["encounter_text"] not in json.dumps(record)
+
+    @pytest.mark.asyncio
+    async def test_other_users_job_returns_404(self, client, job_queue):
+        request = {
+            "encounter_text": "45-year-old male with persistent cough for 3 days",
+            "patient_id": "pat-001",
+        }
+        accepted = (await client.post("/api/triage/jobs", json=request)).json()
+
+        app.dependency_overrides[verify_firebase_token] = _other_user
+        response = await client.get(accepted["status_url"])
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_job_from_another_instance_read_from_firestore(self, client, job_queue, mock_firestore):
+        mock_firestore.get_triage_job.return_value = {
+            "job_id": "job-remote",
+            "encounter_id": "enc-remote",
+            "owner_uid": "test-user-001",
+            "job_status": "running",
+        }
+
+        response = await client.get("/api/triage/jobs/job-remote")
+
+        assert response.status_code == 200
+        assert response.json()["encounter_id"] == "enc-remote"
+        assert response.json()["status"] == "running"
+        mock_firestore.get_triage_job.assert_awaited_once_with("job-remote")
+
+        app.dependency_overrides[verify_firebase_token] = _other_user
+        assert (await client.get("/api/triage/jobs/job-remote")).status_code == 404
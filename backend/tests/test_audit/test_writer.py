@@ -43,8 +43,15 @@ class TestWriteNodeAudit:
 
         assert doc_path == "test_sessions/enc-001/audit/extractor"
 
-        # Sidecar called twice: input + output
-        assert mock_sidecar_client.validate.call_count == 2
+        # Input and output stripped in one batched call
+        mock_sidecar_client.validate_batch.assert_called_once()
+        mock_sidecar_client.validate.assert_not_called()
+        batch = mock_sidecar_client.validate_batch.call_args[0][0]
+        assert [r["content"] for r in batch] == [
+            node_audit_kwargs["input_summary"],
+            node_audit_kwargs["output_summary"],
+        ]
+        assert all(r["validation_type"] == "audit" for r in batch)
 
         # Firestore write called
         mock_firestore.write_audit.assert_called_once()
@@ -76,7 +83,7 @@ class TestWriteNodeAudit:
         self, mock_firestore, mock_pubsub, node_audit_kwargs
     ):
         failing_sidecar = AsyncMock()
-        failing_sidecar.validate = AsyncMock(side_effect=Exception("Sidecar down"))
+        failing_sidecar.validate_batch = AsyncMock(side_effect=Exception("Sidecar down"))
         writer = AuditWriter(mock_firestore, mock_pubsub, failing_sidecar)
 
         with pytest.raises(Exception, match="Sidecar down"):
@@ -99,32 +106,23 @@ class TestWriteNodeAudit:
     ):
         from src.services.sidecar_client import SidecarValidationResult
 
-        call_count = 0
-
-        def side_effect(content, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return SidecarValidationResult({
-                    "validated": True,
-                    "content": content,
-                    "compliance_flags": ["PII_REDACTED"],
-                    "redactions": [],
-                    "errors": [],
-                    "should_retry": False,
-                    "latency_ms": 1.0,
-                })
+        def result(content, flags):
             return SidecarValidationResult({
                 "validated": True,
                 "content": content,
-                "compliance_flags": ["PHI_STRIPPED"],
+                "compliance_flags": flags,
                 "redactions": [],
                 "errors": [],
                 "should_retry": False,
                 "latency_ms": 1.0,
             })
 
-        mock_sidecar_client.validate = AsyncMock(side_effect=side_effect)
+        mock_sidecar_client.validate_batch = AsyncMock(
+            side_effect=lambda requests: [
+                result(requests[0]["content"], ["PII_REDACTED"]),
+                result(requests[1]["content"], ["PHI_STRIPPED"]),
+            ]
+        )
         writer = AuditWriter(mock_firestore, mock_pubsub, mock_sidecar_client)
 
         await writer.write_node_audit(**node_audit_kwargs)
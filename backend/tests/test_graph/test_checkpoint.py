@@ -0,0 +1,191 @@
+"""Tests for pipeline checkpointing and resume-on-retry."""
+
+import asyncio
+import sys
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.config import Settings
+from src.graph.checkpoint import (
+    checkpoint_sweeper,
+    open_checkpointer,
+    prepare_run,
+    release_run,
+    sweep_stale_runs,
+    thread_config,
+)
+from src.graph.pipeline import build_pipeline
+from src.routing.classifier import ClinicalClassifier
+from src.routing.router import ModelRouter
+
+
+def _initial_state():
+    return {
+        "raw_input": "45-year-old with persistent cough for 3 days",
+        "encounter_id": "enc-ckpt-001",
+        "patient_id": "pat-001",
+        "audit_trail": [],
+        "compliance_flags": [],
+        "circuit_breaker_tripped": False,
+        "error": None,
+    }
+
+
+@pytest.fixture
+def checkpointed_pipeline(
+    mock_anthropic,
+    mock_audit_writer,
+    settings,
+    sample_extracted_data,
+    sample_triage_decision,
+    sample_sentinel_response,
+):
+    mock_anthropic.complete.side_effect = [
+        mock_anthropic._make_response(
+            {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+        ),
+        mock_anthropic._make_response(sample_extracted_data),
+        mock_anthropic._make_response(sample_triage_decision),
+        mock_anthropic._make_response(sample_sentinel_response),
+        mock_anthropic._make_response(sample_sentinel_response),
+    ]
+    return build_pipeline(
+        anthropic_client=mock_anthropic,
+        audit_writer=mock_audit_writer,
+        classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+        router=ModelRouter(min_confidence=0.70),
+        settings=settings,
+        checkpointer=InMemorySaver(),
+    )
+
+
+class TestCheckpointResume:
+    @pytest.mark.asyncio
+    async def test_retry_resumes_from_failed_node(
+        self, checkpointed_pipeline, mock_anthropic, mock_audit_writer
+    ):
+        audit_write = mock_audit_writer.write_node_audit.return_value
+
+        async def _fail_sentinel_once(**kwargs):
+            if kwargs["node_name"] == "sentinel" and not _fail_sentinel_once.failed:
+                _fail_sentinel_once.failed = True
+                raise RuntimeError("Firestore unavailable")
+            return audit_write
+
+        _fail_sentinel_once.failed = False
+        mock_audit_writer.write_node_audit.side_effect = _fail_sentinel_once
+
+        run_input, config = await prepare_run(checkpointed_pipeline, _initial_state())
+        with pytest.raises(RuntimeError):
+            await checkpointed_pipeline.ainvoke(run_input, config)
+        assert mock_anthropic.complete.call_count == 4
+
+        run_input, config = await prepare_run(checkpointed_pipeline, _initial_state())
+        assert run_input is None
+        result = await checkpointed_pipeline.ainvoke(run_input, config)
+
+        # Only the sentinel LLM call was repeated
+        assert mock_anthropic.complete.call_count == 5
+        assert result["sentinel_check"]["passed"] is True
+        assert [e["node"] for e in result["audit_trail"]] == ["extractor", "reasoner", "sentinel"]
+
+    @pytest.mark.asyncio
+    async def test_finished_run_is_replayed_without_llm_calls(
+        self, checkpointed_pipeline, mock_anthropic
+    ):
+        run_input, config = await prepare_run(checkpointed_pipeline, _initial_state())
+        first = await checkpointed_pipeline.ainvoke(run_input, config)
+
+        run_input, config = await prepare_run(checkpointed_pipeline, _initial_state())
+        replayed = await checkpointed_pipeline.ainvoke(run_input, config)
+
+        assert mock_anthropic.complete.call_count == 4
+        assert replayed["triage_decision"] == first["triage_decision"]
+
+    @pytest.mark.asyncio
+    async def test_release_drops_checkpoint(self, checkpointed_pipeline):
+        run_input, config = await prepare_run(checkpointed_pipeline, _initial_state())
+        await checkpointed_pipeline.ainvoke(run_input, config)
+
+        await release_run(checkpointed_pipeline, "enc-ckpt-001")
+
+        snapshot = await checkpointed_pipeline.aget_state(thread_config("enc-ckpt-001"))
+        assert snapshot.values == {}
+
+    @pytest.mark.asyncio
+    async def test_changed_input_starts_fresh(self, checkpointed_pipeline):
+        run_input, config = await prepare_run(checkpointed_pipeline, _initial_state())
+        await checkpointed_pipeline.ainvoke(run_input, config)
+
+        edited = {**_initial_state(), "raw_input": "Amended note: cough and fever"}
+        run_input, _ = await prepare_run(checkpointed_pipeline, edited)
+        assert run_input == edited
+
+    @pytest.mark.asyncio
+    async def test_no_checkpointer_passes_state_through(self, mock_pipeline_without_checkpointer):
+        run_input, config = await prepare_run(mock_pipeline_without_checkpointer, _initial_state())
+        assert run_input == _initial_state()
+        assert config is None
+
+
+class TestStaleRunSweep:
+    @pytest.mark.asyncio
+    async def test_unfinished_threads_past_ttl_are_deleted(self, checkpointed_pipeline):
+        run_input, config = await prepare_run(checkpointed_pipeline, _initial_state())
+        await checkpointed_pipeline.ainvoke(run_input, config)
+        saver = checkpointed_pipeline.checkpointer
+
+        assert await sweep_stale_runs(saver, ttl_s=3600) == []
+        assert (await checkpointed_pipeline.aget_state(config)).values
+
+        assert await sweep_stale_runs(saver, ttl_s=-1) == ["enc-ckpt-001"]
+        assert (await checkpointed_pipeline.aget_state(config)).values == {}
+
+    @pytest.mark.asyncio
+    async def test_sweeper_runs_in_background_until_exit(self, checkpointed_pipeline):
+        run_input, config = await prepare_run(checkpointed_pipeline, _initial_state())
+        await checkpointed_pipeline.ainvoke(run_input, config)
+        await asyncio.sleep(0.05)
+
+        async with checkpoint_sweeper(checkpointed_pipeline.checkpointer, ttl_s=0.01):
+            await asyncio.sleep(0.05)
+            assert (await checkpointed_pipeline.aget_state(config)).values == {}
+            sweepers = [t for t in asyncio.all_tasks() if t.get_name() == "checkpoint-sweeper"]
+            assert len(sweepers) == 1
+
+        assert sweepers[0].cancelled()
+
+    @pytest.mark.asyncio
+    async def test_sweeper_disabled_without_ttl(self, checkpointed_pipeline):
+        async with checkpoint_sweeper(checkpointed_pipeline.checkpointer, ttl_s=0):
+            assert not [t for t in asyncio.all_tasks() if t.get_name() == "checkpoint-sweeper"]
+
+
+class TestCheckpointerSettings:
+    def test_default_is_none(self):
+        assert Settings().pipeline_checkpointer == "none"
+
+    @pytest.mark.parametrize("env", ["staging", "prod"])
+    def test_memory_rejected_outside_dev(self, env):
+        with pytest.raises(ValueError, match="PIPELINE_CHECKPOINTER=memory"):
+            Settings(env=env, anthropic_api_key="k", voyage_api_key="k", pipeline_checkpointer="memory")
+
+    @pytest.mark.asyncio
+    async def test_postgres_without_extra_explains_install(self, settings, monkeypatch):
+        monkeypatch.setitem(sys.modules, "langgraph.checkpoint.postgres.aio", None)
+        settings.pipeline_checkpointer = "postgres"
+        with pytest.raises(RuntimeError, match=r"\[postgres\]"):
+            async with open_checkpointer(settings):
+                pass
+
+
+@pytest.fixture
+def mock_pipeline_without_checkpointer(mock_anthropic, mock_audit_writer, settings):
+    return build_pipeline(
+        anthropic_client=mock_anthropic,
+        audit_writer=mock_audit_writer,
+        classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+        router=ModelRouter(min_confidence=0.70),
+        settings=settings,
+    )
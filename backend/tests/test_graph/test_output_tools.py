@@ -0,0 +1,26 @@
+"""The generated output tools must match the sidecar's FHIR schemas."""
+
+import pytest
+
+from scripts.generate_output_tools import SCHEMA_DIR, build_tools, render
+from src.graph.output_tools import OUTPUT_TOOLS
+
+
+@pytest.mark.skipif(not SCHEMA_DIR.exists(), reason="sidecar schemas not available")
+def test_output_tools_in_sync_with_sidecar_schemas():
+    tools = build_tools()
+    assert OUTPUT_TOOLS == tools, "Run: python -m scripts.generate_output_tools"
+
+
+def test_rendered_module_round_trips():
+    namespace: dict = {}
+    exec(render(OUTPUT_TOOLS), namespace)
+    assert namespace["OUTPUT_TOOLS"] == OUTPUT_TOOLS
+
+
+def test_tool_names():
+    assert {t["name"] for t in OUTPUT_TOOLS.values()} == {
+        "record_extractor_output",
+        "record_reasoner_output",
+        "record_sentinel_output",
+    }
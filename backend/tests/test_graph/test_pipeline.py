@@ -1,16 +1,18 @@
 """Integration tests for the LangGraph triage pipeline with mocked services."""
 
+import asyncio
 import json
+import time
 from unittest.mock import AsyncMock
 
 import pytest
 
-from src.graph.nodes.extractor import extractor_node
+from src.graph.nodes.extractor import DEFAULT_MAX_TOKENS, extractor_node
 from src.graph.nodes.reasoner import reasoner_node
 from src.graph.nodes.sentinel import sentinel_node
-from src.graph.pipeline import build_pipeline
+from src.graph.pipeline import build_pipeline, drain_background_labels
 from src.routing.classifier import ClinicalClassifier
-from src.routing.router import ModelRouter
+from src.routing.router import PRIORITY_ROUTINE, ModelRouter
 
 
 @pytest.fixture
@@ -90,6 +92,29 @@ class TestExtractorNode:
         call_kwargs = mock_anthropic.complete.call_args
         assert call_kwargs.kwargs["model"] == "claude-opus-4-6-20250929"
 
+    @pytest.mark.asyncio
+    async def test_extractor_audits_hedge_cost(
+        self, mock_anthropic, mock_audit_writer, sample_extracted_data
+    ):
+        response = mock_anthropic._make_response(sample_extracted_data)
+        response.update(hedged=True, hedge_cost_usd=0.0001)
+        mock_anthropic.complete.return_value = response
+        state = _build_base_state()
+        state["routing_metadata"] = {
+            "category": "symptom_assessment",
+            "classifier_confidence": 0.88,
+            "selected_model": "claude-sonnet-4-5-20250929",
+            "escalation_reason": None,
+            "safety_override": False,
+        }
+
+        result = await extractor_node(
+            state, anthropic_client=mock_anthropic, audit_writer=mock_audit_writer
+        )
+
+        assert result["audit_trail"][0]["cost_usd"] == pytest.approx(0.00025)
+        assert mock_audit_writer.write_node_audit.call_args.kwargs["cost_usd"] == pytest.approx(0.00025)
+
 
 class TestReasonerNode:
     @pytest.mark.asyncio
@@ -327,26 +352,26 @@ class TestFullPipeline:
         sample_triage_decision,
         sample_sentinel_response,
     ):
-        """Critical keyword in input → Opus for all nodes."""
-        classify_response = mock_anthropic._make_response(
-            {"category": "acute_presentation", "confidence": 0.92, "reason": "Chest pain"}
-        )
-        extract_response = mock_anthropic._make_response(
-            sample_extracted_data, model="claude-opus-4-6-20250929"
-        )
-        reason_response = mock_anthropic._make_response(
-            sample_triage_decision, model="claude-opus-4-6-20250929"
-        )
-        sentinel_response = mock_anthropic._make_response(
-            sample_sentinel_response
+        """Critical keyword in input → Opus for all nodes, without waiting for the classifier."""
+        classifier_released = asyncio.Event()
+        node_responses = iter(
+            [
+                mock_anthropic._make_response(sample_extracted_data, model="claude-opus-4-6-20250929"),
+                mock_anthropic._make_response(sample_triage_decision, model="claude-opus-4-6-20250929"),
+                mock_anthropic._make_response(sample_sentinel_response),
+            ]
         )
 
-        mock_anthropic.complete.side_effect = [
-            classify_response,
-            extract_response,
-            reason_response,
-            sentinel_response,
-        ]
+        async def _complete(**kwargs):
+            if kwargs["system_prompt"].startswith("You are a clinical encounter classifier"):
+                # The classifier cannot answer until the pipeline has finished
+                await classifier_released.wait()
+                return mock_anthropic._make_response(
+                    {"category": "acute_presentation", "confidence": 0.92, "reason": "Chest pain"}
+                )
+            return next(node_responses)
+
+        mock_anthropic.complete.side_effect = _complete
 
         classifier = ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022")
         router = ModelRouter(min_confidence=0.70)
@@ -371,9 +396,27 @@ class TestFullPipeline:
 
         result = await pipeline.ainvoke(initial_state)
 
-        # Critical keyword → Opus
+        # Critical keyword → Opus, decided before classification
         assert result["routing_metadata"]["selected_model"] == "claude-opus-4-6-20250929"
         assert result["routing_metadata"]["safety_override"] is True
+        assert result["routing_metadata"]["category"] == "unclassified"
+        assert result["routing_metadata"]["classifier_path"] == "deferred"
+        assert result["triage_decision"]["level"] == sample_triage_decision["level"]
+
+        # The background classification still labels the encounter in the audit log
+        classifier_released.set()
+        await drain_background_labels()
+        classifier_audits = [
+            c.kwargs
+            for c in mock_audit_writer.write_node_audit.call_args_list
+            if c.kwargs["node_name"] == "classifier"
+        ]
+        assert len(classifier_audits) == 1
+        assert classifier_audits[0]["routing_decision"]["category"] == "acute_presentation"
+        classifier_call = next(
+            c for c in mock_anthropic.complete.call_args_list if c.kwargs["max_tokens"] == 256
+        )
+        assert classifier_call.kwargs["priority"] == PRIORITY_ROUTINE
 
 
 class TestSidecarIntegration:
@@ -414,6 +457,62 @@ class TestSidecarIntegration:
         # Compliance flags from sidecar should be in result
         assert "PII_CLEAN" in result["compliance_flags"]
 
+    @pytest.mark.asyncio
+    async def test_fhir_failure_is_repaired_not_regenerated(
+        self,
+        mock_anthropic,
+        mock_audit_writer,
+        mock_sidecar_client,
+        sample_extracted_data,
+    ):
+        from src.graph.output_tools import OUTPUT_TOOLS
+        from src.services.sidecar_client import SidecarValidationResult
+
+        first = mock_anthropic._make_response({"symptoms": []})
+        first["tool_use_id"] = "toolu_01"
+        mock_anthropic.complete.side_effect = [
+            first,
+            mock_anthropic._make_response(sample_extracted_data),
+        ]
+        mock_sidecar_client.validate.side_effect = [
+            mock_sidecar_client._make_result("45-year-old with cough"),
+            SidecarValidationResult(
+                {
+                    "validated": False,
+                    "content": first["content"],
+                    "compliance_flags": ["FHIR_INVALID_EXTRACTOR"],
+                    "errors": ["'vitals' is a required property"],
+                    "should_retry": True,
+                }
+            ),
+            mock_sidecar_client._make_result(json.dumps(sample_extracted_data)),
+        ]
+        state = _build_base_state()
+        state["routing_metadata"] = {
+            "category": "symptom_assessment",
+            "classifier_confidence": 0.88,
+            "selected_model": "claude-opus-4-6-20250929",
+            "escalation_reason": None,
+            "safety_override": False,
+        }
+
+        result = await extractor_node(
+            state,
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            sidecar_client=mock_sidecar_client,
+        )
+
+        first_call, second_call = mock_anthropic.complete.call_args_list
+        assert first_call.kwargs["output_tool"] is OUTPUT_TOOLS["extractor"]
+        assert first_call.kwargs["repair"] is None
+        assert second_call.kwargs["repair"] == {
+            "tool_use_id": "toolu_01",
+            "content": first["content"],
+            "errors": ["'vitals' is a required property"],
+        }
+        assert result["fhir_data"] == sample_extracted_data
+
     @pytest.mark.asyncio
     async def test_pipeline_with_sidecar(
         self,
@@ -479,3 +578,465 @@ class TestSidecarIntegration:
         # Total = 12, but audit_writer is mocked so those don't hit sidecar
         # Only node-level calls: 3 nodes × 2 = 6
         assert mock_sidecar_client.validate.call_count == 6
+
+
+class TestCircuitBreakerShortCircuit:
+    """A tripped breaker routes straight to manual review, skipping later LLM calls."""
+
+    @pytest.mark.asyncio
+    async def test_extractor_parse_failure_skips_remaining_stages(
+        self, mock_anthropic, mock_audit_writer, mock_embedding_service, settings
+    ):
+        mock_anthropic.complete.side_effect = [
+            mock_anthropic._make_response(
+                {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+            ),
+            mock_anthropic._make_response("not json at all"),
+        ]
+        protocol_store = AsyncMock()
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+            protocol_store=protocol_store,
+            embedding_service=mock_embedding_service,
+        )
+
+        result = await pipeline.ainvoke(_build_base_state("45-year-old with cough"))
+
+        assert mock_anthropic.complete.call_count == 2
+        mock_embedding_service.embed.assert_not_called()
+        protocol_store.retrieve.assert_not_called()
+
+        assert result["circuit_breaker_tripped"] is True
+        assert result["triage_decision"]["level"] == "Manual_Review_Required"
+        assert result["sentinel_check"]["passed"] is False
+        assert "CIRCUIT_BREAKER_SHORT_CIRCUIT" in result["compliance_flags"]
+        assert [e["node"] for e in result["audit_trail"]] == ["extractor", "manual_review"]
+        assert result["tripped_at"] == "extractor"
+
+        review_audit = mock_audit_writer.write_node_audit.call_args_list[-1].kwargs
+        assert review_audit["node_name"] == "manual_review"
+        assert json.loads(review_audit["output_summary"])["skipped"] == [
+            "rag_retriever",
+            "reasoner",
+            "sentinel",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reasoner_parse_failure_skips_sentinel(
+        self, mock_anthropic, mock_audit_writer, settings, sample_extracted_data
+    ):
+        mock_anthropic.complete.side_effect = [
+            mock_anthropic._make_response(
+                {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+            ),
+            mock_anthropic._make_response(sample_extracted_data),
+            mock_anthropic._make_response("{truncated"),
+        ]
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+        )
+
+        result = await pipeline.ainvoke(_build_base_state("45-year-old with cough"))
+
+        assert mock_anthropic.complete.call_count == 3
+        assert result["triage_decision"]["level"] == "Manual_Review_Required"
+        assert [e["node"] for e in result["audit_trail"]] == [
+            "extractor",
+            "reasoner",
+            "manual_review",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_oversized_prompt_goes_to_manual_review(self, mock_anthropic, mock_audit_writer, settings):
+        from src.services.anthropic_client import PromptTooLarge
+
+        mock_anthropic.complete.side_effect = [
+            mock_anthropic._make_response(
+                {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+            ),
+            PromptTooLarge("claude-sonnet-4-5-20250929", 61000, 50000),
+        ]
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+        )
+
+        result = await pipeline.ainvoke(_build_base_state("45-year-old with cough"))
+
+        assert result["triage_decision"]["level"] == "Manual_Review_Required"
+        assert "INPUT_TOKEN_BUDGET_EXCEEDED" in result["compliance_flags"]
+        assert result["error"].startswith("extractor: ")
+        assert result["tripped_at"] == "extractor"
+        assert [e["node"] for e in result["audit_trail"]] == ["manual_review"]
+
+    @pytest.mark.asyncio
+    async def test_oversized_reasoner_prompt_names_reasoner(
+        self, mock_anthropic, mock_audit_writer, settings, sample_extracted_data
+    ):
+        from src.services.anthropic_client import PromptTooLarge
+
+        mock_anthropic.complete.side_effect = [
+            mock_anthropic._make_response(
+                {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+            ),
+            mock_anthropic._make_response(sample_extracted_data),
+            PromptTooLarge("claude-sonnet-4-5-20250929", 61000, 50000),
+        ]
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+        )
+
+        result = await pipeline.ainvoke(_build_base_state("45-year-old with cough"))
+
+        # The rejected reasoner call wrote no audit entry; the extractor's is the last one
+        assert [e["node"] for e in result["audit_trail"]] == ["extractor", "manual_review"]
+        assert result["tripped_at"] == "reasoner"
+        assert result["triage_decision"]["reasoning_summary"].startswith("Pipeline short-circuited at reasoner")
+        review_audit = mock_audit_writer.write_node_audit.call_args_list[-1].kwargs
+        assert json.loads(review_audit["input_summary"])["tripped_at"] == "reasoner"
+        assert json.loads(review_audit["output_summary"])["skipped"] == ["sentinel"]
+
+
+    @pytest.mark.asyncio
+    async def test_oversized_sentinel_prompt_goes_to_manual_review(
+        self, mock_anthropic, mock_audit_writer, settings, sample_extracted_data, sample_triage_decision
+    ):
+        from src.services.anthropic_client import PromptTooLarge
+
+        mock_anthropic.complete.side_effect = [
+            mock_anthropic._make_response(
+                {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+            ),
+            mock_anthropic._make_response(sample_extracted_data),
+            mock_anthropic._make_response(sample_triage_decision),
+            PromptTooLarge("claude-sonnet-4-5-20250929", 61000, 50000),
+        ]
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+        )
+
+        result = await pipeline.ainvoke(_build_base_state("45-year-old with cough"))
+
+        assert result["triage_decision"]["level"] == "Manual_Review_Required"
+        assert result["tripped_at"] == "sentinel"
+        assert [e["node"] for e in result["audit_trail"]] == ["extractor", "reasoner", "manual_review"]
+
+    @pytest.mark.asyncio
+    async def test_quota_exhaustion_past_deadline_raises_for_retry(
+        self, mock_anthropic, mock_audit_writer, settings
+    ):
+        from src.services.llm_quota import LLMQuotaExceeded
+
+        mock_anthropic.complete.side_effect = [
+            mock_anthropic._make_response(
+                {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+            ),
+            LLMQuotaExceeded("claude-sonnet-4-5-20250929", 0.4, -0.2),
+        ]
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+        )
+        state = {**_build_base_state("45-year-old with cough"), "deadline_at": time.time() - 1}
+
+        # The latency budget is a target: an expired one never yields a
+        # manual-review verdict, the API answers 503 and the retry resumes
+        with pytest.raises(LLMQuotaExceeded):
+            await pipeline.ainvoke(state)
+
+class TestParallelInputScan:
+    @pytest.mark.asyncio
+    async def test_input_scan_runs_concurrently_with_classifier(
+        self,
+        mock_anthropic,
+        mock_audit_writer,
+        mock_sidecar_client,
+        settings,
+        sample_extracted_data,
+        sample_triage_decision,
+        sample_sentinel_response,
+    ):
+        """The classifier blocks until the input scan has started — only possible in parallel."""
+        scan_started = asyncio.Event()
+        responses = iter(
+            [
+                mock_anthropic._make_response(
+                    {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+                ),
+                mock_anthropic._make_response(sample_extracted_data),
+                mock_anthropic._make_response(sample_triage_decision),
+                mock_anthropic._make_response(sample_sentinel_response),
+            ]
+        )
+
+        async def _complete(**kwargs):
+            if not scan_started.is_set():
+                await asyncio.wait_for(scan_started.wait(), timeout=1.0)
+            return next(responses)
+
+        async def _validate(content, **kwargs):
+            if kwargs["validation_type"] == "input" and kwargs["node_name"] == "extractor":
+                scan_started.set()
+                return mock_sidecar_client._make_result("[scanned] " + content)
+            return mock_sidecar_client._make_result(content)
+
+        mock_anthropic.complete.side_effect = _complete
+        mock_sidecar_client.validate.side_effect = _validate
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+            sidecar_client=mock_sidecar_client,
+        )
+
+        result = await pipeline.ainvoke(_build_base_state("45-year-old with cough"))
+
+        assert result["triage_decision"]["level"] == "Semi-Urgent"
+        # Extractor consumed the joined scan result rather than re-scanning
+        extractor_call = mock_anthropic.complete.call_args_list[1].kwargs
+        assert extractor_call["user_message"] == "[scanned] 45-year-old with cough"
+        input_scans = [
+            c for c in mock_sidecar_client.validate.call_args_list
+            if c.kwargs["node_name"] == "extractor" and c.kwargs["validation_type"] == "input"
+        ]
+        assert len(input_scans) == 1
+
+
+class TestDeadlineAdaptations:
+    @pytest.mark.asyncio
+    async def test_low_budget_sheds_optional_work_and_is_audited(
+        self,
+        mock_anthropic,
+        mock_audit_writer,
+        mock_embedding_service,
+        settings,
+        sample_extracted_data,
+        sample_triage_decision,
+        sample_sentinel_response,
+    ):
+        mock_anthropic.complete.side_effect = [
+            mock_anthropic._make_response(
+                {"category": "routine_vitals", "confidence": 0.95, "reason": "Vitals check"}
+            ),
+            mock_anthropic._make_response(sample_extracted_data),
+            mock_anthropic._make_response(sample_triage_decision),
+            mock_anthropic._make_response(sample_sentinel_response),
+        ]
+        protocol_store = AsyncMock()
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+            protocol_store=protocol_store,
+            embedding_service=mock_embedding_service,
+        )
+
+        state = _build_base_state("Routine vitals check, patient with mild headache")
+        state["deadline_at"] = time.time() + 1.0  # 1s left of the budget
+
+        result = await pipeline.ainvoke(state)
+
+        calls = mock_anthropic.complete.call_args_list
+        assert calls[0].kwargs["timeout"] == 0.5  # classifier capped to its floor
+        mock_embedding_service.embed.assert_not_called()
+
+        actions = [a["action"] for a in result["deadline_adaptations"]]
+        assert "classifier_timeout_capped" in actions
+        assert "rag_skipped" in actions
+
+        # Output limits are never cut: the forced tool output still parses
+        assert calls[1].kwargs["max_tokens"] == DEFAULT_MAX_TOKENS
+        assert calls[2].kwargs["max_tokens"] >= DEFAULT_MAX_TOKENS
+        assert result.get("tripped_at") is None
+        assert not result.get("circuit_breaker_tripped")
+        assert result["fhir_data"]
+        assert result["triage_decision"]["level"] != "Manual_Review_Required"
+
+        sentinel_audit = mock_audit_writer.write_node_audit.call_args_list[-1].kwargs
+        assert {a["action"] for a in sentinel_audit["deadline_adaptations"]} == set(actions)
+
+    @pytest.mark.asyncio
+    async def test_safety_override_skips_classifier_wait_under_low_budget(
+        self,
+        mock_anthropic,
+        mock_audit_writer,
+        settings,
+        sample_extracted_data,
+        sample_triage_decision,
+        sample_sentinel_response,
+    ):
+        async def _complete(**kwargs):
+            if kwargs["system_prompt"].startswith("You are a clinical encounter classifier"):
+                return mock_anthropic._make_response(
+                    {"category": "routine_vitals", "confidence": 0.95, "reason": "Vitals check"}
+                )
+            return mock_anthropic._make_response(
+                {
+                    "extractor": sample_extracted_data,
+                    "reasoner": sample_triage_decision,
+                    "sentinel": sample_sentinel_response,
+                }[kwargs["output_tool"]["name"].split("_")[1]]
+            )
+
+        mock_anthropic.complete.side_effect = _complete
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+        )
+
+        state = _build_base_state("Routine vitals check, patient with chest pain")
+        state["deadline_at"] = time.time() + 1.0
+
+        result = await pipeline.ainvoke(state)
+        await drain_background_labels()
+
+        # Safety floor untouched: critical keyword still forces Opus, and the
+        # classifier no longer spends the remaining budget
+        assert result["routing_metadata"]["selected_model"] == "claude-opus-4-6-20250929"
+        actions = [a["action"] for a in result["deadline_adaptations"]]
+        assert "classifier_timeout_capped" not in actions
+
+    @pytest.mark.asyncio
+    async def test_ample_budget_makes_no_adaptations(
+        self,
+        mock_anthropic,
+        mock_audit_writer,
+        settings,
+        sample_extracted_data,
+        sample_triage_decision,
+        sample_sentinel_response,
+    ):
+        mock_anthropic.complete.side_effect = [
+            mock_anthropic._make_response(
+                {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+            ),
+            mock_anthropic._make_response(sample_extracted_data),
+            mock_anthropic._make_response(sample_triage_decision),
+            mock_anthropic._make_response(sample_sentinel_response),
+        ]
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+        )
+
+        state = _build_base_state()
+        state["deadline_at"] = time.time() + 60.0
+
+        result = await pipeline.ainvoke(state)
+
+        assert result.get("deadline_adaptations", []) == []
+        assert mock_anthropic.complete.call_args_list[0].kwargs["timeout"] == 5.0
+        assert mock_anthropic.complete.call_args_list[1].kwargs["max_tokens"] == 4096
+
+
+class TestStateReducers:
+    def test_merge_flags_is_ordered_set(self):
+        from src.graph.state import merge_flags
+
+        assert merge_flags(["PII_CLEAN", "TOKEN_INPUT_OK"], ["PII_CLEAN", "FHIR_VALID_EXTRACTOR"]) == [
+            "PII_CLEAN",
+            "TOKEN_INPUT_OK",
+            "FHIR_VALID_EXTRACTOR",
+        ]
+        assert merge_flags(None, ["A", "A"]) == ["A"]
+
+    @pytest.mark.asyncio
+    async def test_retries_do_not_duplicate_flags(
+        self,
+        mock_anthropic,
+        mock_audit_writer,
+        mock_sidecar_client,
+        settings,
+        sample_extracted_data,
+        sample_triage_decision,
+        sample_sentinel_response,
+    ):
+        from src.services.sidecar_client import SidecarValidationResult
+
+        mock_anthropic.complete.side_effect = [
+            mock_anthropic._make_response(
+                {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+            ),
+            mock_anthropic._make_response(sample_extracted_data),
+            mock_anthropic._make_response(sample_extracted_data),
+            mock_anthropic._make_response(sample_triage_decision),
+            mock_anthropic._make_response(sample_sentinel_response),
+        ]
+        rejected_once = False
+
+        def _validate(content, **kwargs):
+            nonlocal rejected_once
+            if kwargs["validation_type"] == "output" and not rejected_once:
+                rejected_once = True
+                return SidecarValidationResult(
+                    {
+                        "validated": False,
+                        "content": content,
+                        "compliance_flags": ["PII_CLEAN", "FHIR_INVALID_EXTRACTOR"],
+                        "errors": ["vitals: required"],
+                        "should_retry": True,
+                    }
+                )
+            return mock_sidecar_client._make_result(content)
+
+        mock_sidecar_client.validate.side_effect = _validate
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+            sidecar_client=mock_sidecar_client,
+        )
+
+        result = await pipeline.ainvoke(_build_base_state("45-year-old with cough"))
+
+        flags = result["compliance_flags"]
+        assert len(flags) == len(set(flags))
+        assert "FHIR_INVALID_EXTRACTOR" in flags
+        assert [e["node"] for e in result["audit_trail"]] == ["extractor", "reasoner", "sentinel"]
+        for call in mock_audit_writer.write_node_audit.call_args_list:
+            audited = call.kwargs["compliance_flags"]
+            assert len(audited) == len(set(audited))
@@ -231,3 +231,45 @@ class TestPipelineWithRAG:
 
         # LLM called 4 times (classifier + extractor + reasoner + sentinel)
         assert mock_anthropic.complete.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_parallel_retrieval_queries_raw_input(
+        self,
+        mock_anthropic,
+        mock_audit_writer,
+        mock_embedding_service,
+        mock_protocol_store,
+        settings,
+        sample_extracted_data,
+        sample_triage_decision,
+        sample_sentinel_response,
+    ):
+        """With rag_parallel_retrieval, RAG embeds the scanned encounter text and joins at the reasoner."""
+        mock_anthropic.complete.side_effect = [
+            mock_anthropic._make_response(
+                {"category": "symptom_assessment", "confidence": 0.88, "reason": "Cough"}
+            ),
+            mock_anthropic._make_response(sample_extracted_data),
+            mock_anthropic._make_response(sample_triage_decision),
+            mock_anthropic._make_response(sample_sentinel_response),
+        ]
+        settings.rag_parallel_retrieval = True
+
+        pipeline = build_pipeline(
+            anthropic_client=mock_anthropic,
+            audit_writer=mock_audit_writer,
+            classifier=ClinicalClassifier(mock_anthropic, "claude-haiku-4-5-20241022"),
+            router=ModelRouter(min_confidence=0.70),
+            settings=settings,
+            protocol_store=mock_protocol_store,
+            embedding_service=mock_embedding_service,
+        )
+
+        result = await pipeline.ainvoke(_build_base_state("45-year-old with cough for 3 days"))
+
+        mock_embedding_service.embed.assert_called_once_with("45-year-old with cough for 3 days")
+        assert len(result["rag_context"]) == 2
+        reasoner_call = mock_anthropic.complete.call_args_list[2].kwargs
+        assert "Respiratory Infection Protocol" in reasoner_call["cached_prefix"]
+        assert "similarity" not in reasoner_call["cached_prefix"]
+        assert result["triage_decision"]["level"] == "Semi-Urgent"
@@ -0,0 +1,124 @@
+"""Tests for the critical-keyword lexicon engine and its use in ModelRouter."""
+
+import json
+
+import pytest
+
+from src.routing.lexicon import KeywordLexicon
+from src.routing.router import ModelRouter
+
+
+@pytest.fixture
+def lexicon():
+    return KeywordLexicon.load()
+
+
+class TestMatching:
+    def test_reports_span_and_term(self, lexicon):
+        text = "Pt reports CHEST   PAIN since 6am"
+        [match] = lexicon.scan(text)
+        assert match.term == "chest pain"
+        assert text[match.start : match.end] == "CHEST   PAIN"
+        assert match.negated is False
+
+    def test_whole_words_only(self, lexicon):
+        assert lexicon.scan("hx of traumatic injury, heatstroke risk") == []
+
+    def test_plural(self, lexicon):
+        assert [m.term for m in lexicon.scan("two seizures overnight")] == ["seizure"]
+
+    def test_term_after_partial_word_match(self, lexicon):
+        assert [m.start for m in lexicon.scan("xstroke stroke")] == [8]
+
+
+class TestNegation:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Patient denies chest pain.",
+            "No chest pain or dyspnea",
+            "negative for sepsis",
+            "Denies any recent chest pain",
+            "No history of stroke",
+        ],
+    )
+    def test_negated(self, lexicon, text):
+        assert lexicon.critical_matches(text) == []
+        assert lexicon.scan(text)[0].negated is True
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "No fever but chest pain",  # terminator ends the negation
+            "Denies fever. Chest pain since morning",  # new clause
+            "No improvement in chest pain",  # pseudo-negation
+            "no history of cough, smoking, weight loss, or recent travel; now stroke symptoms",
+            # Scope ends at commas, conjunctions and reporting verbs
+            "Denies fever, reports severe bleeding",
+            "No PMH, c/o chest pain",
+            "no known allergies, stroke symptoms",
+            "denies fever and chest pain",
+            "No fever reports chest pain",
+            # The cue governs its own object, not a later term
+            "Pt without insurance had cardiac arrest",
+        ],
+    )
+    def test_not_negated(self, lexicon, text):
+        assert len(lexicon.critical_matches(text)) == 1
+
+    def test_window_is_bounded(self):
+        lexicon = KeywordLexicon(["chest pain"], negation_cues=["no"], negation_window=3)
+        assert lexicon.critical_matches("no fever or cough and chest pain") != []
+
+    def test_modifiers_between_cue_and_term_are_bounded(self):
+        lexicon = KeywordLexicon(
+            ["chest pain"], negation_cues=["no"], negation_modifiers=["any", "recent"], negation_window=1
+        )
+        assert lexicon.critical_matches("no recent chest pain") == []
+        assert lexicon.critical_matches("no any recent chest pain") != []
+
+    def test_non_negatable_term(self):
+        lexicon = KeywordLexicon(["suicidal"], negation_cues=["denies"], non_negatable={"suicidal"})
+        assert lexicon.critical_matches("denies suicidal ideation") != []
+
+
+class TestSiteLexicon:
+    def test_load_site_file(self, tmp_path):
+        path = tmp_path / "lexicon.json"
+        path.write_text(json.dumps({"terms": ["aortic dissection", {"term": "overdose", "negatable": False}]}))
+        router = ModelRouter(lexicon=KeywordLexicon.load(path))
+
+        result = router.route("Concern for aortic dissection", {"category": "routine_vitals", "confidence": 0.99})
+        assert result["safety_override"] is True
+        # Bundled terms no longer apply
+        result = router.route("Chest pain", {"category": "routine_vitals", "confidence": 0.99})
+        assert result["safety_override"] is False
+
+
+class TestRouterOverride:
+    def test_negated_keyword_does_not_escalate(self):
+        result = ModelRouter().route(
+            "Routine follow-up. Patient denies chest pain.", {"category": "routine_vitals", "confidence": 0.95}
+        )
+        assert result["safety_override"] is False
+        assert result["selected_model"] == "claude-haiku-4-5-20241022"
+        assert result["safety_matches"] == [{"term": "chest pain", "start": 34, "end": 44, "negated": True}]
+
+    def test_override_records_spans(self):
+        result = ModelRouter().route("Witnessed seizure", {"category": "routine_vitals", "confidence": 0.95})
+        assert result["safety_override"] is True
+        assert result["safety_matches"] == [{"term": "seizure", "start": 10, "end": 17, "negated": False}]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Denies fever, reports severe bleeding",
+            "No PMH, c/o chest pain",
+            "no known allergies, stroke symptoms",
+            "Pt without insurance had cardiac arrest",
+        ],
+    )
+    def test_mention_outside_negation_scope_escalates(self, text):
+        result = ModelRouter().route(text, {"category": "routine_vitals", "confidence": 0.95})
+        assert result["safety_override"] is True
+        assert result["selected_model"] == "claude-opus-4-6-20250929"
@@ -0,0 +1,111 @@
+"""Tests for the in-process classifier and ClinicalClassifier's local fast path."""
+
+import json
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from src.routing.classifier import ClinicalClassifier
+from src.routing.local_classifier import LOAD_ERRORS, LocalClassifier, category_thresholds, train
+from src.routing.router import ModelRouter
+
+CATEGORIES = ["routine_vitals", "medication_review"]
+TEXTS = [
+    "annual checkup blood pressure normal vitals stable",
+    "routine vitals recorded pulse and temperature normal",
+    "review of current medications dose adjustment of metformin",
+    "medication reconciliation lisinopril dose review",
+] * 10
+LABELS = ["routine_vitals", "routine_vitals", "medication_review", "medication_review"] * 10
+
+
+@pytest.fixture(scope="module")
+def model() -> LocalClassifier:
+    weights, bias = train(TEXTS, LABELS, CATEGORIES, dim=2**10, epochs=50)
+    return LocalClassifier(CATEGORIES, weights, bias, temperature=1.0, thresholds=np.array([0.6, np.inf]))
+
+
+class TestLocalClassifier:
+    def test_learns_separable_categories(self, model):
+        category, confidence, _ = model.predict("vitals normal at routine checkup")
+        assert category == "routine_vitals"
+        assert confidence > 0.6
+
+    def test_bar_is_per_category(self, model):
+        assert model.predict("blood pressure normal vitals stable")[2] is True
+        # medication_review's bar is inf — never answered locally
+        category, _, confident = model.predict("metformin dose review")
+        assert category == "medication_review"
+        assert confident is False
+
+    def test_save_and_load_round_trip(self, model, tmp_path):
+        path = tmp_path / "model.npz"
+        model.save(path)
+        loaded = LocalClassifier.load(path)
+        assert loaded.categories == CATEGORIES
+        assert loaded.predict("routine vitals") == model.predict("routine vitals")
+
+    @pytest.mark.parametrize("damage", ["truncated", "garbage", "missing_key", "npy", "missing_file"])
+    def test_unusable_model_file_raises_load_error(self, model, tmp_path, damage):
+        path = tmp_path / "model.npz"
+        model.save(path)
+        if damage == "truncated":
+            path.write_bytes(path.read_bytes()[:200])
+        elif damage == "garbage":
+            path.write_bytes(b"not a model at all")
+        elif damage == "missing_key":
+            with np.load(path) as data:
+                arrays = {k: data[k] for k in data.files if k != "thresholds"}
+            np.savez(path, **arrays)
+        elif damage == "npy":
+            with path.open("wb") as f:
+                np.save(f, model.weights)
+        else:
+            path.unlink()
+
+        with pytest.raises(LOAD_ERRORS):
+            LocalClassifier.load(path)
+
+    def test_thresholds_meet_target_precision(self):
+        # Category 0: confident predictions correct, low-confidence ones wrong
+        probs = np.array([[0.95, 0.05]] * 20 + [[0.55, 0.45]] * 5)
+        labels = np.array([0] * 20 + [1] * 5)
+        thresholds = category_thresholds(probs, labels, target_precision=0.95, min_support=10)
+        assert thresholds[0] == pytest.approx(0.95)
+        assert np.isinf(thresholds[1])
+
+
+class TestClassifierFastPath:
+    @pytest.mark.asyncio
+    async def test_confident_local_prediction_skips_llm(self, model):
+        client = AsyncMock()
+        classifier = ClinicalClassifier(client, "haiku", local=model)
+
+        result = await classifier.classify("blood pressure normal vitals stable")
+
+        client.complete.assert_not_called()
+        assert result["category"] == "routine_vitals"
+        assert result["classifier_path"] == "local"
+        assert result["classifier_cost"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_defers_to_llm_below_bar(self, model):
+        client = AsyncMock()
+        client.complete.return_value = {
+            "content": json.dumps({"category": "medication_review", "confidence": 0.9, "reason": "meds"}),
+            "tokens": {"in": 50, "out": 10},
+            "cost_usd": 0.0001,
+        }
+        classifier = ClinicalClassifier(client, "haiku", local=model)
+
+        result = await classifier.classify("metformin dose review")
+
+        client.complete.assert_called_once()
+        assert result["classifier_path"] == "llm"
+
+    def test_router_records_path(self):
+        routing = ModelRouter().route(
+            "Normal checkup", {"category": "routine_vitals", "confidence": 0.95, "classifier_path": "local"}
+        )
+        assert routing["classifier_path"] == "local"
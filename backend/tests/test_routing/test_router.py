@@ -3,9 +3,13 @@
 import pytest
 
 from src.routing.router import (
+    CATEGORY_PRIORITY,
     CATEGORY_ROUTING,
     CRITICAL_KEYWORDS,
     MODEL_TIERS,
+    PRIORITY_EMERGENCY,
+    PRIORITY_ROUTINE,
+    UNCLASSIFIED,
     ModelRouter,
 )
 
@@ -225,3 +229,71 @@ class TestRoutingTableCoverage:
         assert len(CRITICAL_KEYWORDS) > 0
         assert "chest pain" in CRITICAL_KEYWORDS
         assert "stroke" in CRITICAL_KEYWORDS
+
+
+class TestSlotPriority:
+    """Acuity priority for LLM concurrency slots (0 = most urgent)."""
+
+    def test_every_category_has_a_priority(self):
+        assert set(CATEGORY_PRIORITY) == set(CATEGORY_ROUTING)
+
+    def test_critical_keyword_is_emergency(self, router):
+        result = router.route("Sudden chest pain", {"category": "routine_vitals", "confidence": 0.99})
+        assert result["priority"] == PRIORITY_EMERGENCY
+
+    def test_routine_category_is_lowest(self, router):
+        result = router.route("BP check", {"category": "routine_vitals", "confidence": 0.95})
+        assert result["priority"] == PRIORITY_ROUTINE
+
+    def test_safety_override_before_classification(self, router):
+        override = router.safety_override("patient unconscious")
+        assert override["priority"] == PRIORITY_EMERGENCY
+        assert override["selected_model"] == "claude-opus-4-6-20250929"
+        assert override["category"] == UNCLASSIFIED
+        assert router.safety_override("mild rash") is None
+        assert router.safety_override("denies chest pain") is None
+
+
+class _Health:
+    """Stand-in health view: the listed models are degraded."""
+
+    def __init__(self, *degraded: str) -> None:
+        self._degraded = set(degraded)
+
+    def degradation(self, model: str) -> str | None:
+        return "50% failed calls" if model in self._degraded else None
+
+
+HAIKU, SONNET, OPUS = MODEL_TIERS
+
+
+class TestHealthSteering:
+    def test_degraded_tier_steers_up_with_reason(self):
+        router = ModelRouter(health=_Health(SONNET))
+        result = router.route("Cough", {"category": "symptom_assessment", "confidence": 0.9})
+        assert result["selected_model"] == OPUS
+        assert result["escalation_reason"] == f"{SONNET} degraded (50% failed calls); steered to {OPUS}"
+
+    def test_never_below_category_floor(self):
+        # Haiku is healthy, but symptom_assessment's floor is Sonnet
+        router = ModelRouter(health=_Health(SONNET, OPUS))
+        result = router.route("Cough", {"category": "symptom_assessment", "confidence": 0.9})
+        assert result["selected_model"] == SONNET
+        assert result["escalation_reason"] is None
+
+    def test_skips_degraded_intermediate_tier(self):
+        router = ModelRouter(health=_Health(HAIKU, SONNET))
+        result = router.route("BP check", {"category": "routine_vitals", "confidence": 0.95})
+        assert result["selected_model"] == OPUS
+
+    def test_appends_to_confidence_escalation(self):
+        router = ModelRouter(health=_Health(SONNET))
+        result = router.route("BP check", {"category": "routine_vitals", "confidence": 0.5})
+        assert result["selected_model"] == OPUS
+        assert result["escalation_reason"].startswith("Confidence 0.50 below threshold 0.65; ")
+
+    def test_healthy_tiers_unchanged(self):
+        router = ModelRouter(health=_Health())
+        result = router.route("BP check", {"category": "routine_vitals", "confidence": 0.95})
+        assert result["selected_model"] == HAIKU
+        assert result["escalation_reason"] is None
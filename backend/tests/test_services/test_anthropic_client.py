@@ -0,0 +1,534 @@
+"""Tests for AnthropicClient prompt caching, JSON streaming, cassettes, latency tracking and hedging."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import anthropic
+import httpx
+import pytest
+
+from src.config import Settings
+from src.services.anthropic_client import AnthropicClient, ModelLatencyTracker, PromptTooLarge, token_cost_usd
+from src.services.llm_cassette import CassetteMiss
+
+MODEL = "claude-sonnet-4-5-20250929"
+
+
+def _fake_response(
+    text: str = '{"ok": true}',
+    input_tokens: int = 1000,
+    output_tokens: int = 100,
+    cache_read: int = 0,
+    cache_write: int = 0,
+):
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_read_input_tokens=cache_read,
+            cache_creation_input_tokens=cache_write,
+        ),
+        stop_reason="end_turn",
+    )
+
+
+class _FakeStream:
+    """Stand-in for the SDK's AsyncMessageStream: yields text events in chunks."""
+
+    event_type = "text"
+
+    def __init__(self, chunks: list[str], output_tokens: int = 100):
+        self._chunks = chunks
+        self.consumed: list[str] = []
+        self.closed = False
+        self.current_message_snapshot = _fake_response(text="".join(chunks), output_tokens=1)
+        self._final_output_tokens = output_tokens
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            self.consumed.append(chunk)
+            if self.event_type == "input_json":
+                yield SimpleNamespace(type="input_json", partial_json=chunk)
+            else:
+                yield SimpleNamespace(type="text", text=chunk)
+        self.current_message_snapshot.usage.output_tokens = self._final_output_tokens
+
+
+class _FakeToolStream(_FakeStream):
+    """Yields a forced tool call's input as input_json events."""
+
+    event_type = "input_json"
+
+    def __init__(self, chunks: list[str], tool_use_id: str = "toolu_01", output_tokens: int = 100):
+        super().__init__(chunks, output_tokens)
+        self.current_message_snapshot.content = [SimpleNamespace(type="tool_use", id=tool_use_id, input={})]
+
+
+def _client(**overrides) -> AnthropicClient:
+    settings = Settings(anthropic_api_key="test-key", env="test", **overrides)
+    return AnthropicClient(settings)
+
+
+def _prime(client: AnthropicClient, latency_ms: int = 10, samples: int = 20) -> None:
+    for _ in range(samples):
+        client.latency.record(MODEL, latency_ms)
+
+
+class TestPromptCaching:
+    @pytest.mark.asyncio
+    async def test_system_prompt_and_prefix_get_breakpoints(self):
+        client = _client()
+
+        with patch.object(
+            client._client.messages, "create", new_callable=AsyncMock, return_value=_fake_response()
+        ) as create:
+            await client.complete(MODEL, "sys", "msg", cached_prefix="protocols")
+
+        request = create.call_args.kwargs
+        assert request["system"] == [
+            {"type": "text", "text": "sys", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert request["messages"][0]["content"] == [
+            {"type": "text", "text": "protocols", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "msg"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_disabled_sends_plain_strings(self):
+        client = _client(llm_prompt_caching_enabled=False)
+
+        with patch.object(
+            client._client.messages, "create", new_callable=AsyncMock, return_value=_fake_response()
+        ) as create:
+            await client.complete(MODEL, "sys", "msg")
+
+        request = create.call_args.kwargs
+        assert request["system"] == "sys"
+        assert request["messages"][0]["content"] == "msg"
+
+    @pytest.mark.asyncio
+    async def test_cache_tokens_reported_and_priced(self):
+        client = _client()
+        response = _fake_response(input_tokens=200, output_tokens=100, cache_read=2000, cache_write=1000)
+
+        with patch.object(
+            client._client.messages, "create", new_callable=AsyncMock, return_value=response
+        ):
+            result = await client.complete(MODEL, "sys", "msg")
+
+        assert result["tokens"] == {"in": 200, "out": 100, "cache_read": 2000, "cache_write": 1000}
+        # $3/M input, $15/M output; reads at 0.1x, writes at 1.25x
+        expected = (200 * 3 + 2000 * 0.3 + 1000 * 3.75 + 100 * 15) / 1_000_000
+        assert result["cost_usd"] == pytest.approx(expected)
+
+    def test_token_cost_without_cache_fields(self):
+        assert token_cost_usd(MODEL, {"in": 1000, "out": 100}) == pytest.approx(0.0045)
+
+
+class TestJSONStreaming:
+    @pytest.mark.asyncio
+    async def test_returns_as_soon_as_object_closes(self):
+        client = _client()
+        stream = _FakeStream(['```json\n{"level": ', '"Urgent",}', "\n```\nHope this helps", " more prose"])
+
+        with patch.object(client._client.messages, "stream", return_value=stream):
+            result = await client.complete(MODEL, "sys", "msg", json_output=True)
+
+        assert json.loads(result["content"]) == {"level": "Urgent"}
+        assert result["stop_reason"] == "json_complete"
+        assert len(stream.consumed) == 2
+        assert stream.closed
+        # Final usage never arrived — estimated from the streamed characters
+        assert result["tokens"]["out"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_structure_aborts_stream(self):
+        client = _client()
+        stream = _FakeStream(['{"a": [1}', "never read"])
+
+        with patch.object(client._client.messages, "stream", return_value=stream):
+            result = await client.complete(MODEL, "sys", "msg", json_output=True)
+
+        assert result["stop_reason"] == "json_invalid"
+        assert result["content"] == '{"a": [1}'
+        assert stream.consumed == ['{"a": [1}']
+
+    @pytest.mark.asyncio
+    async def test_streaming_disabled_still_normalizes(self):
+        client = _client(llm_streaming_enabled=False)
+        response = _fake_response(text='Sure!\n```json\n{"ok": true}\n```')
+
+        with patch.object(
+            client._client.messages, "create", new_callable=AsyncMock, return_value=response
+        ):
+            result = await client.complete(MODEL, "sys", "msg", json_output=True)
+
+        assert result["content"] == '{"ok": true}'
+        assert result["stop_reason"] == "end_turn"
+
+
+class TestOutputTools:
+    TOOL = {"name": "record_reasoner_output", "description": "d", "input_schema": {"type": "object"}}
+
+    @pytest.mark.asyncio
+    async def test_tool_call_is_forced_and_returned_as_json(self):
+        client = _client(llm_streaming_enabled=False)
+        response = _fake_response()
+        response.content = [
+            SimpleNamespace(type="tool_use", id="toolu_01", input={"level": "Urgent"})
+        ]
+
+        with patch.object(
+            client._client.messages, "create", new_callable=AsyncMock, return_value=response
+        ) as create:
+            result = await client.complete(MODEL, "sys", "msg", output_tool=self.TOOL)
+
+        request = create.call_args.kwargs
+        assert request["tools"] == [self.TOOL]
+        assert request["tool_choice"] == {"type": "tool", "name": "record_reasoner_output"}
+        assert json.loads(result["content"]) == {"level": "Urgent"}
+        assert result["tool_use_id"] == "toolu_01"
+
+    @pytest.mark.asyncio
+    async def test_repair_appends_tool_result_turn(self):
+        client = _client(llm_streaming_enabled=False)
+        response = _fake_response()
+        response.content = [SimpleNamespace(type="tool_use", id="toolu_02", input={})]
+        repair = {"tool_use_id": "toolu_01", "content": '{"level": "Bad"}', "errors": ["level: not in enum"]}
+
+        with patch.object(
+            client._client.messages, "create", new_callable=AsyncMock, return_value=response
+        ) as create:
+            await client.complete(MODEL, "sys", "msg", output_tool=self.TOOL, repair=repair)
+
+        messages = create.call_args.kwargs["messages"]
+        assert [m["role"] for m in messages] == ["user", "assistant", "user"]
+        assert messages[1]["content"][0]["input"] == {"level": "Bad"}
+        tool_result = messages[2]["content"][0]
+        assert tool_result["tool_use_id"] == "toolu_01"
+        assert tool_result["is_error"] is True
+        assert "level: not in enum" in tool_result["content"]
+
+
+    @pytest.mark.asyncio
+    async def test_tool_input_is_streamed(self):
+        client = _client()
+        stream = _FakeToolStream(['{"level": ', '"Urgent"}', "never read"], tool_use_id="toolu_03")
+
+        with patch.object(client._client.messages, "stream", return_value=stream) as open_stream:
+            result = await client.complete(MODEL, "sys", "msg", output_tool=self.TOOL)
+
+        assert open_stream.call_args.kwargs["tool_choice"] == {"type": "tool", "name": "record_reasoner_output"}
+        assert json.loads(result["content"]) == {"level": "Urgent"}
+        assert result["tool_use_id"] == "toolu_03"
+        assert result["stop_reason"] == "json_complete"
+        assert len(stream.consumed) == 2
+
+class TestInputBudget:
+    @pytest.mark.asyncio
+    async def test_oversized_prompt_is_rejected_before_sending(self):
+        client = _client(llm_max_input_tokens=100)
+
+        with patch.object(client._client.messages, "create", new_callable=AsyncMock) as create:
+            with pytest.raises(PromptTooLarge) as exc_info:
+                await client.complete(MODEL, "sys", "word " * 500)
+
+        create.assert_not_called()
+        assert exc_info.value.estimated_tokens > 100
+
+    @pytest.mark.asyncio
+    async def test_estimate_is_calibrated_from_usage(self):
+        client = _client()
+
+        with patch.object(
+            client._client.messages, "create", new_callable=AsyncMock, return_value=_fake_response(input_tokens=1000)
+        ):
+            await client.complete(MODEL, "sys", "word " * 100)
+
+        # ~101 estimated vs 1000 reported — ratio clamped at the 2.0 bound
+        assert client.token_calibration.ratio(MODEL) == 2.0
+
+
+class TestCassette:
+    @pytest.mark.asyncio
+    async def test_replay_returns_recording_without_calling_api(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        recorder = _client(llm_cassette_mode="record", llm_cassette_path=str(path))
+        with patch.object(
+            recorder._client.messages, "create", new_callable=AsyncMock, return_value=_fake_response('{"a": 1}')
+        ):
+            recorded = await recorder.complete(MODEL, "sys", "msg", cached_prefix="protocols")
+
+        # Replay with prompt caching off still matches the recording
+        player = _client(
+            llm_cassette_mode="replay", llm_cassette_path=str(path), llm_prompt_caching_enabled=False
+        )
+        with patch.object(player._client.messages, "create", new_callable=AsyncMock) as create:
+            replayed = await player.complete(MODEL, "sys", "msg", cached_prefix="protocols")
+
+        create.assert_not_called()
+        assert replayed["content"] == recorded["content"]
+        assert replayed["tokens"] == recorded["tokens"]
+        assert replayed["cost_usd"] == recorded["cost_usd"]
+
+    @pytest.mark.asyncio
+    async def test_unrecorded_request_raises(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        path.write_text("")
+        player = _client(llm_cassette_mode="replay", llm_cassette_path=str(path))
+
+        with pytest.raises(CassetteMiss):
+            await player.complete(MODEL, "sys", "never recorded")
+
+    @pytest.mark.asyncio
+    async def test_synthetic_latency_from_recorded_durations(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        recorder = _client(llm_cassette_mode="record", llm_cassette_path=str(path))
+        with patch.object(
+            recorder._client.messages, "create", new_callable=AsyncMock, return_value=_fake_response()
+        ):
+            await recorder.complete(MODEL, "sys", "msg")
+        entry = json.loads(path.read_text())
+        entry["duration_ms"] = 100
+        path.write_text(json.dumps(entry) + "\n")
+
+        player = _client(
+            llm_cassette_mode="replay", llm_cassette_path=str(path), llm_cassette_latency_scale=0.5
+        )
+        result = await player.complete(MODEL, "sys", "msg")
+
+        assert 50 <= result["duration_ms"] < 100
+
+
+class TestModelHealth:
+    @pytest.mark.asyncio
+    async def test_outcomes_feed_health_view(self):
+        client = _client()
+        overloaded = anthropic.APIStatusError(
+            "overloaded",
+            response=httpx.Response(529, request=httpx.Request("POST", "https://api.anthropic.com")),
+            body=None,
+        )
+        with patch.object(
+            client._client.messages, "create", new_callable=AsyncMock, side_effect=[_fake_response(), overloaded]
+        ):
+            await client.complete(MODEL, "sys", "msg")
+            with pytest.raises(anthropic.APIStatusError):
+                await client.complete(MODEL, "sys", "msg")
+
+        health = client.health.snapshot(MODEL)
+        assert health.samples == 2
+        assert health.overload_rate == 0.5
+
+
+    @pytest.mark.asyncio
+    async def test_deadline_capped_timeouts_leave_model_healthy(self):
+        client = _client(llm_health_min_samples=3)
+        timed_out = anthropic.APITimeoutError(request=httpx.Request("POST", "https://api.anthropic.com"))
+        with patch.object(client._client.messages, "create", new_callable=AsyncMock, side_effect=timed_out):
+            for _ in range(5):
+                with pytest.raises(anthropic.APITimeoutError):
+                    await client.complete(MODEL, "sys", "msg", timeout=0.8)
+
+        assert client.health.snapshot(MODEL).samples == 0
+        assert client.health.degradation(MODEL) is None
+
+class TestSlotAndQuotaOrdering:
+    @pytest.mark.asyncio
+    async def test_quota_starved_call_does_not_block_other_models(self):
+        from src.routing.router import PRIORITY_EMERGENCY, PRIORITY_ROUTINE
+
+        other_model = "claude-opus-4-6-20250929"
+        client = _client(
+            llm_max_concurrency=1, llm_rate_limits={MODEL: {"rpm": 1}}, llm_quota_max_wait_ms=120_000
+        )
+        client.quota.try_acquire(MODEL, 0, 0)  # this minute's only request to MODEL is spent
+
+        with patch.object(
+            client._client.messages, "create", new_callable=AsyncMock, return_value=_fake_response()
+        ):
+            starved = asyncio.create_task(client.complete(MODEL, "sys", "msg", priority=PRIORITY_ROUTINE))
+            await asyncio.sleep(0.01)
+            try:
+                result = await asyncio.wait_for(
+                    client.complete(other_model, "sys", "msg", priority=PRIORITY_EMERGENCY), timeout=1.0
+                )
+            finally:
+                starved.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await starved
+
+        assert result["model"] == other_model
+        assert result["queue_wait_ms"] < 100
+        assert client.slots.stats()["in_flight"] == 0
+
+class TestModelLatencyTracker:
+    def test_percentile(self):
+        tracker = ModelLatencyTracker()
+        for ms in range(1, 101):
+            tracker.record(MODEL, ms)
+        assert tracker.percentile(MODEL, 0.5) == 50.0
+        assert tracker.percentile(MODEL, 0.95) == 95.0
+        assert tracker.sample_count(MODEL) == 100
+
+    def test_unknown_model(self):
+        assert ModelLatencyTracker().percentile("nope", 0.95) is None
+
+    def test_window_is_bounded(self):
+        tracker = ModelLatencyTracker(window=5)
+        for ms in range(10):
+            tracker.record(MODEL, ms)
+        assert tracker.sample_count(MODEL) == 5
+
+
+class TestHedging:
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        client = _client()
+        _prime(client)
+        calls = 0
+
+        async def create(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return _fake_response()
+
+        with patch.object(client._client.messages, "create", side_effect=create):
+            result = await client.complete(MODEL, "sys", "msg")
+
+        assert calls == 1
+        assert result["hedged"] is False
+        assert result["hedge_cost_usd"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_hedge_wins(self):
+        client = _client(llm_hedging_enabled=True, llm_hedge_max_rate=1.0)
+        _prime(client, latency_ms=10)
+        delays = iter([1.0, 0.0])
+        cancelled = []
+
+        async def create(**kwargs):
+            delay = next(delays)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append(delay)
+                raise
+            return _fake_response(text=f"delay={delay}")
+
+        with patch.object(client._client.messages, "create", side_effect=create), patch(
+            "src.services.anthropic_client.record_llm_hedge"
+        ) as record_hedge:
+            result = await client.complete(MODEL, "sys", "msg")
+            await asyncio.sleep(0)  # let the loser observe its cancellation
+
+        assert result["content"] == "delay=0.0"
+        assert result["hedged"] is True
+        # Duplicate billed at least for its 1000 prompt tokens at $3/M
+        assert result["hedge_cost_usd"] == pytest.approx(0.003)
+        assert cancelled == [1.0]
+        record_hedge.assert_called_once_with(model=MODEL, winner="hedge", hedge_cost_usd=0.003)
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        client = _client(llm_hedging_enabled=True, llm_hedge_max_rate=1.0)
+        _prime(client, latency_ms=500)
+        calls = 0
+
+        async def create(**kwargs):
+            nonlocal calls
+            calls += 1
+            return _fake_response()
+
+        with patch.object(client._client.messages, "create", side_effect=create):
+            result = await client.complete(MODEL, "sys", "msg")
+
+        assert calls == 1
+        assert result["hedged"] is False
+
+    @pytest.mark.asyncio
+    async def test_hedge_rate_cap(self):
+        client = _client(llm_hedging_enabled=True, llm_hedge_max_rate=0.0)
+        _prime(client, latency_ms=1)
+        calls = 0
+
+        async def create(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return _fake_response()
+
+        with patch.object(client._client.messages, "create", side_effect=create):
+            result = await client.complete(MODEL, "sys", "msg")
+
+        assert calls == 1
+        assert result["hedged"] is False
+
+    @pytest.mark.asyncio
+    async def test_hedge_skipped_without_free_slot(self):
+        client = _client(llm_hedging_enabled=True, llm_hedge_max_rate=1.0, llm_max_concurrency=1)
+        _prime(client, latency_ms=1)
+        calls = 0
+
+        async def create(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return _fake_response()
+
+        with patch.object(client._client.messages, "create", side_effect=create):
+            result = await client.complete(MODEL, "sys", "msg")
+
+        # The primary holds the only slot, so no duplicate is sent
+        assert calls == 1
+        assert result["hedged"] is False
+
+    @pytest.mark.asyncio
+    async def test_hedge_slot_is_released(self):
+        client = _client(llm_hedging_enabled=True, llm_hedge_max_rate=1.0, llm_max_concurrency=2)
+        _prime(client, latency_ms=10)
+        delays = iter([1.0, 0.0])
+
+        async def create(**kwargs):
+            await asyncio.sleep(next(delays))
+            return _fake_response()
+
+        with patch.object(client._client.messages, "create", side_effect=create), patch(
+            "src.services.anthropic_client.record_llm_hedge"
+        ):
+            result = await client.complete(MODEL, "sys", "msg")
+
+        assert result["hedged"] is True
+        assert client.slots.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_falls_back_to_hedge(self):
+        client = _client(llm_hedging_enabled=True, llm_hedge_max_rate=1.0)
+        _prime(client, latency_ms=10)
+        attempts = iter(["fail_late", "ok"])
+
+        async def create(**kwargs):
+            kind = next(attempts)
+            if kind == "fail_late":
+                await asyncio.sleep(0.05)
+                raise RuntimeError("overloaded")
+            await asyncio.sleep(0.1)
+            return _fake_response(text="from hedge")
+
+        with patch.object(client._client.messages, "create", side_effect=create), patch(
+            "src.services.anthropic_client.record_llm_hedge"
+        ):
+            result = await client.complete(MODEL, "sys", "msg")
+
+        assert result["content"] == "from hedge"
+        assert result["hedged"] is True
@@ -0,0 +1,61 @@
+"""Tests for the tolerant incremental LLM JSON parser."""
+
+import json
+
+import pytest
+
+from src.services.llm_json import (
+    MAX_PREAMBLE_CHARS,
+    IncrementalJSONParser,
+    LLMJSONError,
+    parse_llm_json,
+)
+
+
+class TestParseLLMJSON:
+    def test_plain_object(self):
+        assert parse_llm_json('{"level": "Urgent", "confidence": 0.8}') == {
+            "level": "Urgent",
+            "confidence": 0.8,
+        }
+
+    def test_code_fence_and_prose(self):
+        text = 'Here is the result:\n```json\n{"category": "pediatric"}\n```\nLet me know!'
+        assert parse_llm_json(text) == {"category": "pediatric"}
+
+    def test_trailing_commas_repaired(self):
+        text = '{"actions": ["a", "b",], "notes": "x, }",}'
+        assert parse_llm_json(text) == {"actions": ["a", "b"], "notes": "x, }"}
+
+    def test_braces_inside_strings(self):
+        assert parse_llm_json('{"s": "a } ] { [ \\" b"}') == {"s": 'a } ] { [ " b'}
+
+    def test_raw_newline_in_string(self):
+        assert parse_llm_json('{"s": "line1\nline2"}') == {"s": "line1\nline2"}
+
+    def test_truncated_output_raises(self):
+        with pytest.raises(LLMJSONError):
+            parse_llm_json('{"level": "Urgent", "confidence"')
+
+    def test_is_a_json_decode_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            parse_llm_json("I cannot help with that.")
+
+
+class TestIncrementalJSONParser:
+    def test_completes_when_object_closes(self):
+        parser = IncrementalJSONParser()
+        assert parser.feed('```json\n{"a": {"b"') is False
+        assert parser.feed(': [1, 2]}') is False
+        assert parser.feed('}\n```') is True
+        assert parser.result() == {"a": {"b": [1, 2]}}
+
+    def test_mismatched_bracket_aborts_early(self):
+        parser = IncrementalJSONParser()
+        with pytest.raises(LLMJSONError, match="Mismatched"):
+            parser.feed('{"a": [1, 2}')
+
+    def test_missing_object_aborts_after_preamble(self):
+        parser = IncrementalJSONParser()
+        with pytest.raises(LLMJSONError, match="No JSON value"):
+            parser.feed("x" * (MAX_PREAMBLE_CHARS + 1))
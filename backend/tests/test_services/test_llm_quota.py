@@ -0,0 +1,93 @@
+"""Tests for the per-model LLM quota scheduler."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.services.llm_quota import LLMQuotaExceeded, LLMQuotaScheduler, TokenBucket
+
+MODEL = "claude-sonnet-4-5-20250929"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _no_metrics():
+    with patch("src.services.llm_quota.record_llm_queue_wait") as record:
+        yield record
+
+
+class TestTokenBucket:
+    def test_refills_continuously(self):
+        clock = FakeClock()
+        bucket = TokenBucket(per_minute=60, clock=clock)
+        bucket.take(60)
+        assert bucket.wait_s(1) == pytest.approx(1.0)
+        clock.now = 0.5
+        assert bucket.wait_s(1) == pytest.approx(0.5)
+
+    def test_backlog_queues_in_order(self):
+        bucket = TokenBucket(per_minute=60, clock=FakeClock())
+        bucket.take(60)
+        bucket.take(1)  # first queued caller
+        assert bucket.wait_s(1) == pytest.approx(2.0)
+
+    def test_oversized_call_waits_for_full_bucket(self):
+        bucket = TokenBucket(per_minute=60, clock=FakeClock())
+        assert bucket.wait_s(500) == 0.0
+
+
+class TestLLMQuotaScheduler:
+    @pytest.mark.asyncio
+    async def test_unlimited_model_is_admitted(self):
+        scheduler = LLMQuotaScheduler({})
+        reservation = await scheduler.acquire(MODEL, 10_000, 4096)
+        assert reservation.wait_ms == 0
+
+    @pytest.mark.asyncio
+    async def test_waits_for_request_quota(self, _no_metrics):
+        scheduler = LLMQuotaScheduler({MODEL: {"rpm": 600}})  # one request per 100ms
+        for _ in range(600):
+            scheduler.try_acquire(MODEL, 0, 0)
+
+        start = time.monotonic()
+        reservation = await scheduler.acquire(MODEL, 0, 0)
+
+        assert 0.05 <= time.monotonic() - start < 0.5
+        assert 50 <= reservation.wait_ms <= 100
+        assert _no_metrics.call_args.args[2] == "admitted"
+
+    @pytest.mark.asyncio
+    async def test_fails_fast_past_deadline(self, _no_metrics):
+        scheduler = LLMQuotaScheduler({MODEL: {"otpm": 6000}})  # 100 tokens/s
+        await scheduler.acquire(MODEL, 0, 6000)
+
+        with pytest.raises(LLMQuotaExceeded) as exc_info:
+            await scheduler.acquire(MODEL, 0, 4096, deadline_at=time.time() + 1.0)
+
+        assert exc_info.value.wait_s == pytest.approx(40.96, rel=0.01)
+        assert _no_metrics.call_args.args[2] == "rejected"
+
+    @pytest.mark.asyncio
+    async def test_max_wait_caps_undeadlined_calls(self):
+        scheduler = LLMQuotaScheduler({MODEL: {"rpm": 1}}, max_wait_ms=100)
+        await scheduler.acquire(MODEL, 0, 0)
+        with pytest.raises(LLMQuotaExceeded):
+            await scheduler.acquire(MODEL, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_settle_refunds_unused_output_reservation(self):
+        scheduler = LLMQuotaScheduler({MODEL: {"otpm": 6000}})
+        reservation = await scheduler.acquire(MODEL, 0, 6000)
+        assert scheduler.try_acquire(MODEL, 0, 1000) is None
+
+        scheduler.settle(reservation, 0, 500)
+
+        assert scheduler.try_acquire(MODEL, 0, 1000) is not None
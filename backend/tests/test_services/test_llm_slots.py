@@ -0,0 +1,94 @@
+"""Tests for acuity-priority LLM slot scheduling."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.routing.router import PRIORITY_EMERGENCY, PRIORITY_ROUTINE
+from src.services.llm_slots import LLMSlotScheduler
+
+
+@pytest.fixture(autouse=True)
+def _no_metrics():
+    with patch("src.services.llm_slots.record_llm_slot_wait"):
+        yield
+
+
+async def _run(scheduler: LLMSlotScheduler, priority: int, order: list[str], name: str, hold: float = 0.01):
+    async with scheduler.slot(priority):
+        order.append(name)
+        await asyncio.sleep(hold)
+
+
+class TestLLMSlotScheduler:
+    @pytest.mark.asyncio
+    async def test_emergency_jumps_queued_routine_work(self):
+        scheduler = LLMSlotScheduler(max_concurrency=1, aging_s=60)
+        order: list[str] = []
+
+        blocker = asyncio.create_task(_run(scheduler, PRIORITY_ROUTINE, order, "running", hold=0.05))
+        await asyncio.sleep(0)
+        routine = [
+            asyncio.create_task(_run(scheduler, PRIORITY_ROUTINE, order, f"routine-{i}")) for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        emergency = asyncio.create_task(_run(scheduler, PRIORITY_EMERGENCY, order, "emergency"))
+        await asyncio.gather(blocker, *routine, emergency)
+
+        assert order == ["running", "emergency", "routine-0", "routine-1", "routine-2"]
+
+    @pytest.mark.asyncio
+    async def test_aging_prevents_starvation(self):
+        scheduler = LLMSlotScheduler(max_concurrency=1, aging_s=0.01)
+        order: list[str] = []
+
+        blocker = asyncio.create_task(_run(scheduler, PRIORITY_ROUTINE, order, "running", hold=0.1))
+        await asyncio.sleep(0)
+        routine = asyncio.create_task(_run(scheduler, PRIORITY_ROUTINE, order, "routine"))
+        # Routine has aged past three priority levels by the time emergency arrives
+        await asyncio.sleep(0.05)
+        emergency = asyncio.create_task(_run(scheduler, PRIORITY_EMERGENCY, order, "emergency"))
+        await asyncio.gather(blocker, routine, emergency)
+
+        assert order == ["running", "routine", "emergency"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        scheduler = LLMSlotScheduler(max_concurrency=1)
+        order: list[str] = []
+
+        blocker = asyncio.create_task(_run(scheduler, PRIORITY_ROUTINE, order, "running", hold=0.02))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_run(scheduler, PRIORITY_ROUTINE, order, "cancelled"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await blocker
+        await _run(scheduler, PRIORITY_ROUTINE, order, "after")
+
+        assert order == ["running", "after"]
+        assert scheduler.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_histogram_per_priority(self):
+        scheduler = LLMSlotScheduler(max_concurrency=2)
+        await _run(scheduler, PRIORITY_EMERGENCY, [], "a")
+        await _run(scheduler, PRIORITY_ROUTINE, [], "b")
+
+        histograms = scheduler.stats()["wait_histogram_ms"]
+        assert histograms[PRIORITY_EMERGENCY]["le_10"] == 1
+        assert histograms[PRIORITY_ROUTINE]["le_10"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unlimited_when_disabled(self):
+        scheduler = LLMSlotScheduler(max_concurrency=0)
+        async with scheduler.slot(PRIORITY_ROUTINE) as wait_ms:
+            assert wait_ms == 0
+
+    @pytest.mark.asyncio
+    async def test_try_acquire_never_queues(self):
+        scheduler = LLMSlotScheduler(max_concurrency=1)
+        assert scheduler.try_acquire() is True
+        assert scheduler.try_acquire() is False
+        scheduler.release()
+        assert scheduler.stats()["in_flight"] == 0
@@ -0,0 +1,98 @@
+"""Tests for the rolling per-model health view used by health-aware routing."""
+
+import anthropic
+import httpx
+import pytest
+
+from src.services.model_health import ModelHealthTracker, classify_failure
+
+MODEL = "claude-sonnet-4-5-20250929"
+
+
+def _status_error(status: int) -> anthropic.APIStatusError:
+    response = httpx.Response(status, request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"))
+    return anthropic.APIStatusError("error", response=response, body=None)
+
+
+def _timeout_error() -> anthropic.APITimeoutError:
+    return anthropic.APITimeoutError(request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"))
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestClassifyFailure:
+    @pytest.mark.parametrize(
+        "status,expected", [(529, "overloaded"), (503, "overloaded"), (500, "error"), (429, None), (400, None)]
+    )
+    def test_status_codes(self, status, expected):
+        assert classify_failure(_status_error(status)) == expected
+
+    def test_timeout_at_default_limit_is_error(self):
+        assert classify_failure(TimeoutError()) == "error"
+        assert classify_failure(_timeout_error(), timeout_s=60.0, default_timeout_s=60.0) == "error"
+
+    def test_caller_shortened_timeout_ignored(self):
+        assert classify_failure(_timeout_error(), timeout_s=0.8, default_timeout_s=60.0) is None
+
+    def test_connection_error_ignored(self):
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        assert classify_failure(anthropic.APIConnectionError(request=request)) is None
+
+    def test_unrelated_exception_ignored(self):
+        assert classify_failure(ValueError("bad prompt")) is None
+
+
+class TestModelHealthTracker:
+    def test_snapshot_percentiles_and_rates(self):
+        tracker = ModelHealthTracker()
+        for ms in range(1, 101):
+            tracker.record_success(MODEL, ms)
+        tracker.record_failure(MODEL, _status_error(529))
+
+        health = tracker.snapshot(MODEL)
+        assert health.samples == 101
+        assert health.p50_ms == 50.0
+        assert health.p95_ms == 95.0
+        assert health.overload_rate == pytest.approx(1 / 101)
+
+    def test_error_rate_degrades_model(self):
+        tracker = ModelHealthTracker(min_samples=10, max_error_rate=0.2)
+        for _ in range(7):
+            tracker.record_success(MODEL, 500)
+        for _ in range(3):
+            tracker.record_failure(MODEL, _status_error(529))
+        assert "30% failed calls" in tracker.degradation(MODEL)
+
+    def test_p95_ceiling(self):
+        tracker = ModelHealthTracker(min_samples=5, max_p95_ms={MODEL: 1000})
+        for _ in range(5):
+            tracker.record_success(MODEL, 4000)
+        assert tracker.degradation(MODEL) == "p95 latency 4000ms over 1000ms"
+
+    def test_too_few_samples_is_healthy(self):
+        tracker = ModelHealthTracker(min_samples=20)
+        tracker.record_failure(MODEL, _status_error(529))
+        assert tracker.degradation(MODEL) is None
+
+    def test_failures_age_out(self):
+        clock = _Clock()
+        tracker = ModelHealthTracker(window_s=60, min_samples=1, clock=clock)
+        tracker.record_failure(MODEL, _status_error(500))
+        assert tracker.degradation(MODEL) is not None
+
+        clock.now += 61
+        assert tracker.degradation(MODEL) is None
+        assert tracker.snapshot(MODEL).samples == 0
+
+    def test_deadline_capped_timeouts_leave_model_healthy(self):
+        tracker = ModelHealthTracker(min_samples=5, default_timeout_s=60.0)
+        for _ in range(10):
+            tracker.record_failure(MODEL, _timeout_error(), timeout_s=0.8)
+        assert tracker.degradation(MODEL) is None
+        assert tracker.snapshot(MODEL).samples == 0
@@ -0,0 +1,91 @@
+"""Tests for SidecarClient's batched /validate API."""
+
+import json
+
+import httpx
+import pytest
+
+from src.services.sidecar_client import BATCH_CHUNK_SIZE, SidecarClient
+
+
+def _response(content: str) -> dict:
+    return {"validated": True, "content": f"[stripped] {content}", "compliance_flags": ["PHI_CLEAN"]}
+
+
+def _client(settings, handler) -> SidecarClient:
+    client = SidecarClient(settings)
+    client._client = httpx.AsyncClient(base_url="http://sidecar", transport=httpx.MockTransport(handler))
+    return client
+
+
+def _requests(n: int) -> list[dict]:
+    return [
+        {"content": f"summary {i}", "node_name": "extractor", "encounter_id": "enc-001", "validation_type": "audit"}
+        for i in range(n)
+    ]
+
+
+class TestValidateBatch:
+    @pytest.mark.asyncio
+    async def test_one_round_trip_in_order(self, settings):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            body = json.loads(request.content)
+            assert body["requests"][0]["tokens"] == {"in": 0, "out": 0}
+            return httpx.Response(200, json={"results": [_response(r["content"]) for r in body["requests"]]})
+
+        results = await _client(settings, handler).validate_batch(_requests(2))
+
+        assert calls == ["/validate/batch"]
+        assert [r.content for r in results] == ["[stripped] summary 0", "[stripped] summary 1"]
+
+    @pytest.mark.asyncio
+    async def test_large_batches_are_chunked(self, settings):
+        sizes = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            items = json.loads(request.content)["requests"]
+            sizes.append(len(items))
+            return httpx.Response(200, json={"results": [_response(r["content"]) for r in items]})
+
+        results = await _client(settings, handler).validate_batch(_requests(BATCH_CHUNK_SIZE + 1))
+
+        assert sizes == [BATCH_CHUNK_SIZE, 1]
+        assert results[-1].content == f"[stripped] summary {BATCH_CHUNK_SIZE}"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_single_validate_on_404(self, settings):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if request.url.path == "/validate/batch":
+                return httpx.Response(404)
+            return httpx.Response(200, json=_response(json.loads(request.content)["content"]))
+
+        results = await _client(settings, handler).validate_batch(_requests(2))
+
+        assert calls == ["/validate/batch", "/validate", "/validate"]
+        assert [r.validated for r in results] == [True, True]
+
+    @pytest.mark.asyncio
+    async def test_failure_blocks_every_item(self, settings):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503)
+
+        results = await _client(settings, handler).validate_batch(_requests(2))
+
+        assert len(results) == 2
+        assert all(not r.validated and r.content == "" for r in results)
+        assert all("SIDECAR_UNAVAILABLE" in r.compliance_flags for r in results)
+
+    @pytest.mark.asyncio
+    async def test_result_count_mismatch_fails_closed(self, settings):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"results": [_response("only one")]})
+
+        results = await _client(settings, handler).validate_batch(_requests(2))
+
+        assert [r.validated for r in results] == [False, False]
@@ -0,0 +1,46 @@
+"""Tests for the local token estimator and its per-model calibration."""
+
+from pathlib import Path
+
+import pytest
+
+from src.services.anthropic_client import TokenCalibration
+from src.services.token_estimator import estimate_tokens
+
+SIDECAR_COPY = Path(__file__).resolve().parents[3] / "sidecar" / "src" / "token_estimator.py"
+BACKEND_COPY = Path(__file__).resolve().parents[2] / "src" / "services" / "token_estimator.py"
+
+
+@pytest.mark.skipif(not SIDECAR_COPY.exists(), reason="sidecar tree not available")
+def test_sidecar_copy_is_identical():
+    assert SIDECAR_COPY.read_text() == BACKEND_COPY.read_text()
+
+
+class TestEstimateTokens:
+    def test_empty(self):
+        assert estimate_tokens("") == 0
+
+    def test_clinical_note_is_in_plausible_range(self):
+        note = "45-year-old male presents with persistent cough for 3 days, fever 38.5C, BP 130/85."
+        # ~1 token per 3.5-4.5 characters of English clinical text
+        assert len(note) / 4.5 <= estimate_tokens(note) <= len(note) / 1.5
+
+    def test_scales_linearly(self):
+        chunk = "Denies chest pain. Medications: lisinopril 10mg daily.\n"
+        assert estimate_tokens(chunk * 100) == 100 * estimate_tokens(chunk)
+
+
+class TestTokenCalibration:
+    def test_defaults_to_one(self):
+        assert TokenCalibration().ratio("m") == 1.0
+
+    def test_converges_toward_observed_ratio(self):
+        calibration = TokenCalibration(alpha=0.5)
+        for _ in range(10):
+            calibration.record("m", estimated=100, actual=130)
+        assert calibration.ratio("m") == pytest.approx(1.3, rel=0.01)
+
+    def test_outliers_are_bounded(self):
+        calibration = TokenCalibration()
+        calibration.record("m", estimated=10, actual=10_000)
+        assert calibration.ratio("m") == 2.0
@@ -1,6 +1,7 @@
 use pyo3::prelude::*;
 use pyo3::types::{PyDict, PyList};
-use regex::Regex;
+use rayon::prelude::*;
+use regex::{Regex, RegexSet};
 use std::sync::LazyLock;
 
 struct PIIPattern {
@@ -36,32 +37,148 @@ static PII_PATTERNS: LazyLock<Vec<PIIPattern>> = LazyLock::new(|| {
     ]
 });
 
+// Same patterns, order and case rules as _PHI_PATTERNS in src/validators/phi_stripper.py
+static PHI_PATTERNS: LazyLock<Vec<PIIPattern>> = LazyLock::new(|| {
+    vec![
+        PIIPattern {
+            name: "SSN",
+            regex: Regex::new(r"\b\d{3}-\d{2}-\d{4}\b").unwrap(),
+        },
+        PIIPattern {
+            name: "MRN",
+            regex: Regex::new(r"\b(?:MRN|mrn)[:\s#]*\d{6,10}\b").unwrap(),
+        },
+        PIIPattern {
+            name: "EMAIL",
+            regex: Regex::new(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b").unwrap(),
+        },
+        PIIPattern {
+            name: "DOB",
+            regex: Regex::new(
+                r"\b(?:DOB|dob|Date of Birth|date of birth)[:\s]*(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b",
+            )
+            .unwrap(),
+        },
+        PIIPattern {
+            name: "PHONE",
+            regex: Regex::new(r"\b(?:\+1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b").unwrap(),
+        },
+        PIIPattern {
+            name: "PATIENT_NAME",
+            regex: Regex::new(r"(?:Patient|Pt|patient|pt)[:\s]+([A-Z][a-z]+(?:\s[A-Z][a-z]+){1,2})").unwrap(),
+        },
+        PIIPattern {
+            name: "PROVIDER_NAME",
+            regex: Regex::new(r"(?:Dr\.|Dr|MD|NP|PA|RN)[:\s]+([A-Z][a-z]+(?:\s[A-Z][a-z]+){0,2})").unwrap(),
+        },
+        PIIPattern {
+            name: "ADDRESS",
+            regex: Regex::new(r"\b\d{1,5}\s(?:[A-Z][a-z]+\s){1,3}(?:St|Ave|Blvd|Dr|Ln|Rd|Ct|Way|Pl)(?:\.|\b)").unwrap(),
+        },
+    ]
+});
+
+// One RegexSet pass over the original text says which patterns match it. A
+// clean text (the common case) is done after that pass; a redaction can
+// create a word boundary that was not in the original, so once anything has
+// been redacted every later pattern runs.
+static PII_SET: LazyLock<RegexSet> = LazyLock::new(|| pattern_set(&PII_PATTERNS));
+static PHI_SET: LazyLock<RegexSet> = LazyLock::new(|| pattern_set(&PHI_PATTERNS));
+
 const REDACTED: &str = "[REDACTED]";
+const PHI_REDACT_TAG: &str = "***PHI_REDACTED***";
 
-#[pyfunction]
-fn scan_pii(py: Python<'_>, text: &str) -> PyResult<PyObject> {
+type Counts = Vec<(&'static str, usize)>;
+
+fn pattern_set(patterns: &[PIIPattern]) -> RegexSet {
+    RegexSet::new(patterns.iter().map(|p| p.regex.as_str())).unwrap()
+}
+
+/// Apply each pattern in turn to the previous one's output, counting matches.
+/// Pure Rust, so callers run it with the GIL released.
+fn mask_sequential(text: &str, patterns: &[PIIPattern], set: &RegexSet, tag: &str) -> (String, Counts) {
+    let present = set.matches(text);
     let mut masked = text.to_string();
-    let matches = PyList::empty(py);
+    let mut counts: Counts = Vec::new();
 
-    for pattern in PII_PATTERNS.iter() {
-        let count = pattern.regex.find_iter(&masked).count();
+    for (index, pattern) in patterns.iter().enumerate() {
+        if counts.is_empty() && !present.matched(index) {
+            continue;
+        }
+        let (replaced, count) = mask_pattern(&masked, &pattern.regex, tag);
         if count > 0 {
-            masked = pattern.regex.replace_all(&masked, REDACTED).to_string();
-            let match_dict = PyDict::new(py);
-            match_dict.set_item("type", pattern.name)?;
-            match_dict.set_item("count", count)?;
-            matches.append(match_dict)?;
+            masked = replaced;
+            counts.push((pattern.name, count));
         }
     }
+    (masked, counts)
+}
+
+/// Replace every match of `regex` with `tag`, counting as it goes (one pass).
+fn mask_pattern(text: &str, regex: &Regex, tag: &str) -> (String, usize) {
+    let mut out = String::new();
+    let mut count = 0;
+    let mut last = 0;
+    for m in regex.find_iter(text) {
+        if count == 0 {
+            out.reserve(text.len());
+        }
+        out.push_str(&text[last..m.start()]);
+        out.push_str(tag);
+        last = m.end();
+        count += 1;
+    }
+    if count > 0 {
+        out.push_str(&text[last..]);
+    }
+    (out, count)
+}
+
+fn to_result(py: Python<'_>, text_key: &str, text: String, counts: Counts) -> PyResult<PyObject> {
+    let matches = PyList::empty(py);
+    for (name, count) in counts {
+        let match_dict = PyDict::new(py);
+        match_dict.set_item("type", name)?;
+        match_dict.set_item("count", count)?;
+        matches.append(match_dict)?;
+    }
 
     let result = PyDict::new(py);
-    result.set_item("masked", masked)?;
+    result.set_item(text_key, text)?;
     result.set_item("matches", matches)?;
     Ok(result.into())
 }
 
+#[pyfunction]
+fn scan_pii(py: Python<'_>, text: &str) -> PyResult<PyObject> {
+    let (masked, counts) = py.allow_threads(|| mask_sequential(text, &PII_PATTERNS, &PII_SET, REDACTED));
+    to_result(py, "masked", masked, counts)
+}
+
+#[pyfunction]
+fn strip_phi(py: Python<'_>, text: &str) -> PyResult<PyObject> {
+    let (cleaned, counts) = py.allow_threads(|| mask_sequential(text, &PHI_PATTERNS, &PHI_SET, PHI_REDACT_TAG));
+    to_result(py, "cleaned", cleaned, counts)
+}
+
+/// Scan a batch of texts across all cores.
+///
+/// Returns a list with one `(masked, [(type, count), ...])` tuple per input,
+/// in order — the same masking as `scan_pii`, without a dict per result.
+#[pyfunction]
+fn scan_many(py: Python<'_>, texts: Vec<String>) -> Vec<(String, Counts)> {
+    py.allow_threads(|| {
+        texts
+            .par_iter()
+            .map(|text| mask_sequential(text, &PII_PATTERNS, &PII_SET, REDACTED))
+            .collect()
+    })
+}
+
 #[pymodule]
 fn sentinel_pii_scanner(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(scan_pii, m)?)?;
+    m.add_function(wrap_pyfunction!(strip_phi, m)?)?;
+    m.add_function(wrap_pyfunction!(scan_many, m)?)?;
     Ok(())
 }
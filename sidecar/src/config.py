@@ -14,6 +14,14 @@ class SidecarSettings(BaseSettings):
 
     # PII detection backend: "auto", "rust", or "python"
     pii_scanner_backend: str = "auto"
+    # PHI stripping (audit validations) backend: "auto", "rust", or "python"
+    phi_stripper_backend: str = "auto"
+
+    # Where validations run: "auto" (thread pool when both backends are Rust,
+    # else process pool), "thread", "process", or "inline" (on the event loop)
+    validation_executor: str = "auto"
+    # Pool workers; 0 = one per usable CPU (affinity mask and cgroup quota)
+    validation_workers: int = 0
 
     # mTLS
     mtls_enabled: bool = False
@@ -0,0 +1,191 @@
+"""Runs validations off the event loop.
+
+Regex scanning, PHI stripping and jsonschema validation are CPU-bound; run
+inline, one large request blocks every other in-flight validation. With the
+Rust backends, which release the GIL while matching, a thread pool scans in
+parallel. With the Python fallback a process pool does, each worker holding
+its own compiled validators.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, TypeVar
+
+from src.config import SidecarSettings
+from src.models import ValidationRequest, ValidationResponse
+from src.validation import Validators
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("auto", "thread", "process", "inline")
+
+# Recent per-request CPU times kept for /health
+_CPU_SAMPLES = 1000
+
+T = TypeVar("T")
+
+# cgroup v2 CPU quota ("<quota> <period>" or "max <period>")
+_CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+# Set in each process-pool worker by _init_worker
+_worker_validators: Validators | None = None
+
+
+def _usable_cpus() -> int:
+    """CPUs this process can actually use, not the host's count.
+
+    Takes the scheduler affinity mask and, in a container, the cgroup CPU
+    quota into account — on Cloud Run or GKE os.cpu_count() reports every
+    core of the node.
+    """
+    if hasattr(os, "process_cpu_count"):  # Python 3.13+
+        cpus = os.process_cpu_count() or 1
+    elif hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = _CGROUP_CPU_MAX.read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def _init_worker(settings: SidecarSettings) -> None:
+    global _worker_validators
+    _worker_validators = Validators.build(settings)
+
+
+def _warm() -> None:
+    """No-op task; submitting one per worker starts them (and compiles patterns) up front."""
+
+
+def _timed(fn: Callable[..., T], *args: Any) -> tuple[T, float]:
+    """Run ``fn`` and return its result with the CPU milliseconds it used on this thread."""
+    start = time.thread_time()
+    result = fn(*args)
+    return result, (time.thread_time() - start) * 1000
+
+
+def _validate_in_worker(request: ValidationRequest) -> tuple[ValidationResponse, float]:
+    assert _worker_validators is not None, "process-pool worker not initialized"
+    return _timed(_worker_validators.run, request)
+
+
+class ValidationExecutor:
+    """Runs ``Validators`` on a thread or process pool and keeps pool statistics."""
+
+    def __init__(self, settings: SidecarSettings, validators: Validators) -> None:
+        kind = settings.validation_executor
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown validation executor {kind!r}; expected one of {EXECUTOR_KINDS}")
+        if kind == "auto":
+            kind = "thread" if validators.gil_free else "process"
+
+        self.kind = kind
+        self._settings = settings
+        self._validators = validators
+        self.workers = 0
+        if kind != "inline":
+            self.workers = settings.validation_workers or _usable_cpus()
+        self._pool = self._new_pool()
+
+        self._in_flight = 0
+        self._requests = 0
+        self._pool_restarts = 0
+        self._cpu_ms: deque[float] = deque(maxlen=_CPU_SAMPLES)
+        logger.info("Validation executor: %s (%d workers)", self.kind, self.workers)
+
+    def _new_pool(self) -> Executor | None:
+        if self.kind == "thread":
+            return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="validator")
+        if self.kind == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                # spawn, not fork: the server process already runs threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._settings,),
+            )
+        return None
+
+    async def start(self) -> None:
+        """Bring process-pool workers up before the first request instead of during it."""
+        if self.kind == "process":
+            await asyncio.gather(*(self._submit(_warm) for _ in range(self.workers)))
+
+    async def validate(self, request: ValidationRequest) -> ValidationResponse:
+        if self.kind == "process":
+            response, cpu_ms = await self._submit(_validate_in_worker, request)
+        else:
+            response, cpu_ms = await self._submit(_timed, self._validators.run, request)
+        self._record(cpu_ms)
+        return response
+
+    async def validate_batch(self, requests: list[ValidationRequest]) -> list[ValidationResponse]:
+        if self.kind == "process":
+            # Spread the items over the workers
+            done = await asyncio.gather(*(self._submit(_validate_in_worker, r) for r in requests))
+            self._record(sum(cpu_ms for _, cpu_ms in done))
+            return [response for response, _ in done]
+        # One task; scan_many already spreads the PII scan across cores on the Rust backend
+        responses, cpu_ms = await self._submit(_timed, self._validators.run_batch, requests)
+        self._record(cpu_ms)
+        return responses
+
+    async def _submit(self, fn: Callable[..., T], *args: Any) -> T:
+        if self._pool is None:
+            return fn(*args)
+        self._in_flight += 1
+        try:
+            pool = self._pool
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed), which breaks the whole pool.
+                # Replace it once and retry; a second failure is the request's.
+                self._replace_broken_pool(pool)
+                return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+        finally:
+            self._in_flight -= 1
+
+    def _replace_broken_pool(self, broken: Executor) -> None:
+        if self._pool is not broken:
+            return  # a concurrent request already replaced it
+        logger.warning("Validation process pool broken; starting a new one")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._pool = self._new_pool()
+        self._pool_restarts += 1
+
+    def _record(self, cpu_ms: float) -> None:
+        self._requests += 1
+        self._cpu_ms.append(cpu_ms)
+
+    def stats(self) -> dict[str, Any]:
+        samples = sorted(self._cpu_ms)
+        return {
+            "kind": self.kind,
+            "pool_size": self.workers,
+            "in_flight": self._in_flight,
+            "queue_depth": max(0, self._in_flight - self.workers),
+            "requests": self._requests,
+            "pool_restarts": self._pool_restarts,
+            "cpu_ms_avg": round(sum(samples) / len(samples), 2) if samples else 0.0,
+            "cpu_ms_p95": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 2) if samples else 0.0,
+            "cpu_ms_max": round(samples[-1], 2) if samples else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
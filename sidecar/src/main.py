@@ -1,16 +1,18 @@
 import logging
-import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
 from src.config import get_settings
 from src.logging_config import configure_logging
-from src.models import Redaction, ValidationRequest, ValidationResponse
-from src.validators.fhir_validator import FHIRValidator
-from src.validators.phi_stripper import PHIStripper
-from src.validators.pii_scanner import PIIScanner
-from src.validators.token_guard import TokenGuard
+from src.executor import ValidationExecutor
+from src.models import (
+    BatchValidationRequest,
+    BatchValidationResponse,
+    ValidationRequest,
+    ValidationResponse,
+)
+from src.validation import Validators
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +21,12 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     settings = get_settings()
     configure_logging("sidecar", settings.env)
-    app.state.pii_scanner = PIIScanner(backend=settings.pii_scanner_backend)
-    app.state.fhir_validator = FHIRValidator(schema_dir=settings.fhir_schema_dir)
-    app.state.phi_stripper = PHIStripper()
-    app.state.token_guard = TokenGuard(settings)
+    app.state.validators = Validators.build(settings)
+    app.state.executor = ValidationExecutor(settings, app.state.validators)
+    await app.state.executor.start()
     logger.info("Sidecar validators initialized (env=%s)", settings.env)
     yield
+    app.state.executor.shutdown()
 
 
 app = FastAPI(
@@ -41,58 +43,18 @@ async def health():
         "status": "healthy",
         "version": "0.1.0",
         "environment": settings.env,
-        "pii_backend": app.state.pii_scanner.backend_name,
+        "pii_backend": app.state.validators.pii_scanner.backend_name,
+        "phi_backend": app.state.validators.phi_stripper.backend_name,
+        "executor": app.state.executor.stats(),
     }
 
 
 @app.post("/validate", response_model=ValidationResponse)
 async def validate(request: ValidationRequest) -> ValidationResponse:
-    start = time.monotonic()
-    content = request.content
-    flags: list[str] = []
-    redactions: list[Redaction] = []
-    errors: list[str] = []
-    should_retry = False
-
-    if request.validation_type == "audit":
-        # PHI stripping only
-        result = app.state.phi_stripper.strip(content)
-        content = result.cleaned
-        redactions = [Redaction(type=r.type, count=r.count) for r in result.redactions]
-        flags.extend(result.flags)
-    else:
-        # PII scan (input and output)
-        pii_result = app.state.pii_scanner.scan(content)
-        content = pii_result.masked
-        redactions = [
-            Redaction(type=r.type, count=r.count) for r in pii_result.redactions
-        ]
-        flags.extend(pii_result.flags)
-
-        # Token guard (input and output)
-        token_result = app.state.token_guard.check(
-            request.tokens, request.validation_type
-        )
-        flags.extend(token_result.flags)
-        errors.extend(token_result.errors)
-
-        # FHIR validation (output only)
-        if request.validation_type == "output":
-            fhir_result = app.state.fhir_validator.validate(content, request.node_name)
-            flags.extend(fhir_result.flags)
-            errors.extend(fhir_result.errors)
-            if not fhir_result.valid:
-                should_retry = True
+    return await app.state.executor.validate(request)
 
-    latency_ms = (time.monotonic() - start) * 1000
-    validated = len(errors) == 0
 
-    return ValidationResponse(
-        validated=validated,
-        content=content,
-        compliance_flags=flags,
-        redactions=redactions,
-        errors=errors,
-        should_retry=should_retry,
-        latency_ms=round(latency_ms, 2),
-    )
+@app.post("/validate/batch", response_model=BatchValidationResponse)
+async def validate_batch(batch: BatchValidationRequest) -> BatchValidationResponse:
+    """Validate several requests in one round trip; results are in request order."""
+    return BatchValidationResponse(results=await app.state.executor.validate_batch(batch.requests))
@@ -1,6 +1,10 @@
 from pydantic import BaseModel, Field
 
 
+# Upper bound on requests per /validate/batch call
+MAX_BATCH_SIZE = 64
+
+
 class TokenInfo(BaseModel):
     in_tokens: int = Field(alias="in", default=0)
     out_tokens: int = Field(alias="out", default=0)
@@ -10,7 +14,7 @@ class TokenInfo(BaseModel):
 
 class ValidationRequest(BaseModel):
     content: str
-    node_name: str = Field(pattern=r"^(extractor|reasoner|sentinel)$")
+    node_name: str = Field(pattern=r"^(classifier|extractor|reasoner|sentinel|manual_review)$")
     encounter_id: str
     validation_type: str = Field(pattern=r"^(input|output|audit)$")
     tokens: TokenInfo = Field(default_factory=lambda: TokenInfo(**{"in": 0, "out": 0}))
@@ -29,3 +33,11 @@ class ValidationResponse(BaseModel):
     errors: list[str] = Field(default_factory=list)
     should_retry: bool = False
     latency_ms: float = 0.0
+
+
+class BatchValidationRequest(BaseModel):
+    requests: list[ValidationRequest] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchValidationResponse(BaseModel):
+    results: list[ValidationResponse]
@@ -0,0 +1,91 @@
+"""The validator set and per-request validation, shared by the API and pool workers."""
+
+import time
+from dataclasses import dataclass
+
+from src.config import SidecarSettings
+from src.models import Redaction, ValidationRequest, ValidationResponse
+from src.validators.fhir_validator import FHIRValidator
+from src.validators.phi_stripper import PHIStripper
+from src.validators.pii_scanner import PIIScanner, PIIScanResult
+from src.validators.token_guard import TokenGuard
+
+
+@dataclass
+class Validators:
+    pii_scanner: PIIScanner
+    phi_stripper: PHIStripper
+    fhir_validator: FHIRValidator
+    token_guard: TokenGuard
+
+    @classmethod
+    def build(cls, settings: SidecarSettings) -> "Validators":
+        return cls(
+            pii_scanner=PIIScanner(backend=settings.pii_scanner_backend),
+            phi_stripper=PHIStripper(backend=settings.phi_stripper_backend),
+            fhir_validator=FHIRValidator(schema_dir=settings.fhir_schema_dir),
+            token_guard=TokenGuard(settings),
+        )
+
+    @property
+    def gil_free(self) -> bool:
+        """True when both regex-heavy validators run in Rust with the GIL released."""
+        return self.pii_scanner.backend_name == "rust" and self.phi_stripper.backend_name == "rust"
+
+    def run_batch(self, requests: list[ValidationRequest]) -> list[ValidationResponse]:
+        """Validate in request order, PII-scanning all input/output items in one scan_many call."""
+        scanned = [i for i, r in enumerate(requests) if r.validation_type != "audit"]
+        pii_results = dict(zip(scanned, self.pii_scanner.scan_many([requests[i].content for i in scanned])))
+        return [self.run(r, pii_results.get(i)) for i, r in enumerate(requests)]
+
+    def run(self, request: ValidationRequest, pii_result: PIIScanResult | None = None) -> ValidationResponse:
+        start = time.monotonic()
+        content = request.content
+        flags: list[str] = []
+        redactions: list[Redaction] = []
+        errors: list[str] = []
+        should_retry = False
+
+        if request.validation_type == "audit":
+            # PHI stripping only
+            result = self.phi_stripper.strip(content)
+            content = result.cleaned
+            redactions = [Redaction(type=r.type, count=r.count) for r in result.redactions]
+            flags.extend(result.flags)
+        else:
+            # PII scan (input and output)
+            if pii_result is None:
+                pii_result = self.pii_scanner.scan(content)
+            content = pii_result.masked
+            redactions = [
+                Redaction(type=r.type, count=r.count) for r in pii_result.redactions
+            ]
+            flags.extend(pii_result.flags)
+
+            # Token guard (input and output)
+            token_result = self.token_guard.check(
+                request.tokens, request.validation_type, request.content
+            )
+            flags.extend(token_result.flags)
+            errors.extend(token_result.errors)
+
+            # FHIR validation (output only)
+            if request.validation_type == "output":
+                fhir_result = self.fhir_validator.validate(content, request.node_name)
+                flags.extend(fhir_result.flags)
+                errors.extend(fhir_result.errors)
+                if not fhir_result.valid:
+                    should_retry = True
+
+        latency_ms = (time.monotonic() - start) * 1000
+        validated = len(errors) == 0
+
+        return ValidationResponse(
+            validated=validated,
+            content=content,
+            compliance_flags=flags,
+            redactions=redactions,
+            errors=errors,
+            should_retry=should_retry,
+            latency_ms=round(latency_ms, 2),
+        )
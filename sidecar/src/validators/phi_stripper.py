@@ -1,6 +1,9 @@
+import logging
 import re
 from dataclasses import dataclass, field
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class PHIMatch:
@@ -15,7 +18,8 @@ class PHIStripResult:
     flags: list[str] = field(default_factory=list)
 
 
-# Extended PHI patterns (superset of PII, includes clinical identifiers)
+# Extended PHI patterns (superset of PII, includes clinical identifiers).
+# Mirrored by PHI_PATTERNS in rust/src/lib.rs — keep the two in sync.
 _PHI_PATTERNS: dict[str, re.Pattern] = {
     "SSN": re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
     "MRN": re.compile(r"\b(?:MRN|mrn)[:\s#]*\d{6,10}\b"),
@@ -42,8 +46,48 @@ _PHI_PATTERNS: dict[str, re.Pattern] = {
 _REDACT_TAG = "***PHI_REDACTED***"
 
 
+def _try_load_rust_stripper():
+    """Attempt to import strip_phi from the Rust PyO3 extension."""
+    try:
+        from sentinel_pii_scanner import strip_phi  # type: ignore[import-not-found]
+
+        return strip_phi
+    except ImportError:
+        # Module missing, or an older build that only has scan_pii
+        return None
+
+
 class PHIStripper:
+    def __init__(self, backend: str = "auto") -> None:
+        self._rust_strip = None
+        self._backend = backend
+
+        if backend in ("auto", "rust"):
+            self._rust_strip = _try_load_rust_stripper()
+            if self._rust_strip:
+                self._backend = "rust"
+                logger.info("PHI stripper: using Rust backend")
+            elif backend == "rust":
+                raise ImportError(
+                    "Rust PHI stripper requested but sentinel_pii_scanner.strip_phi not found"
+                )
+
+        if self._rust_strip is None:
+            self._backend = "python"
+            logger.info("PHI stripper: using Python fallback")
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend
+
     def strip(self, text: str) -> PHIStripResult:
+        if self._rust_strip:
+            result = self._rust_strip(text)
+            redactions = [PHIMatch(type=m["type"], count=m["count"]) for m in result["matches"]]
+            return _result(result["cleaned"], redactions)
+        return self._strip_python(text)
+
+    def _strip_python(self, text: str) -> PHIStripResult:
         cleaned = text
         redactions: list[PHIMatch] = []
 
@@ -54,10 +98,14 @@ class PHIStripper:
                 cleaned = pattern.sub(_REDACT_TAG, cleaned)
                 redactions.append(PHIMatch(type=phi_type, count=count))
 
-        flags = [f"PHI_STRIPPED_{r.type}" for r in redactions]
-        if redactions:
-            flags.insert(0, "PHI_REDACTED")
-        else:
-            flags.append("PHI_CLEAN")
+        return _result(cleaned, redactions)
+
+
+def _result(cleaned: str, redactions: list[PHIMatch]) -> PHIStripResult:
+    flags = [f"PHI_STRIPPED_{r.type}" for r in redactions]
+    if redactions:
+        flags.insert(0, "PHI_REDACTED")
+    else:
+        flags.append("PHI_CLEAN")
 
-        return PHIStripResult(cleaned=cleaned, redactions=redactions, flags=flags)
+    return PHIStripResult(cleaned=cleaned, redactions=redactions, flags=flags)
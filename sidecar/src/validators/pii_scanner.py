@@ -1,3 +1,4 @@
+import bisect
 import logging
 import re
 from dataclasses import dataclass, field
@@ -34,6 +35,18 @@ _PII_PATTERNS: dict[str, re.Pattern] = {
 
 _MASK_CHAR = "[REDACTED]"
 
+# Single-pass engine. Every pattern starts and ends on a \b next to a word
+# character and none can match inside or across "[REDACTED]", so the
+# per-pattern passes interact only where a later pattern's match would
+# overlap, or end inside, an earlier pattern's mask. One sweep therefore
+# collects each pattern's match at every position it can start (lookahead
+# groups, so overlapping candidates are all seen), and _resolve() replays
+# the passes in priority order over those candidates.
+_PII_CANDIDATES = re.compile(
+    "(?=" + "|".join(p.pattern for p in _PII_PATTERNS.values()) + ")"
+    + "".join(f"(?:(?=(?P<{t}>{p.pattern})))?" for t, p in _PII_PATTERNS.items())
+)
+
 
 def _try_load_rust_scanner():
     """Attempt to import the Rust PyO3 scanner."""
@@ -73,32 +86,87 @@ class PIIScanner:
             return self._scan_rust(text)
         return self._scan_python(text)
 
+    def scan_many(self, texts: list[str]) -> list[PIIScanResult]:
+        """Scan a batch; the Rust backend spreads it across cores without the GIL."""
+        scan_many = getattr(self._rust_module, "scan_many", None)
+        if scan_many is None:  # Python backend, or a Rust build that predates scan_many
+            return [self.scan(text) for text in texts]
+        batch: list[tuple[str, list[tuple[str, int]]]] = scan_many(texts)
+        return [
+            _scan_result(masked, [PIIMatch(type=t, count=c) for t, c in matches])
+            for masked, matches in batch
+        ]
+
     def _scan_rust(self, text: str) -> PIIScanResult:
         """Use Rust-compiled regex via PyO3."""
         result = self._rust_module.scan_pii(text)
         redactions = [
             PIIMatch(type=m["type"], count=m["count"]) for m in result["matches"]
         ]
-        flags = [f"PII_MASKED_{m.type}" for m in redactions]
-        if not redactions:
-            flags.append("PII_CLEAN")
-        return PIIScanResult(
-            masked=result["masked"], redactions=redactions, flags=flags
-        )
+        return _scan_result(result["masked"], redactions)
 
     def _scan_python(self, text: str) -> PIIScanResult:
-        """Pure Python fallback using compiled regex patterns."""
-        masked = text
+        """Pure Python fallback: one regex sweep, output built once."""
+        candidates: dict[str, list[tuple[int, int]]] = {t: [] for t in _PII_PATTERNS}
+        for m in _PII_CANDIDATES.finditer(text):
+            for pii_type, span in zip(_PII_PATTERNS, m.regs[1:]):
+                if span[0] >= 0:
+                    candidates[pii_type].append(span)
+
+        spans: list[tuple[int, int]] = []
         redactions: list[PIIMatch] = []
         for pii_type, pattern in _PII_PATTERNS.items():
-            matches = pattern.findall(masked)
-            if matches:
-                count = len(matches)
-                masked = pattern.sub(_MASK_CHAR, masked)
-                redactions.append(PIIMatch(type=pii_type, count=count))
-
-        flags = [f"PII_MASKED_{r.type}" for r in redactions]
-        if not redactions:
-            flags.append("PII_CLEAN")
-
-        return PIIScanResult(masked=masked, redactions=redactions, flags=flags)
+            accepted = _resolve(text, pattern, candidates[pii_type], spans)
+            if accepted:
+                redactions.append(PIIMatch(type=pii_type, count=len(accepted)))
+                spans = sorted(spans + accepted)
+
+        pieces = []
+        pos = 0
+        for start, end in spans:
+            pieces.append(text[pos:start])
+            pieces.append(_MASK_CHAR)
+            pos = end
+        pieces.append(text[pos:])
+
+        return _scan_result("".join(pieces), redactions)
+
+
+def _scan_result(masked: str, redactions: list[PIIMatch]) -> PIIScanResult:
+    flags = [f"PII_MASKED_{r.type}" for r in redactions]
+    if not redactions:
+        flags.append("PII_CLEAN")
+    return PIIScanResult(masked=masked, redactions=redactions, flags=flags)
+
+
+def _resolve(
+    text: str,
+    pattern: re.Pattern,
+    candidates: list[tuple[int, int]],
+    masks: list[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """The matches ``pattern.sub`` would replace once ``masks`` are already redacted.
+
+    ``candidates`` are the pattern's matches in the original text, one per
+    start position, in order; ``masks`` are the earlier patterns' spans.
+    """
+    mask_starts = [start for start, _ in masks]
+    accepted: list[tuple[int, int]] = []
+    pos = 0
+    for start, end in candidates:
+        if start < pos:
+            continue
+        i = bisect.bisect_right(mask_starts, start)
+        # Inside a mask, or right after one (no word boundary after "]")
+        if i and masks[i - 1][1] >= start:
+            continue
+        next_mask = mask_starts[i] if i < len(masks) else len(text)
+        if end > next_mask:
+            # Would run into the next mask; rematch with the mask as the end of text
+            m = pattern.match(text, start, next_mask)
+            if m is None:
+                continue
+            end = m.end()
+        accepted.append((start, end))
+        pos = end
+    return accepted
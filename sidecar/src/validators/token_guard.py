@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 
 from src.config import SidecarSettings
 from src.models import TokenInfo
+from src.token_estimator import estimate_tokens
 
 
 @dataclass
@@ -17,12 +18,16 @@ class TokenGuard:
         self._min_in = settings.min_input_tokens
         self._max_in = settings.max_input_tokens
 
-    def check(self, tokens: TokenInfo, validation_type: str) -> TokenGuardResult:
+    def check(self, tokens: TokenInfo, validation_type: str, content: str | None = None) -> TokenGuardResult:
         flags: list[str] = []
         errors: list[str] = []
 
         if validation_type == "input":
             in_count = tokens.in_tokens
+            if in_count == 0 and content:
+                # Caller sent no count — estimate locally rather than flag it as empty
+                in_count = estimate_tokens(content)
+                flags.append("TOKEN_INPUT_ESTIMATED")
             if in_count < self._min_in:
                 flags.append("TOKEN_INPUT_SUSPICIOUSLY_SHORT")
                 errors.append(
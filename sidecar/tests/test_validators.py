@@ -1,20 +1,40 @@
 """Tests for all sidecar validators and the /validate API."""
 
 import json
+import os
+import signal
+import sys
+import types
 
 import pytest
 from fastapi.testclient import TestClient
 
+from scripts.bench_pii_scanner import scan_multipass
+from src import executor as executor_module
+from src.executor import ValidationExecutor
 from src.main import app
-from src.models import TokenInfo
+from src.models import TokenInfo, ValidationRequest
+from src.validation import Validators
 from src.validators.fhir_validator import FHIRValidator
 from src.validators.phi_stripper import PHIStripper
-from src.validators.pii_scanner import PIIScanner
+from src.validators.pii_scanner import _MASK_CHAR, _PII_PATTERNS, PIIScanner
 from src.validators.token_guard import TokenGuard
 
 
 # ── PII Scanner ──────────────────────────────────────────────────────────────
 
+# Texts where the pattern passes interact; every backend must mask them alike
+PII_EDGE_CASES = [
+    "SSN 123-45-6789 MRN: 12345678 DOB: 03/14/1975 john@x.com (555) 123-4567",
+    "john.123-45-6789@x.com",  # SSN inside a would-be email
+    "a.mrn1234567@x.com",  # MRN inside a would-be email
+    "DOB 1-12-345-67-8901",  # SSN overlapping a would-be DOB
+    "123-45-6789(555) 123-4567",  # phone adjacent to an SSN mask
+    "123-45-6789.x@foo.com",  # email adjacent to an SSN mask
+    "555-123-4567 555-123-4567",
+    "",
+]
+
 
 class TestPIIScanner:
     def test_detects_ssn(self, pii_scanner):
@@ -62,6 +82,36 @@ class TestPIIScanner:
     def test_backend_name_is_python(self, pii_scanner):
         assert pii_scanner.backend_name == "python"
 
+    def test_scan_many_matches_scan(self, pii_scanner):
+        texts = ["SSN 123-45-6789", "clean note", "john@x.com and 555-123-4567"]
+        assert pii_scanner.scan_many(texts) == [pii_scanner.scan(t) for t in texts]
+
+    def test_scan_many_uses_rust_batch_tuples(self, monkeypatch):
+        fake = types.ModuleType("sentinel_pii_scanner")
+        fake.scan_pii = lambda text: {"masked": text, "matches": []}
+        fake.scan_many = lambda texts: [("[REDACTED]", [("SSN", 1)]), ("clean", [])]
+        monkeypatch.setitem(sys.modules, "sentinel_pii_scanner", fake)
+
+        results = PIIScanner().scan_many(["123-45-6789", "clean"])
+
+        assert results[0].masked == "[REDACTED]"
+        assert results[0].flags == ["PII_MASKED_SSN"]
+        assert results[1].flags == ["PII_CLEAN"]
+
+    @pytest.mark.parametrize("text", PII_EDGE_CASES)
+    def test_single_pass_matches_multipass(self, pii_scanner, text):
+        single = pii_scanner._scan_python(text)
+        multi = scan_multipass(text)
+        assert single.masked == multi.masked
+        assert single.redactions == multi.redactions
+        assert single.flags == multi.flags
+
+    def test_patterns_cannot_match_mask(self):
+        # The single-pass engine relies on redacted text being inert
+        for pattern in _PII_PATTERNS.values():
+            assert pattern.pattern.startswith(r"\b") and pattern.pattern.endswith(r"\b")
+            assert pattern.search(f"x{_MASK_CHAR}x") is None
+
 
 # ── FHIR Validator ───────────────────────────────────────────────────────────
 
@@ -207,6 +257,65 @@ class TestPHIStripper:
         assert len(result.redactions) >= 2
         assert "PHI_REDACTED" in result.flags
 
+    def test_backend_name_is_python(self, phi_stripper):
+        assert phi_stripper.backend_name == "python"
+
+    def test_rust_backend_required_but_missing(self):
+        with pytest.raises(ImportError):
+            PHIStripper(backend="rust")
+
+    def test_auto_selects_rust_strip_phi(self, monkeypatch):
+        fake = types.ModuleType("sentinel_pii_scanner")
+        fake.strip_phi = lambda text: {
+            "cleaned": "***PHI_REDACTED***",
+            "matches": [{"type": "PATIENT_NAME", "count": 1}],
+        }
+        monkeypatch.setitem(sys.modules, "sentinel_pii_scanner", fake)
+
+        stripper = PHIStripper()
+        result = stripper.strip("Patient: John Smith")
+
+        assert stripper.backend_name == "rust"
+        assert result.cleaned == "***PHI_REDACTED***"
+        assert result.flags == ["PHI_REDACTED", "PHI_STRIPPED_PATIENT_NAME"]
+
+    def test_older_rust_build_without_strip_phi_falls_back(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "sentinel_pii_scanner", types.ModuleType("sentinel_pii_scanner"))
+        assert PHIStripper().backend_name == "python"
+
+
+# ── Rust extension parity ────────────────────────────────────────────────────
+# Run by CI against a maturin-built sentinel_pii_scanner; skipped without it.
+
+PHI_PARITY_CASES = [
+    "Patient: John Smith, SSN 123-45-6789, Dr. Jane Doe",
+    "Dr. Sarah Johnson ordered labs for Patient: Mary Ann Lee",
+    "Vitals: HR 88, BP 130/85, Temp 38.2C",
+    "",
+]
+
+
+@pytest.fixture
+def rust_extension():
+    return pytest.importorskip("sentinel_pii_scanner")
+
+
+class TestRustParity:
+    @pytest.mark.parametrize("text", PII_EDGE_CASES)
+    def test_scan_matches_python(self, rust_extension, pii_scanner, text):
+        assert PIIScanner(backend="rust").scan(text) == pii_scanner.scan(text)
+
+    def test_scan_many_matches_python(self, rust_extension, pii_scanner):
+        batch = rust_extension.scan_many(PII_EDGE_CASES)
+        assert isinstance(batch, list)
+        assert PIIScanner(backend="rust").scan_many(PII_EDGE_CASES) == [
+            pii_scanner.scan(text) for text in PII_EDGE_CASES
+        ]
+
+    @pytest.mark.parametrize("text", PHI_PARITY_CASES)
+    def test_strip_phi_matches_python(self, rust_extension, text):
+        assert PHIStripper(backend="rust").strip(text) == PHIStripper(backend="python").strip(text)
+
 
 # ── Token Guard ──────────────────────────────────────────────────────────────
 
@@ -240,22 +349,35 @@ class TestTokenGuard:
         result = token_guard.check(tokens, "input")
         assert "TOKEN_INPUT_SUSPICIOUSLY_SHORT" in result.flags
 
+    def test_missing_input_count_is_estimated(self, token_guard):
+        tokens = TokenInfo(**{"in": 0, "out": 0})
+        result = token_guard.check(tokens, "input", "45-year-old male with persistent cough for 3 days")
+        assert "TOKEN_INPUT_ESTIMATED" in result.flags
+        assert "TOKEN_INPUT_OK" in result.flags
+        assert result.errors == []
+
 
 # ── API Integration ──────────────────────────────────────────────────────────
 
 
-class TestAPI:
-    @pytest.fixture
-    def client(self):
-        with TestClient(app) as c:
-            yield c
+@pytest.fixture(scope="module")
+def client():
+    # One app (and validation pool) for the module; starting workers is slow
+    with TestClient(app) as c:
+        yield c
 
+
+class TestAPI:
     def test_health_endpoint(self, client):
         response = client.get("/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
         assert "pii_backend" in data
+        assert data["phi_backend"] == "python"
+        # Python backends: validations run in a process pool
+        assert data["executor"]["kind"] == "process"
+        assert set(data["executor"]) >= {"pool_size", "queue_depth", "cpu_ms_avg", "cpu_ms_p95"}
 
     def test_validate_input_type(self, client):
         response = client.post(
@@ -339,6 +461,20 @@ class TestAPI:
         assert "John Smith" not in data["content"]
         assert "PHI_REDACTED" in data["compliance_flags"]
 
+    def test_validate_classifier_audit(self, client):
+        """Background classifier labels are audited under node "classifier"."""
+        response = client.post(
+            "/validate",
+            json={
+                "content": "Patient: John Smith, classified acute_presentation",
+                "node_name": "classifier",
+                "encounter_id": "enc-001",
+                "validation_type": "audit",
+            },
+        )
+        assert response.status_code == 200
+        assert "John Smith" not in response.json()["content"]
+
     def test_validate_pii_masking(self, client):
         response = client.post(
             "/validate",
@@ -393,3 +529,123 @@ class TestAPI:
             },
         )
         assert response.status_code == 422
+
+    def test_validate_batch_preserves_order(self, client):
+        response = client.post(
+            "/validate/batch",
+            json={
+                "requests": [
+                    {
+                        "content": "Patient: John Smith, SSN 123-45-6789",
+                        "node_name": "extractor",
+                        "encounter_id": "enc-001",
+                        "validation_type": "audit",
+                    },
+                    {
+                        "content": "Patient has mild headache",
+                        "node_name": "extractor",
+                        "encounter_id": "enc-001",
+                        "validation_type": "input",
+                        "tokens": {"in": 100, "out": 0},
+                    },
+                ]
+            },
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert len(results) == 2
+        assert "John Smith" not in results[0]["content"]
+        assert "PHI_REDACTED" in results[0]["compliance_flags"]
+        assert results[1]["content"] == "Patient has mild headache"
+        assert "TOKEN_INPUT_OK" in results[1]["compliance_flags"]
+
+    def test_validate_batch_rejects_empty(self, client):
+        response = client.post("/validate/batch", json={"requests": []})
+        assert response.status_code == 422
+
+    def test_validate_batch_rejects_invalid_item(self, client):
+        response = client.post(
+            "/validate/batch",
+            json={
+                "requests": [
+                    {
+                        "content": "test",
+                        "node_name": "invalid",
+                        "encounter_id": "enc-001",
+                        "validation_type": "input",
+                    }
+                ]
+            },
+        )
+        assert response.status_code == 422
+
+
+# ── Validation executor ──────────────────────────────────────────────────────
+
+
+def _audit_request(content: str) -> ValidationRequest:
+    return ValidationRequest(
+        content=content, node_name="extractor", encounter_id="enc-001", validation_type="audit"
+    )
+
+
+class TestValidationExecutor:
+    @pytest.mark.parametrize("kind", ["inline", "thread", "process"])
+    @pytest.mark.asyncio
+    async def test_runs_validations_and_records_cpu(self, settings, kind):
+        settings.validation_executor = kind
+        settings.validation_workers = 1
+        executor = ValidationExecutor(settings, Validators.build(settings))
+        await executor.start()
+        try:
+            response = await executor.validate(_audit_request("Patient: John Smith"))
+            [batch_response] = await executor.validate_batch([_audit_request("SSN 123-45-6789")])
+        finally:
+            executor.shutdown()
+
+        assert "John Smith" not in response.content
+        assert "123-45-6789" not in batch_response.content
+        stats = executor.stats()
+        assert stats["kind"] == kind
+        assert stats["requests"] == 2
+        assert stats["queue_depth"] == 0
+        assert stats["cpu_ms_max"] >= stats["cpu_ms_avg"] >= 0
+
+    def test_auto_prefers_threads_when_gil_free(self, settings, monkeypatch):
+        validators = Validators.build(settings)
+        monkeypatch.setattr(Validators, "gil_free", property(lambda self: True))
+        executor = ValidationExecutor(settings, validators)
+        executor.shutdown()
+        assert executor.kind == "thread"
+
+    def test_unknown_kind_rejected(self, settings):
+        settings.validation_executor = "greenlet"
+        with pytest.raises(ValueError):
+            ValidationExecutor(settings, Validators.build(settings))
+
+    @pytest.mark.asyncio
+    async def test_broken_process_pool_is_replaced(self, settings):
+        settings.validation_executor = "process"
+        settings.validation_workers = 1
+        executor = ValidationExecutor(settings, Validators.build(settings))
+        await executor.start()
+        try:
+            worker_pid = await executor._submit(os.getpid)
+            os.kill(worker_pid, signal.SIGKILL)  # as an OOM kill would
+            response = await executor.validate(_audit_request("Patient: John Smith"))
+        finally:
+            executor.shutdown()
+
+        assert "John Smith" not in response.content
+        assert executor.stats()["pool_restarts"] == 1
+
+    def test_worker_count_follows_cgroup_quota(self, tmp_path, monkeypatch):
+        cpu_max = tmp_path / "cpu.max"
+        monkeypatch.setattr(executor_module, "_CGROUP_CPU_MAX", cpu_max)
+        monkeypatch.setattr(executor_module.os, "process_cpu_count", lambda: 64, raising=False)
+        monkeypatch.setattr(executor_module.os, "sched_getaffinity", lambda pid: set(range(64)), raising=False)
+
+        cpu_max.write_text("150000 100000\n")
+        assert executor_module._usable_cpus() == 2
+        cpu_max.write_text("max 100000\n")
+        assert executor_module._usable_cpus() == 64